@@ -1,9 +1,27 @@
 from __future__ import absolute_import
 
+import sys
+import importlib
+
 __version__ = '0.1.1'
 
-import sporco.cdict
-import sporco.util
-import sporco.plot
-import sporco.linalg
-import sporco.admm
+_submodules = ['cdict', 'util', 'plot', 'linalg', 'admm']
+
+if sys.version_info >= (3, 7):
+    # Import submodules on first attribute access (PEP 562) so that
+    # importing the package does not incur the cost of importing all
+    # of its dependencies
+    def __getattr__(name):
+        if name in _submodules:
+            return importlib.import_module('.' + name, __name__)
+        raise AttributeError("module '%s' has no attribute '%s'" %
+                             (__name__, name))
+
+    def __dir__():
+        return sorted(list(globals()) + _submodules)
+else:
+    import sporco.cdict
+    import sporco.util
+    import sporco.plot
+    import sporco.linalg
+    import sporco.admm
@@ -1,14 +1,31 @@
 from __future__ import absolute_import
 
-import sporco.admm.admm
-import sporco.admm.bpdn
-import sporco.admm.cbpdn
-import sporco.admm.cmod
-import sporco.admm.ccmod
-import sporco.admm.dictlrn
-import sporco.admm.bpdndl
-import sporco.admm.cbpdndl
-import sporco.admm.tvl2
-import sporco.admm.tvl1
-import sporco.admm.spline
-import sporco.admm.rpca
+import sys
+import importlib
+
+_submodules = ['admm', 'bpdn', 'cbpdn', 'cmod', 'ccmod', 'dictlrn', 'bpdndl',
+               'cbpdndl', 'tvl2', 'tvl1', 'spline', 'rpca']
+
+if sys.version_info >= (3, 7):
+    # Import submodules on first attribute access (PEP 562)
+    def __getattr__(name):
+        if name in _submodules:
+            return importlib.import_module('.' + name, __name__)
+        raise AttributeError("module '%s' has no attribute '%s'" %
+                             (__name__, name))
+
+    def __dir__():
+        return sorted(list(globals()) + _submodules)
+else:
+    import sporco.admm.admm
+    import sporco.admm.bpdn
+    import sporco.admm.cbpdn
+    import sporco.admm.cmod
+    import sporco.admm.ccmod
+    import sporco.admm.dictlrn
+    import sporco.admm.bpdndl
+    import sporco.admm.cbpdndl
+    import sporco.admm.tvl2
+    import sporco.admm.tvl1
+    import sporco.admm.spline
+    import sporco.admm.rpca
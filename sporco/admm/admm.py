@@ -16,12 +16,15 @@ from builtins import object
 import numpy as np
 from scipy import linalg
 import scipy
+import scipy.sparse
 import copy
 import collections
 import sys
+import time
 
 from sporco import cdict
 from sporco import util
+import sporco.linalg as sl
 from sporco.util import u
 
 
@@ -62,6 +65,127 @@ def _module_name_nested(cls, nstnm='Options'):
 
 
 
+def spectral_stepsize(dh, dl):
+    """Compute the hybrid steepest descent / minimum gradient spectral
+    step size estimate of Sec. 3.3 of :cite:`xu-2017-adaptive`.
+
+    Parameters
+    ----------
+    dh : array_like
+      Difference of successive values of the (sub)gradient of the dual
+      function
+    dl : array_like
+      Difference of successive values of the dual variable
+
+    Returns
+    -------
+    alpha : float
+      Step size estimate
+    cor : float
+      Correlation between `dh` and `dl`, which is a measure of the
+      reliability of `alpha`
+    """
+
+    hl = np.real(np.vdot(dh, dl))
+    hh = np.real(np.vdot(dh, dh))
+    ll = np.real(np.vdot(dl, dl))
+    if hl <= 0.0:
+        return None, 0.0
+    cor = hl / np.sqrt(hh*ll)
+    asd = ll / hl
+    amg = hl / hh
+    alpha = amg if 2.0*amg > asd else asd - amg/2.0
+    return alpha, cor
+
+
+
+
+def time_limit(maxrt, dlin):
+    """Compute the run time limit, relative to the current time, from
+    a maximum run time and a deadline.
+
+    Parameters
+    ----------
+    maxrt : float or None
+      Maximum run time in seconds
+    dlin : float or None
+      Deadline as a time returned by :func:`time.time`
+
+    Returns
+    -------
+    tmax : float or None
+      Run time limit in seconds, or None if there is no limit
+    """
+
+    tmax = maxrt
+    if dlin is not None:
+        tdl = dlin - time.time()
+        tmax = tdl if tmax is None else min(tmax, tdl)
+    return tmax
+
+
+
+def time_limit_reached(tmax, t, n):
+    """Determine whether the next iteration is not expected to be
+    completed within a run time limit.
+
+    Parameters
+    ----------
+    tmax : float or None
+      Run time limit in seconds, as returned by :func:`time_limit`
+    t : float
+      Run time so far
+    n : int
+      Number of iterations completed so far
+
+    Returns
+    -------
+    reached : bool
+      Flag indicating whether the iterations should be terminated
+      after the next one
+    """
+
+    if tmax is None:
+        return False
+    # The next iteration is expected to take the mean time per
+    # iteration so far
+    return t + (t / n if n > 0 else 0.0) >= tmax
+
+
+
+def checkpoint_due(opt, k, dt):
+    """Determine whether an automatic checkpoint is due.
+
+    Parameters
+    ----------
+    opt : dict
+      ``Checkpoint`` options dict with entries ``Period`` and
+      ``Interval``
+    k : int
+      Index of iteration that has just been completed
+    dt : float
+      Time since the previous checkpoint
+
+    Returns
+    -------
+    due : bool
+      Flag indicating whether a checkpoint should be saved
+    """
+
+    return (opt['Period'] is not None and (k + 1) % opt['Period'] == 0) or \
+        (opt['Interval'] is not None and dt >= opt['Interval'])
+
+
+
+
+IterationSnapshot = collections.namedtuple('IterationSnapshot', ['Iter',
+    'PrimalRsdl', 'DualRsdl', 'EpsPrimal', 'EpsDual', 'Rho', 'Converged',
+    'Stats', 'Y'])
+"""Per-iteration snapshot yielded by :meth:`ADMM.iterate`"""
+
+
+
+
 class _ADMM_Meta(type):
     """Metaclass for ADMM class that handles intialisation of IterationStats
     namedtuple and applies module_name_nested to class definitions to fix
@@ -95,7 +219,8 @@ class ADMM(with_metaclass(_ADMM_Meta, object)):
     specialise to specific optimisation problems.
 
     After termination of the :meth:`solve` method, attribute
-    :attr:`itstat` is a list of tuples representing statistics of each
+    :attr:`itstat` is a :class:`.util.IterStatsStore` object, which
+    behaves as a list of tuples representing statistics of each
     iteration. The default fields of the named tuple
     ``IterationStats`` are:
 
@@ -120,6 +245,10 @@ class ADMM(with_metaclass(_ADMM_Meta, object)):
        ``Rho`` : Penalty parameter
 
        ``Time`` : Cumulative run time
+
+       ``PhaseTime`` : Dict mapping labels of phases of the iterations \
+       to their cumulative run times if option ``Profile`` is enabled \
+       (see :meth:`phase_summary`), otherwise None
     """
 
     class Options(cdict.ConstrainedDict):
@@ -142,8 +271,100 @@ class ADMM(with_metaclass(_ADMM_Meta, object)):
           ``Callback`` : Callback function to be called at the end of \
                every iteration
 
+          ``Profile`` : Flag determining whether the run time and number \
+               of calls of each phase of the iterations, and of the FFTs \
+               computed by :mod:`sporco.linalg`, are recorded (see \
+               :meth:`ADMM.phase_summary`)
+
+          ``Checkpoint`` : Options for automatic checkpointing of the \
+              solver state (see :meth:`ADMM.checkpoint`) during \
+              :meth:`ADMM.solve`
+
+            ``Path`` : Checkpoint directory path. Automatic \
+              checkpointing is disabled if None.
+
+            ``Period`` : Iteration period on which a checkpoint is \
+              saved, or None
+
+            ``Interval`` : Minimum time in seconds between saving of \
+              checkpoints, or None
+
+          ``Accelerate`` : Options for acceleration of the ADMM \
+              iterations
+
+            ``Method`` : Acceleration method. Options are None (no \
+              acceleration), ``Nesterov`` (fast ADMM with restart, \
+              see Alg. 8 of :cite:`goldstein-2014-fast`), which applies \
+              Nesterov momentum to Y and U, and restarts the momentum \
+              when the combined primal and dual residual does not \
+              decrease sufficiently. This method requires option \
+              ``RelaxParam`` to be 1.0, since the restart scheme is \
+              derived without over-relaxation, and is most effective \
+              for strongly convex problems. The final option is \
+              ``Anderson`` (Anderson \
+              acceleration :cite:`walker-2011-anderson` of the fixed \
+              point iteration mapping (Y, U) at the start of an \
+              iteration to (Y, U) at the end of it). See \
+              :meth:`ADMM.accelerate_summary` for the memory and \
+              computational cost of the acceleration.
+
+            ``RestartEta`` : Factor by which the combined residual must \
+              decrease for the momentum not to be restarted (method \
+              ``Nesterov`` only)
+
+            ``Window`` : Number of previous iterations retained in the \
+              history window (method ``Anderson`` only)
+
+            ``Safeguard`` : Factor by which the fixed point residual \
+              may increase following an extrapolated step before the \
+              history is discarded and a plain ADMM step is taken \
+              instead (method ``Anderson`` only)
+
+          ``Batch`` : Flag determining whether batch mode is enabled. In \
+               batch mode, the indices of axis :attr:`ADMM.batchaxis` of \
+               the working variables correspond to independent problems, \
+               each with its own penalty parameter, adaptive rho state, \
+               and convergence test. Problems that have converged are \
+               removed from the working variables until the end of \
+               :meth:`ADMM.solve`, and the objective function values \
+               in the iteration statistics include the final values \
+               for these problems. Only supported by derived classes \
+               for which :attr:`ADMM.batchaxis` is not None.
+
           ``MaxMainIter`` : Maximum main iterations
 
+          ``MaxRunTime`` : Maximum run time in seconds of each call of \
+              :meth:`ADMM.solve`, or None. The iterations are terminated \
+              before the first iteration that is not expected, on the \
+              basis of the mean time per iteration, to be completed \
+              within this time.
+
+          ``Deadline`` : Time, as returned by :func:`time.time`, by \
+              which :meth:`ADMM.solve` should return, or None. This \
+              limit is applied in the same way as ``MaxRunTime``.
+
+          ``ReturnBest`` : Flag determining whether, on termination, \
+              the solution variables are set to the iterate with the \
+              lowest objective function value (the first field of \
+              :attr:`ADMM.itstat_fields_objfn`) recorded in \
+              :attr:`ADMM.itstat`, rather than the final iterate. Since \
+              the objective function is only recorded on iterations on \
+              which iteration statistics are computed (see option \
+              ``StatsPeriod``), the other iterations are not \
+              considered. Copies of X, Y, and U are made whenever a new \
+              lowest value is recorded.
+
+          ``StatsPeriod`` : Iteration period on which iteration \
+              statistics, including the objective function value, are \
+              computed, recorded, and displayed. Statistics are always \
+              computed on the final iteration.
+
+          ``ResidualPeriod`` : Iteration period on which the primal \
+              and dual residuals are computed and the convergence \
+              test is applied. Residuals are also computed on every \
+              iteration on which statistics are computed or on which \
+              rho is updated.
+
           ``AbsStopTol`` : Absolute convergence tolerance (see \
               Sec. 3.3.1 of :cite:`boyd-2010-distributed`)
 
@@ -162,6 +383,16 @@ class ADMM(with_metaclass(_ADMM_Meta, object)):
             ``Enabled`` : Flag determining whether adaptive rho \
               strategy is enabled
 
+            ``Strategy`` : Adaptive rho strategy. Options are \
+              ``Residual`` (scaling of rho according to the ratio of \
+              the primal and dual residuals) or ``Spectral`` (spectral \
+              penalty parameter selection :cite:`xu-2017-adaptive`, \
+              in which rho is set from Barzilai-Borwein estimates of \
+              the curvature of the dual functions of :math:`f` and \
+              :math:`g`). Options ``Scaling``, ``RsdlRatio``, \
+              ``RsdlTarget``, ``AutoScaling``, and ``StdResiduals`` \
+              only apply to the ``Residual`` strategy.
+
             ``Period`` : Iteration period on which rho is updated
 
             ``Scaling`` : Multiplier applied to rho when updated
@@ -176,20 +407,37 @@ class ADMM(with_metaclass(_ADMM_Meta, object)):
 
             ``StdResiduals`` : Flag determining whether standard residual \
                 definitions are used instead of normalised residuals
+
+            ``SpectralCorr`` : Correlation threshold below which a \
+                curvature estimate is considered unreliable and is not \
+                used in the ``Spectral`` strategy
+
+            ``SpectralSafeguard`` : Constant :math:`C` such that, at \
+                iteration :math:`k`, the ``Spectral`` strategy does not \
+                change rho by more than a factor of :math:`1 + C/k^2`
         """
 
         defaults = {'Verbose' : False, 'StatusHeader' : True,
                     'DataType' : None, 'MaxMainIter' : 1000,
+                    'MaxRunTime' : None, 'Deadline' : None,
+                    'ReturnBest' : False,
+                    'StatsPeriod' : 1, 'ResidualPeriod' : 1,
                     'AbsStopTol' : 0.0, 'RelStopTol' : 1e-3,
                     'RelaxParam' : 1.0, 'rho' : None,
                     'AutoRho' :
                     {
-                        'Enabled' : False, 'Period' : 10,
-                        'Scaling' : 2.0, 'RsdlRatio' : 10.0,
+                        'Enabled' : False, 'Strategy' : 'Residual',
+                        'Period' : 10, 'Scaling' : 2.0, 'RsdlRatio' : 10.0,
                         'RsdlTarget' : None, 'AutoScaling' : False,
-                        'StdResiduals' : False
+                        'StdResiduals' : False, 'SpectralCorr' : 0.2,
+                        'SpectralSafeguard' : 1e10
                     },
-                    'Y0' : None, 'U0' : None, 'Callback' : None
+                    'Y0' : None, 'U0' : None, 'Callback' : None,
+                    'Checkpoint' : {'Path' : None, 'Period' : None,
+                                    'Interval' : None},
+                    'Accelerate' : {'Method' : None, 'RestartEta' : 0.999,
+                                    'Window' : 5, 'Safeguard' : 1.0},
+                    'Profile' : False, 'Batch' : False
                 }
 
         def __init__(self, opt=None):
@@ -218,6 +466,14 @@ class ADMM(with_metaclass(_ADMM_Meta, object)):
     hdrval_objfun = {'Fnc' : 'ObjFun', 'f' : 'FVal', 'g' : 'GVal'}
     """Dictionary mapping display column headers in :attr:`hdrtxt_objfn`
     to IterationStats entries"""
+    batchaxis = None
+    """Axis of the working variables X, Y, and U that indexes independent
+    problems when option ``Batch`` is enabled, or None if batch mode is
+    not supported"""
+    batchattr = ()
+    """Names of attributes, in addition to the working variables and the
+    penalty parameter, that have an axis :attr:`batchaxis` indexing
+    independent problems in batch mode"""
 
 
 
@@ -249,6 +505,10 @@ class ADMM(with_metaclass(_ADMM_Meta, object)):
         # is managed by this class.
         self.runtime = 0.0
         self.timer = util.Timer()
+        self.phasetimer = util.PhaseTimer(enabled=opt['Profile'])
+        # Counts of extrapolated and rejected acceleration steps
+        self.acc_nstep = 0
+        self.acc_nrej = 0
 
         self.opt = opt
         self.Nx = Nx
@@ -271,6 +531,38 @@ class ADMM(with_metaclass(_ADMM_Meta, object)):
                       dtype=self.dtype)
         self.set_attr('rlx', opt['RelaxParam'], dval=1.0, dtype=self.dtype)
 
+        if opt['AutoRho', 'Strategy'] not in ('Residual', 'Spectral'):
+            raise ValueError('Invalid value %s for option AutoRho.Strategy'
+                             % opt['AutoRho', 'Strategy'])
+        if opt['Accelerate', 'Method'] == 'Nesterov' and self.rlx != 1.0:
+            raise ValueError('Option Accelerate.Method Nesterov requires '
+                             'option RelaxParam to be 1.0')
+
+        # Set up batch mode, in which the penalty parameter, and the
+        # residual target of the adaptive rho policy, are arrays with a
+        # distinct value for each problem
+        if self.opt['Batch']:
+            if type(self).batchaxis is None:
+                raise ValueError('Batch mode is not supported by class ' +
+                                 type(self).__name__)
+            if self.opt['Accelerate', 'Method'] is not None:
+                raise ValueError('Option Accelerate is not supported in '
+                                 'batch mode')
+            if self.opt['AutoRho', 'Enabled'] and \
+               self.opt['AutoRho', 'Strategy'] != 'Residual':
+                raise ValueError('Only the Residual AutoRho strategy is '
+                                 'supported in batch mode')
+            if self.opt['Checkpoint', 'Path'] is not None:
+                raise ValueError('Automatic checkpointing is not supported '
+                                 'in batch mode')
+            if self.opt['ReturnBest']:
+                raise ValueError('Option ReturnBest is not supported in '
+                                 'batch mode')
+            self.batchshape = [1,] * len(yshape)
+            self.batchshape[type(self).batchaxis] = \
+                yshape[type(self).batchaxis]
+            self.rho = self.batch_param(self.rho)
+            self.rho_xi = self.batch_param(self.rho_xi)
 
         # Initialise working variable Y
         if  self.opt['Y0'] is None:
@@ -285,7 +577,7 @@ class ADMM(with_metaclass(_ADMM_Meta, object)):
         else:
             self.U = self.opt['U0'].astype(self.dtype, copy=True)
 
-        self.itstat = []
+        self.itstat = util.IterStatsStore(type(self).IterationStats)
         self.k = 0
 
 
@@ -314,6 +606,304 @@ class ADMM(with_metaclass(_ADMM_Meta, object)):
 
 
 
+    def batch_param(self, val):
+        """Convert a scalar, or a vector with one entry per problem, into
+        an array with a singleton axis for each axis of the working
+        variables other than :attr:`batchaxis`, so that it broadcasts
+        against the working variables in batch mode.
+
+        Parameters
+        ----------
+        val : float or array_like
+          Parameter value
+
+        Returns
+        -------
+        arr : ndarray
+          Parameter array
+        """
+
+        val = np.asarray(val, dtype=self.dtype).ravel()
+        return np.broadcast_to(val, (self.batchshape[type(self).batchaxis],)
+                               ).reshape(self.batchshape).copy()
+
+
+
+    def batch_norm(self, x):
+        """Compute the :math:`\\ell_2` norm of `x` independently for
+        each problem in batch mode, i.e. over all axes other than
+        :attr:`batchaxis`, retaining those axes as singleton axes.
+        """
+
+        x = np.asarray(x)
+        axes = tuple([k for k in range(x.ndim) if k != type(self).batchaxis])
+        return np.sqrt(np.sum(np.abs(x)**2, axis=axes, keepdims=True))
+
+
+
+    def batch_start(self):
+        """Initialise batch mode state at the start of :meth:`solve`."""
+
+        nb = self.batchshape[type(self).batchaxis]
+        ax = type(self).batchaxis
+        self.batch_idx = np.arange(nb)
+        self.batch_cnvg = np.zeros(nb, dtype=bool)
+        self.batch_iter = np.full(nb, -1, dtype=int)
+        self.batch_rsdl = np.full((4, nb), np.nan)
+        self.batch_objfn = 0.0
+        # Determine the attributes with a problem axis. Attribute X
+        # is included even if it has not yet been initialised.
+        self.batch_names = ['X']
+        for name in ('Y', 'U', 'Yprev', 'rho', 'rho_xi') + \
+                type(self).batchattr:
+            val = getattr(self, name, None)
+            if isinstance(val, np.ndarray) and val.ndim > ax and \
+               val.shape[ax] == nb:
+                self.batch_names.append(name)
+        # Record full size arrays into which values for problems that
+        # are removed from the working variables are saved
+        self.batch_full = {}
+        for name in self.batch_names:
+            if getattr(self, name, None) is not None:
+                self.batch_full[name] = getattr(self, name)
+
+
+
+    def batch_vars(self):
+        """Get names of initialised attributes that have an axis
+        :attr:`batchaxis` indexing the problems currently being solved.
+        """
+
+        return [name for name in self.batch_names
+                if getattr(self, name, None) is not None]
+
+
+
+    def batch_save(self, sel):
+        """Save values of the attributes with a problem axis into the
+        corresponding full size arrays for the problems with the
+        specified indices into the current set of problems.
+        """
+
+        ax = type(self).batchaxis
+        idx = (slice(None),)*ax + (self.batch_idx[sel],)
+        for name in self.batch_vars():
+            val = getattr(self, name)
+            if name not in self.batch_full:
+                shp = list(val.shape)
+                shp[ax] = len(self.batch_cnvg)
+                self.batch_full[name] = np.zeros(shp, dtype=val.dtype)
+            self.batch_full[name][idx] = np.take(val, sel, axis=ax)
+
+
+
+    def batch_compact(self, cnvg, k):
+        """Remove converged problems from the working variables and the
+        other attributes with a problem axis.
+
+        Parameters
+        ----------
+        cnvg : ndarray
+          Boolean array indicating which of the problems currently being
+          solved have converged
+        k : int
+          Iteration number
+        """
+
+        ax = type(self).batchaxis
+        done = np.flatnonzero(cnvg)
+        keep = np.flatnonzero(np.logical_not(cnvg))
+        self.batch_save(done)
+        self.batch_cnvg[self.batch_idx[done]] = True
+        self.batch_iter[self.batch_idx[done]] = k
+        # Record the objective function components of the removed
+        # problems so that they can be included in the iteration stats
+        vals = {name: getattr(self, name) for name in self.batch_vars()}
+        for name in vals:
+            setattr(self, name, np.take(vals[name], done, axis=ax))
+        self.batch_objfn = self.batch_objfn + np.array(self.eval_objfn())
+        for name in vals:
+            setattr(self, name, np.take(vals[name], keep, axis=ax))
+        self.batch_idx = self.batch_idx[keep]
+
+
+
+    def batch_end(self):
+        """Restore the attributes with a problem axis to their full size
+        at the end of :meth:`solve`.
+        """
+
+        self.batch_save(np.arange(len(self.batch_idx)))
+        for name in self.batch_full:
+            setattr(self, name, self.batch_full[name])
+        self.batch_idx = np.arange(len(self.batch_cnvg))
+
+
+
+    def accelerate_start(self):
+        """Initialise (or reset) the state of the acceleration method
+        selected by option ``Accelerate``.
+        """
+
+        if self.opt['Accelerate', 'Method'] == 'Anderson':
+            # The history buffers are allocated on the first call and
+            # retained when the state is reset following a change of rho
+            n = self.Y.size + self.U.size
+            m = self.opt['Accelerate', 'Window']
+            if not hasattr(self, 'acc_dF') or self.acc_dF.shape != (m, n):
+                self.acc_dF = np.zeros((m, n), dtype=self.dtype)
+                self.acc_dG = np.zeros((m, n), dtype=self.dtype)
+                self.acc_H = np.zeros((m, m), dtype=self.dtype)
+                self.acc_f = np.zeros(n, dtype=self.dtype)
+                self.acc_g = np.zeros(n, dtype=self.dtype)
+                self.acc_z = np.zeros(n, dtype=self.dtype)
+            self.acc_z[0:self.Y.size] = self.Y.ravel()
+            self.acc_z[self.Y.size:] = self.U.ravel()
+            self.acc_m = 0
+            self.acc_j = 0
+            self.acc_fn = None
+            self.acc_aa = False
+        else:
+            self.acc_alpha = 1.0
+            self.acc_c = np.inf
+            self.acc_Y = self.Y.copy()
+            self.acc_U = self.U.copy()
+
+
+
+    def accelerate(self):
+        """Replace Y and U with extrapolated values at the end of an
+        iteration, using the acceleration method selected by option
+        ``Accelerate``. On entry, attribute :attr:`Yprev` is the value
+        of Y used at the start of the current iteration.
+        """
+
+        if self.opt['Accelerate', 'Method'] == 'Nesterov':
+            self.accelerate_nesterov()
+        elif self.opt['Accelerate', 'Method'] == 'Anderson':
+            self.accelerate_anderson()
+        else:
+            raise ValueError('Invalid value %s for option Accelerate.Method'
+                             % self.opt['Accelerate', 'Method'])
+
+
+
+    def accelerate_nesterov(self):
+        """Fast ADMM with restart (Alg. 8 of :cite:`goldstein-2014-fast`)."""
+
+        # Combined residual, in terms of the scaled dual variable U
+        ck = self.rho*linalg.norm(self.rsdl_r(self.AX, self.Y))**2 + \
+            linalg.norm(self.rsdl_s(self.Yprev, self.Y))**2 / self.rho
+        Yk, Uk = self.Y, self.U
+        if ck < self.opt['Accelerate', 'RestartEta']*self.acc_c:
+            alpha = (1.0 + np.sqrt(1.0 + 4.0*self.acc_alpha**2)) / 2.0
+            gamma = self.dtype.type((self.acc_alpha - 1.0) / alpha)
+            self.Y = Yk + gamma*(Yk - self.acc_Y)
+            self.U = Uk + gamma*(Uk - self.acc_U)
+            self.acc_c = ck
+            self.acc_nstep += 1
+        else:
+            # Restart from the iterates of the previous iteration
+            alpha = 1.0
+            self.acc_nrej += 1
+            self.Y = self.acc_Y
+            self.U = self.acc_U
+            self.acc_c /= self.opt['Accelerate', 'RestartEta']
+        self.acc_alpha = alpha
+        self.acc_Y, self.acc_U = Yk, Uk
+
+
+
+    def accelerate_anderson(self):
+        """Anderson acceleration :cite:`walker-2011-anderson` of the
+        fixed point iteration :math:`\mathbf{z} \mapsto
+        G(\mathbf{z})`, where :math:`\mathbf{z}` is the concatenation
+        of Y and U, and :math:`G` is a single ADMM iteration. The
+        differences of the most recent fixed point residuals
+        :math:`\mathbf{f} = G(\mathbf{z}) - \mathbf{z}` and of the
+        corresponding values of :math:`G(\mathbf{z})` are stored in the
+        rows of ring buffers of ``Accelerate.Window`` rows, and the Gram
+        matrix of the residual differences is updated one row and column
+        at a time, so that the cost per iteration is linear in the
+        window size.
+        """
+
+        n = self.Y.size
+        # Fixed point residual f = G(z) - z, computed in-place in acc_z
+        f = self.acc_z
+        f[0:n] -= self.Y.ravel()
+        f[n:] -= self.U.ravel()
+        f *= -1
+        fn = linalg.norm(f)
+        if self.acc_aa and fn > self.opt['Accelerate', 'Safeguard'] * \
+           self.acc_fn:
+            # The previous extrapolated step increased the residual:
+            # discard the history and take the plain ADMM step
+            self.acc_nrej += 1
+            self.acc_m = 0
+            self.acc_j = 0
+            self.acc_aa = False
+        else:
+            if self.acc_fn is not None:
+                j = self.acc_j
+                dF = self.acc_dF[j]
+                np.subtract(f, self.acc_f, out=dF)
+                self.acc_dG[j] = self.acc_g
+                self.acc_dG[j] *= -1
+                self.acc_dG[j, 0:n] += self.Y.ravel()
+                self.acc_dG[j, n:] += self.U.ravel()
+                self.acc_m = min(self.acc_m + 1, self.acc_dF.shape[0])
+                self.acc_j = (j + 1) % self.acc_dF.shape[0]
+                m = self.acc_m
+                self.acc_H[j, 0:m] = self.acc_dF[0:m].dot(dF)
+                self.acc_H[0:m, j] = self.acc_H[j, 0:m]
+            self.acc_aa = self.acc_m > 0
+        self.acc_f[:] = f
+        self.acc_fn = fn
+        g = self.acc_g
+        g[0:n] = self.Y.ravel()
+        g[n:] = self.U.ravel()
+        if self.acc_aa:
+            # Solve the least squares problem min_gamma |f - dF^T gamma|
+            # via its normal equations
+            m = self.acc_m
+            gamma = linalg.lstsq(self.acc_H[0:m, 0:m],
+                                 self.acc_dF[0:m].dot(f),
+                                 check_finite=False)[0]
+            np.subtract(g, self.acc_dG[0:m].T.dot(gamma), out=self.acc_z)
+            self.acc_nstep += 1
+            self.Y = self.acc_z[0:n].reshape(self.Y.shape).copy()
+            self.U = self.acc_z[n:].reshape(self.U.shape).copy()
+        else:
+            self.acc_z[:] = g
+
+
+
+    def accelerate_summary(self):
+        """Get a dict describing the memory and computational cost of
+        the acceleration selected by option ``Accelerate``. The entries
+        are ``Method``, ``Memory`` (number of bytes of acceleration
+        state), ``Steps`` (number of extrapolated steps), ``Rejected``
+        (number of restarts, or of extrapolated steps rejected by the
+        safeguard), and ``Time`` (time spent computing the
+        acceleration, which is only available when option ``Profile``
+        is enabled).
+        """
+
+        mth = self.opt['Accelerate', 'Method']
+        smry = {'Method' : mth, 'Memory' : 0, 'Steps' : self.acc_nstep,
+                'Rejected' : self.acc_nrej,
+                'Time' : self.phasetimer.times().get('accel', None)}
+        if mth == 'Anderson' and hasattr(self, 'acc_dF'):
+            smry['Memory'] = sum([getattr(self, nm).nbytes for nm in
+                                  ('acc_dF', 'acc_dG', 'acc_H', 'acc_f',
+                                   'acc_g', 'acc_z')])
+        elif mth == 'Nesterov' and hasattr(self, 'acc_Y'):
+            smry['Memory'] = self.acc_Y.nbytes + self.acc_U.nbytes
+        return smry
+
+
+
     def set_attr(self, name, val, dval=None, dtype=None, reset=False):
         """Set an object attribute.
 
@@ -365,6 +955,36 @@ class ADMM(with_metaclass(_ADMM_Meta, object)):
 
 
 
+    def reset_state(self):
+        """Reinitialise working variables Y and U, the iteration count,
+        and the iteration statistics as on object initialisation, so
+        that a subsequent call of :meth:`solve` starts the optimisation
+        afresh. The penalty parameter, and any factorisation that
+        depends on it, is retained. This method is intended for use
+        when the problem data (e.g. the signal) is modified between
+        calls of :meth:`solve`. The batch mode and acceleration state
+        are not reset here since they are initialised at the start of
+        each call of :meth:`solve` or :meth:`iterate`.
+        """
+
+        if self.opt['Y0'] is None:
+            self.Y = self.yinit(self.Y.shape)
+        else:
+            self.Y = self.opt['Y0'].astype(self.dtype, copy=True)
+        self.Yprev = self.Y.copy()
+        if self.opt['U0'] is None:
+            self.U = self.uinit(self.U.shape)
+        else:
+            self.U = self.opt['U0'].astype(self.dtype, copy=True)
+        self.itstat = util.IterStatsStore(type(self).IterationStats)
+        self.k = 0
+        # The state of the spectral rho strategy refers to the
+        # previous problem data
+        if hasattr(self, 'rho_spstate'):
+            del self.rho_spstate
+
+
+
     def solve(self):
         """Start (or re-start) optimisation. This method implements the
         framework for the iterations of an ADMM algorithm. There is sufficient
@@ -372,67 +992,281 @@ class ADMM(with_metaclass(_ADMM_Meta, object)):
         is usually not necessary to override this method in derived clases.
 
         If option ``Verbose`` is ``True``, the progress of the
-        optimisation is displayed at every iteration. At termination
-        of this method, attribute :attr:`itstat` is a list of tuples
-        representing statistics of each iteration.
+        optimisation is displayed at every iteration on which iteration
+        statistics are computed (see option ``StatsPeriod``). At
+        termination of this method, attribute :attr:`itstat` is a list
+        of tuples representing statistics of each such iteration.
+
+        This method runs the iterations of :meth:`iterate` to
+        completion.
         """
 
-        # Open status display
-        fmtstr, nsep = self.display_start()
+        for snp in self.iterate():
+            pass
 
-        # Reset timer
-        self.timer.start()
+        return self.X
 
-        # Main optimisation iterations
-        for k in range(self.k, self.k + self.opt['MaxMainIter']):
 
-            # Update record of Y from previous iteration
-            self.Yprev = self.Y.copy()
 
-            # X update
-            self.xstep()
+    def iterate(self, yview=False):
+        """Start (or re-start) optimisation, as a generator that yields
+        an ``IterationSnapshot`` namedtuple at the end of each
+        iteration. The iterations are identical to those of
+        :meth:`solve`, which is implemented by consuming this
+        generator.
 
-            # Implement relaxation if RelaxParam != 1.0
-            self.relax_AX()
+        The reason for termination of the iterations is recorded in
+        attribute :attr:`termination`, which is set to one of
+        ``Converged``, ``MaxMainIter``, or ``TimeLimit`` (see options
+        ``MaxRunTime`` and ``Deadline``), or None if the consumer stopped
+        iterating.
 
-            # Y update
-            self.ystep()
+        The consumer may stop iterating at any point. The solver state
+        (including attribute :attr:`k`) is always consistent with the
+        iterations that have been completed, so that, for example,
+        options may be changed or :meth:`checkpoint` called between
+        iterations. Calling :meth:`solve` or :meth:`iterate` after
+        stopping continues the optimisation. The run time, status
+        display, and batch mode state are finalised when the generator
+        is exhausted or closed, so a generator that is not exhausted
+        should be closed (e.g. by calling its ``close`` method) before
+        the optimisation is continued.
 
-            # U update
-            self.ustep()
+        The fields of the ``IterationSnapshot`` namedtuple are:
 
-            # Compute residuals and stopping thresholds
-            r, s, epri, edua = self.compute_residuals()
+           ``Iter`` : Iteration number
 
-            # Compute and record other iteration statistics
-            itst = self.iteration_stats(k, r, s, epri, edua)
-            self.itstat.append(itst)
+           ``PrimalRsdl`` : Norm of primal residual, or None if not \
+           computed on this iteration (see option ``ResidualPeriod``)
 
-            # Display iteration stats if Verbose option enabled
-            self.display_status(fmtstr, itst)
+           ``DualRsdl`` : Norm of dual residual, or None
 
-            # Automatic rho adjustment
-            self.update_rho(k, r, s)
+           ``EpsPrimal`` : Primal residual stopping tolerance, or None
 
-            # Call callback function if defined
-            if self.opt['Callback'] is not None:
-                self.opt['Callback'](self, k)
+           ``EpsDual`` : Dual residual stopping tolerance, or None
 
-            # Stop if residual-based stopping tolerances reached
-            if r < epri and s < edua:
-                break
+           ``Rho`` : Penalty parameter
 
+           ``Converged`` : Flag indicating whether the stopping \
+           tolerances have been reached
 
-        # Record run time
-        self.runtime += self.timer.elapsed()
+           ``Stats`` : ``IterationStats`` namedtuple appended to \
+           :attr:`itstat` on this iteration, or None if iteration \
+           statistics were not computed
 
-        # Record iteration count
-        self.k = k+1
+           ``Y`` : Variable Y (not a copy) if `yview` is True, \
+           otherwise None
 
-        # Print final separator string if Verbose option enabled
-        self.display_end(nsep)
+        Parameters
+        ----------
+        yview : bool, optional (default False)
+          Flag indicating whether the ``Y`` field of the snapshots
+          should refer to variable Y. The array is not copied, and is
+          only valid until the next iteration is started.
+        """
 
-        return self.X
+        # Open status display
+        fmtstr, nsep = self.display_start()
+
+        # Reset timer
+        self.timer.start()
+
+        # Enable timing of iteration phases, including FFTs computed in
+        # sporco.linalg, if Profile option enabled
+        phstm = self.phasetimer
+        phstm.enabled = self.opt['Profile']
+        if phstm.enabled:
+            ffttm, sl.fft_timer = sl.fft_timer, phstm
+
+        # Initialise batch mode state
+        if self.opt['Batch']:
+            self.batch_start()
+
+        # Initialise acceleration state
+        accel = self.opt['Accelerate', 'Method'] is not None
+        if accel:
+            self.accelerate_start()
+
+        # Initialise automatic checkpointing
+        chkpt = self.opt['Checkpoint', 'Path'] is not None
+        tchk = self.timer.elapsed()
+
+        # Initialise run time limit and record of the best iterate
+        tmax = time_limit(self.opt['MaxRunTime'], self.opt['Deadline'])
+        rbest = self.opt['ReturnBest']
+        fbest, best = np.inf, None
+        self.termination = None
+        tlim = False
+
+        # Main optimisation iterations
+        kstrt = self.k
+        kend = self.k + self.opt['MaxMainIter'] - 1
+        k = self.k - 1
+        cnvg = False
+        try:
+            for k in range(self.k, kend + 1):
+
+                # Determine whether iteration statistics and residuals
+                # are to be computed on this iteration
+                stat = (k + 1) % self.opt['StatsPeriod'] == 0 or k == kend
+                rsdl = stat or (k + 1) % self.opt['ResidualPeriod'] == 0 or \
+                    (self.opt['AutoRho', 'Enabled'] and
+                     (k + 1) % self.opt['AutoRho', 'Period'] == 0)
+
+                # Update record of Y from previous iteration. This is
+                # always required when there is a run time limit since
+                # the residuals are computed on the final iteration,
+                # which is only known once it has been completed. The
+                # value is copied into the existing array to avoid an
+                # allocation on every iteration.
+                if rsdl or accel or tmax is not None:
+                    np.copyto(self.Yprev, self.Y)
+
+                # X update
+                with phstm('xstep'):
+                    self.xstep()
+
+                # Implement relaxation if RelaxParam != 1.0
+                with phstm('relax'):
+                    self.relax_AX()
+
+                # Y update
+                with phstm('ystep'):
+                    self.ystep()
+
+                # U update
+                with phstm('ustep'):
+                    self.ustep()
+
+                # Determine whether this is the final iteration because
+                # the next iteration is not expected to be completed
+                # within the run time limit, in which case iteration
+                # statistics are computed for this iteration
+                if k < kend and time_limit_reached(
+                        tmax, self.timer.elapsed(), k - kstrt + 1):
+                    tlim = True
+                    stat = rsdl = True
+
+                cnvg = False
+                r, s, epri, edua, itst = (None,) * 5
+                if rsdl:
+                    # Compute residuals and stopping thresholds
+                    with phstm('rsdl'):
+                        r, s, epri, edua = self.compute_residuals()
+                    if self.opt['Batch']:
+                        # Record residuals and convergence of each problem
+                        self.batch_rsdl[:, self.batch_idx] = \
+                            [r.ravel(), s.ravel(), epri.ravel(), edua.ravel()]
+                        bcnvg = np.logical_and(r < epri, s < edua).ravel()
+                        cnvg = bool(np.all(bcnvg))
+                    else:
+                        cnvg = r < epri and s < edua
+
+                    if stat or cnvg:
+                        # Compute and record other iteration statistics
+                        with phstm('itstat'):
+                            itst = self.iteration_stats(k, r, s, epri, edua)
+                        self.itstat.append(itst)
+
+                        # Display iteration stats if Verbose option enabled
+                        self.display_status(fmtstr, itst)
+
+                        # Record a copy of the iterate if it has the
+                        # lowest objective function value so far. The
+                        # copy buffers are allocated on the first such
+                        # iteration and reused thereafter.
+                        if rbest:
+                            fval = getattr(itst, self.itstat_fields_objfn[0])
+                            if fval < fbest:
+                                fbest = fval
+                                if best is None:
+                                    best = [k, self.X.copy(), self.Y.copy(),
+                                            self.U.copy()]
+                                else:
+                                    best[0] = k
+                                    for bv, v in zip(best[1:], (self.X,
+                                                    self.Y, self.U)):
+                                        np.copyto(bv, v)
+
+                    # Automatic rho adjustment
+                    rho = self.rho
+                    with phstm('rho'):
+                        self.update_rho(k, r, s)
+                    if accel and np.any(self.rho != rho):
+                        self.accelerate_start()
+
+                # Call callback function if defined
+                if self.opt['Callback'] is not None:
+                    self.opt['Callback'](self, k)
+
+                # Terminate after this iteration if converged or if the
+                # run time limit has been reached
+                stop = cnvg or tlim
+
+                if not stop:
+                    # Remove converged problems in batch mode
+                    if rsdl and self.opt['Batch'] and np.any(bcnvg):
+                        self.batch_compact(bcnvg, k)
+
+                    # Update Y and U for the next iteration if
+                    # acceleration is enabled
+                    if accel and k < kend:
+                        with phstm('accel'):
+                            self.accelerate()
+
+                # Record iteration count
+                self.k = k + 1
+
+                # Save checkpoint if due
+                if not stop and chkpt and checkpoint_due(
+                        self.opt['Checkpoint'], k,
+                        self.timer.elapsed() - tchk):
+                    with phstm('chkpt'):
+                        state = self.checkpoint_state()
+                        state['runtime'] += self.timer.elapsed()
+                        util.save_checkpoint(self.opt['Checkpoint', 'Path'],
+                                             state)
+                    tchk = self.timer.elapsed()
+
+                yield IterationSnapshot(k, r, s, epri, edua, self.rho,
+                                        bool(cnvg), itst,
+                                        self.Y if yview else None)
+
+                # Stop if residual-based stopping tolerances or run
+                # time limit reached
+                if stop:
+                    break
+
+        finally:
+            # Record reason for termination
+            if cnvg:
+                self.termination = 'Converged'
+            elif tlim:
+                self.termination = 'TimeLimit'
+            elif k == kend:
+                self.termination = 'MaxMainIter'
+
+            # Replace the final iterate with the best one if required
+            if rbest and best is not None and best[0] != k:
+                for v, bv in zip((self.X, self.Y, self.U), best[1:]):
+                    np.copyto(v, bv)
+
+            # Record run time
+            self.runtime += self.timer.elapsed()
+
+            # Restore previous FFT timer
+            if phstm.enabled:
+                sl.fft_timer = ffttm
+
+            # Restore full set of problems in batch mode
+            if self.opt['Batch']:
+                if cnvg:
+                    self.batch_cnvg[self.batch_idx] = True
+                    self.batch_iter[self.batch_idx] = k
+                self.batch_end()
+
+            # Print final separator string if Verbose option enabled
+            self.display_end(nsep)
 
 
 
@@ -487,6 +1321,9 @@ class ADMM(with_metaclass(_ADMM_Meta, object)):
     def compute_residuals(self):
         """Compute residuals and stopping thresholds."""
 
+        if self.opt['Batch']:
+            return self.compute_residuals_batch()
+
         if self.opt['AutoRho', 'StdResiduals']:
             r = linalg.norm(self.rsdl_r(self.AXnr, self.Y))
             s = linalg.norm(self.rsdl_s(self.Yprev, self.Y))
@@ -512,6 +1349,39 @@ class ADMM(with_metaclass(_ADMM_Meta, object)):
 
 
 
+    def compute_residuals_batch(self):
+        """Compute residuals and stopping thresholds independently for
+        each problem in batch mode. The residual normalisation terms are
+        computed from the general form of the constraint
+        :math:`A\\mathbf{x} + B\\mathbf{y} = \\mathbf{c}`.
+        """
+
+        nb = len(self.batch_cnvg)
+        r = self.batch_norm(self.rsdl_r(self.AXnr, self.Y))
+        s = self.batch_norm(self.rsdl_s(self.Yprev, self.Y))
+        rn = np.maximum(np.maximum(self.batch_norm(self.AXnr),
+                                   self.batch_norm(self.cnst_B(self.Y))),
+                        self.batch_norm(self.cnst_c()))
+        sn = self.batch_norm(self.rho*self.cnst_AT(self.U))
+        if self.opt['AutoRho', 'StdResiduals']:
+            epri = np.sqrt(self.Nc/nb)*self.opt['AbsStopTol'] + \
+                rn*self.opt['RelStopTol']
+            edua = np.sqrt(self.Nx/nb)*self.opt['AbsStopTol'] + \
+                sn*self.opt['RelStopTol']
+        else:
+            rn[rn == 0.0] = 1.0
+            sn[sn == 0.0] = 1.0
+            r /= rn
+            s /= sn
+            epri = np.sqrt(self.Nc/nb)*self.opt['AbsStopTol']/rn + \
+                self.opt['RelStopTol']
+            edua = np.sqrt(self.Nx/nb)*self.opt['AbsStopTol']/sn + \
+                self.opt['RelStopTol']
+
+        return r, s, epri, edua
+
+
+
     @classmethod
     def itstat_fields(cls):
         """Construct tuple of field names used to initialise IterationStats
@@ -519,7 +1389,8 @@ class ADMM(with_metaclass(_ADMM_Meta, object)):
         """
 
         return ('Iter',) + cls.itstat_fields_objfn + ('PrimalRsdl', 'DualRsdl',
-        'EpsPrimal', 'EpsDual', 'Rho') +  cls.itstat_fields_extra + ('Time',)
+        'EpsPrimal', 'EpsDual', 'Rho') +  cls.itstat_fields_extra + \
+        ('Time', 'PhaseTime')
 
 
 
@@ -548,8 +1419,18 @@ class ADMM(with_metaclass(_ADMM_Meta, object)):
         """Construct iteration stats record tuple."""
 
         tk = self.timer.elapsed()
-        tpl = (k,) + self.eval_objfn() + (r, s, epri, edua, self.rho) +\
-              self.itstat_extra() + (tk,)
+        tph = self.phasetimer.times() if self.phasetimer.enabled else None
+        rho = self.rho
+        objfn = self.eval_objfn()
+        if self.opt['Batch']:
+            # Record values for all problems in batch mode, including
+            # those that have converged
+            r, s, epri, edua = self.batch_rsdl.copy()
+            rho = self.batch_full['rho'].ravel().copy()
+            rho[self.batch_idx] = self.rho.ravel()
+            objfn = tuple(self.batch_objfn + np.array(objfn))
+        tpl = (k,) + objfn + (r, s, epri, edua, rho) +\
+              self.itstat_extra() + (tk, tph)
         return type(self).IterationStats(*tpl)
 
 
@@ -575,22 +1456,141 @@ class ADMM(with_metaclass(_ADMM_Meta, object)):
 
     def getitstat(self):
         """Get iteration stats as named tuple of arrays instead of array of
-        named tuples.
+        named tuples. The arrays are copies of the columns of the
+        :attr:`itstat` store, and are therefore not modified by
+        subsequent iterations.
         """
 
-        if len(self.itstat) == 0:
-            return None
+        return self.itstat.astuple(copy=True)
+
+
+
+    def checkpoint_state(self):
+        """Get a dict representing the state of the solver, consisting
+        of the iteration count, run time, iteration statistics, penalty
+        parameter, variables X, Y, and U, and the state of the adaptive
+        rho strategy, if any. Derived classes with additional state
+        should extend this method and :meth:`restore_state`.
+        """
+
+        state = {'class' : type(self).__name__, 'k' : self.k,
+                 'runtime' : self.runtime, 'itstat' : self.itstat,
+                 'rho' : self.rho, 'Y' : self.Y, 'U' : self.U,
+                 'acc_nstep' : self.acc_nstep, 'acc_nrej' : self.acc_nrej}
+        if getattr(self, 'X', None) is not None:
+            state['X'] = self.X
+        if hasattr(self, 'rho_spstate'):
+            state['rho_spstate'] = dict(zip(('AX', 'BY', 'lmbd', 'lmbdh'),
+                                            self.rho_spstate))
+        return state
+
+
+
+    def restore_state(self, state):
+        """Restore the state of the solver from a dict constructed by
+        :meth:`checkpoint_state`. The problem definition (e.g. the
+        dictionary and signal) is not part of the state, and is
+        assumed to be the same as that of the solver from which the
+        state was obtained.
+        """
+
+        if state['class'] != type(self).__name__:
+            raise ValueError('Cannot restore state of a %s object into a %s '
+                             'object' % (state['class'], type(self).__name__))
+        if state['Y'].shape != self.Y.shape:
+            raise ValueError('Shape %s of restored variable Y does not match '
+                             'shape %s' % (state['Y'].shape, self.Y.shape))
+        self.k = int(state['k'])
+        self.runtime = float(state['runtime'])
+        self.itstat = state['itstat']
+        self.acc_nstep = state['acc_nstep']
+        self.acc_nrej = state['acc_nrej']
+        # The restored variables are copied into the existing arrays
+        # where possible, so that they do not refer to the (possibly
+        # memory-mapped) arrays of the state dict
+        for name in ('X', 'Y', 'U'):
+            if name in state:
+                val = getattr(self, name, None)
+                if isinstance(val, np.ndarray) and val.flags.writeable and \
+                   val.shape == state[name].shape:
+                    np.copyto(val, state[name])
+                else:
+                    setattr(self, name, np.array(state[name],
+                                                 dtype=self.dtype))
+        if 'rho_spstate' in state:
+            self.rho_spstate = tuple([state['rho_spstate'][nm] for nm in
+                                      ('AX', 'BY', 'lmbd', 'lmbdh')])
+        if isinstance(state['rho'], np.ndarray) and state['rho'].ndim > 0:
+            self.rho = np.asarray(state['rho'], dtype=self.dtype)
         else:
-            return type(self).IterationStats(
-                *[[self.itstat[k][l] for k in range(len(self.itstat))]
-                  for l in range(len(self.itstat[0]))])
+            self.rho = self.dtype.type(state['rho'])
+        self.rhochange()
+
+
+
+    def checkpoint(self, path):
+        """Save a checkpoint of the solver state (see
+        :meth:`checkpoint_state`) in directory `path`. The variable
+        arrays are saved as ``.npy`` files that are memory-mapped when
+        the checkpoint is restored by :meth:`restore`.
+
+        Parameters
+        ----------
+        path : string
+          Checkpoint directory path
+        """
+
+        util.save_checkpoint(path, self.checkpoint_state())
+
+
+
+    def restore(self, path):
+        """Restore the solver state from a checkpoint saved by
+        :meth:`checkpoint`, or by automatic checkpointing. A
+        subsequent call of :meth:`solve` continues the optimisation
+        from the restored state. The solver object should be
+        initialised with the same problem definition and options as
+        the one from which the checkpoint was saved.
+
+        Parameters
+        ----------
+        path : string
+          Checkpoint directory path
+        """
+
+        self.restore_state(util.load_checkpoint(path))
+
+
+
+    def phase_summary(self):
+        """Get a string containing a table of the accumulated run time,
+        number of calls, and time per call of each phase of the
+        iterations, as recorded when option ``Profile`` is enabled. The
+        phases are ``xstep``, ``relax``, ``ystep``, ``ustep``, ``rsdl``
+        (residual computation), ``itstat`` (objective function and other
+        iteration statistics), ``rho`` (penalty parameter update,
+        including any consequent refactorisation), ``accel``
+        (acceleration), and ``chkpt`` (automatic checkpointing). Phase
+        ``fft`` is the time spent in the FFT functions of
+        :mod:`sporco.linalg`, which is also included in the time of the
+        phase from which they are
+        called.
+        """
+
+        return self.phasetimer.summary()
 
 
 
     def update_rho(self, k, r, s):
         """Automatic rho adjustment."""
 
-        if self.opt['AutoRho', 'Enabled']:
+        if self.opt['Batch']:
+            self.update_rho_batch(k, r, s)
+        elif self.opt['AutoRho', 'Enabled'] and \
+             self.opt['AutoRho', 'Strategy'] == 'Spectral':
+            if scipy.mod(k+1, self.opt['AutoRho', 'Period']) == 0:
+                self.update_rho_spectral(k)
+        elif self.opt['AutoRho', 'Enabled']:
             tau = self.rho_tau
             mu = self.rho_mu
             xi = self.rho_xi
@@ -616,6 +1616,76 @@ class ADMM(with_metaclass(_ADMM_Meta, object)):
 
 
 
+    def update_rho_spectral(self, k):
+        """Automatic rho adjustment via spectral penalty parameter
+        selection (Alg. 1 of :cite:`xu-2017-adaptive`). The dual
+        variable :math:`\\boldsymbol{\lambda}` and the intermediate
+        dual variable :math:`\hat{\\boldsymbol{\lambda}}` (obtained
+        by a dual update using the value of Y from the previous
+        iteration) are related to the scaled dual variable U by
+        :math:`\\boldsymbol{\lambda} = -\\rho \mathbf{u}` (the sign
+        reflecting the sign convention for the constraint in
+        :cite:`xu-2017-adaptive`). The curvature estimates are computed
+        from the differences between their values, and those of
+        :math:`A \mathbf{x}` and :math:`B \mathbf{y}`, at the current
+        iteration and at the previous rho update.
+        """
+
+        BY = self.cnst_B(self.Y)
+        lmbd = -self.rho*self.U
+        lmbdh = lmbd + self.rho*(self.cnst_B(self.Y - self.Yprev) +
+                                 self.AX - self.AXnr)
+        if hasattr(self, 'rho_spstate'):
+            AX0, BY0, lmbd0, lmbdh0 = self.rho_spstate
+            ahat, acor = spectral_stepsize(self.AXnr - AX0, lmbdh - lmbdh0)
+            bhat, bcor = spectral_stepsize(BY - BY0, lmbd - lmbd0)
+            eps = self.opt['AutoRho', 'SpectralCorr']
+            if acor > eps and bcor > eps:
+                tau = np.sqrt(ahat*bhat)
+            elif acor > eps:
+                tau = ahat
+            elif bcor > eps:
+                tau = bhat
+            else:
+                tau = self.rho
+            cg = 1.0 + self.opt['AutoRho', 'SpectralSafeguard'] / (k+1)**2
+            tau = min(max(tau, self.rho/cg), self.rho*cg)
+            if tau != self.rho:
+                rsf = tau / self.rho
+                self.rho = self.dtype.type(tau)
+                self.U = self.U/rsf
+                self.rhochange()
+        self.rho_spstate = (self.AXnr.copy(), BY, lmbd, lmbdh)
+
+
+
+    def update_rho_batch(self, k, r, s):
+        """Automatic rho adjustment, independently for each problem, in
+        batch mode.
+        """
+
+        if self.opt['AutoRho', 'Enabled']:
+            tau = self.rho_tau
+            mu = self.rho_mu
+            xi = self.rho_xi
+            if k != 0 and scipy.mod(k+1, self.opt['AutoRho', 'Period']) == 0:
+                if self.opt['AutoRho', 'AutoScaling']:
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        rhomlt = np.sqrt(np.where(r > s*xi, r/(s*xi),
+                                                  (s*xi)/r))
+                    rhomlt[np.logical_or(s == 0.0, r == 0.0)] = tau
+                    rhomlt = np.minimum(rhomlt, tau)
+                else:
+                    rhomlt = tau
+                rsf = np.where(r > xi*mu*s, rhomlt,
+                               np.where(s > (mu/xi)*r, 1.0/rhomlt, 1.0))
+                self.rho = np.asarray(rsf*self.rho, dtype=self.dtype)
+                self.U = np.asarray(self.U/rsf, dtype=self.dtype)
+                if np.any(rsf != 1.0):
+                    self.rhochange()
+
+
+
     def display_start(self):
         """Set up status display if option selected. NB: this method assumes
         that the first entry is the iteration count and the last is
@@ -651,6 +1721,10 @@ class ADMM(with_metaclass(_ADMM_Meta, object)):
             hdrtxt = type(self).hdrtxt()
             hdrval = type(self).hdrval()
             itdsp = tuple([getattr(itst, hdrval[col]) for col in hdrtxt])
+            # Display maximum over problems of array values in batch mode
+            if self.opt['Batch']:
+                itdsp = tuple([np.nanmax(v) if isinstance(v, np.ndarray)
+                               else v for v in itdsp])
             if not self.opt['AutoRho','Enabled']:
                 itdsp = itdsp[0:-1]
 
@@ -1427,3 +2501,47 @@ class ADMMTwoBlockCnstrnt(ADMM):
         """
 
         return self.rho*linalg.norm(self.cnst_AT(U))
+
+
+
+
+class SolvePathMixin(object):
+    """Mixin class providing a warm-started regularisation path solver
+    for :class:`ADMM` derived classes that define methods ``setlmbda``
+    and ``getcoef``.
+    """
+
+    def solve_path(self, lmbda, sparse=False):
+        """Solve the problem for each of a sequence of values of the
+        regularisation parameter :math:`\lambda`, each solution being
+        used as a warm start for the next. Since the warm start is most
+        effective when the solution support grows gradually, the
+        sequence should usually be in decreasing order.
+
+        Parameters
+        ----------
+        lmbda : sequence of float
+          Regularisation parameter values
+        sparse : bool, optional (default False)
+          Flag indicating whether the solutions should be returned as
+          :class:`scipy.sparse.csr_matrix` objects, representing each
+          coefficient array reshaped so that its final axis indexes the
+          matrix columns, rather than as dense arrays
+
+        Returns
+        -------
+        X : list
+          Coefficient array for each value in `lmbda`
+        """
+
+        X = []
+        for l in lmbda:
+            self.setlmbda(l)
+            self.solve()
+            Xl = self.getcoef()
+            if sparse:
+                X.append(scipy.sparse.csr_matrix(
+                    Xl.reshape((-1, Xl.shape[-1]))))
+            else:
+                X.append(Xl.copy())
+        return X
@@ -12,10 +12,12 @@ from __future__ import absolute_import
 
 import numpy as np
 from scipy import linalg
+import scipy.sparse as sp
 import copy
 
 from sporco.admm import admm
 import sporco.linalg as sl
+from sporco import util
 from sporco.util import u
 
 
@@ -81,11 +83,21 @@ class GenericBPDN(admm.ADMMEqual):
         as its argument.
 
         ``NonNegCoef`` : If ``True``, force solution to be non-negative.
+
+        ``LinSolve`` : Select linear solver for x step. Options are \
+        ``CHO`` (Cholesky factorisation, computed in the precision \
+        specified by ``DataType`` and recomputed when rho changes), \
+        ``LU`` (LU factorisation, which is recomputed when rho changes) \
+        or ``EIG`` (eigenvalue decomposition, which is computed once \
+        and is valid for all values of rho). If option ``Batch`` is \
+        enabled, ``EIG`` is always used since it supports a different \
+        rho for each problem.
         """
 
         defaults = copy.deepcopy(admm.ADMMEqual.Options.defaults)
         defaults.update({'AuxVarObj' : True, 'ReturnX' : False,
-                        'RelaxParam' : 1.8, 'NonNegCoef' : False})
+                        'RelaxParam' : 1.8, 'NonNegCoef' : False,
+                        'LinSolve' : 'CHO'})
         defaults['AutoRho'].update({'Enabled' : True, 'Period' : 10,
                                     'AutoScaling' : True, 'Scaling' : 1000.0,
                                     'RsdlRatio' : 1.2})
@@ -109,6 +121,8 @@ class GenericBPDN(admm.ADMMEqual):
     itstat_fields_objfn = ('ObjFun', 'DFid', 'Reg')
     hdrtxt_objfn = ('Fnc', 'DFid', 'Reg')
     hdrval_objfun = {'Fnc' : 'ObjFun', 'DFid' : 'DFid', 'Reg' : 'Reg'}
+    batchaxis = 1
+    batchattr = ('S', 'DTS')
 
 
 
@@ -130,8 +144,14 @@ class GenericBPDN(admm.ADMMEqual):
         Nm = S.shape[1]
         if opt is None:
             opt = GenericBPDN.Options()
+        if opt['LinSolve'] not in ('EIG', 'CHO', 'LU'):
+            raise ValueError('Invalid value %s for option LinSolve' %
+                             opt['LinSolve'])
         super(GenericBPDN, self).__init__((Nc, Nm), S.dtype, opt)
 
+        # Batch mode requires a linear solver that supports a distinct
+        # rho for each column of S
+        self.linsolve = 'EIG' if self.opt['Batch'] else self.opt['LinSolve']
         self.S = np.asarray(S, dtype=self.dtype)
         self.setdict(D)
 
@@ -149,8 +169,38 @@ class GenericBPDN(admm.ADMMEqual):
         self.D = np.asarray(D, dtype=self.dtype)
         self.DTS = self.D.T.dot(self.S)
         # Factorise dictionary for efficient solves
-        self.lu, self.piv = sl.lu_factor(self.D, self.rho)
-        self.lu = np.asarray(self.lu, dtype=self.dtype)
+        if self.linsolve == 'EIG':
+            self.eigval, self.eigvec = sl.eig_factor(self.D)
+        elif self.linsolve == 'LU':
+            self.lu, self.piv = sl.lu_factor(self.D, self.rho)
+            self.lu = np.asarray(self.lu, dtype=self.dtype)
+        else:
+            self.c, self.lwr = sl.cho_factor(self.D, self.rho)
+
+
+
+    def setsignal(self, S):
+        """Set signal array, which must have the same shape as the
+        signal array with which the object was initialised. The
+        dictionary factorisation and the penalty parameter are
+        retained, the product :math:`D^T S` is computed into the
+        existing array, and the working variables are reinitialised
+        (see :meth:`.ADMM.reset_state`) so that a subsequent call of
+        :meth:`solve` computes the solution for the new signal.
+
+        Parameters
+        ----------
+        S : array_like, shape (N, K)
+          Signal vector or matrix
+        """
+
+        S = np.asarray(S, dtype=self.dtype)
+        if S.shape != self.S.shape:
+            raise ValueError('Shape %s of signal array does not match shape '
+                             '%s' % (S.shape, self.S.shape))
+        self.S = S
+        np.dot(self.D.T, self.S, out=self.DTS)
+        self.reset_state()
 
 
 
@@ -164,9 +214,18 @@ class GenericBPDN(admm.ADMMEqual):
     def xstep(self):
         """Minimise Augmented Lagrangian with respect to x."""
 
-        self.X = np.asarray(sl.lu_solve_ATAI(self.D, self.rho, self.DTS +
+        if self.linsolve == 'EIG':
+            self.X = np.asarray(sl.eig_solve_ATAI(self.D, self.rho, self.DTS +
+                        self.rho*(self.Y - self.U), self.eigval, self.eigvec),
+                        dtype=self.dtype)
+        elif self.linsolve == 'LU':
+            self.X = np.asarray(sl.lu_solve_ATAI(self.D, self.rho, self.DTS +
                         self.rho*(self.Y - self.U), self.lu, self.piv),
                         dtype=self.dtype)
+        else:
+            self.X = np.asarray(sl.cho_solve_ATAI(self.D, self.rho, self.DTS +
+                        self.rho*(self.Y - self.U), self.c, self.lwr),
+                        dtype=self.dtype)
 
 
 
@@ -217,14 +276,17 @@ class GenericBPDN(admm.ADMMEqual):
     def rhochange(self):
         """Re-factorise matrix when rho changes."""
 
-        self.lu, self.piv = sl.lu_factor(self.D, self.rho)
-        self.lu = np.asarray(self.lu, dtype=self.dtype)
+        if self.linsolve == 'LU':
+            self.lu, self.piv = sl.lu_factor(self.D, self.rho)
+            self.lu = np.asarray(self.lu, dtype=self.dtype)
+        elif self.linsolve != 'EIG':
+            self.c, self.lwr = sl.cho_factor(self.D, self.rho)
 
 
 
 
 
-class BPDN(GenericBPDN):
+class BPDN(admm.SolvePathMixin, GenericBPDN):
     """ADMM algorithm for the Basis Pursuit DeNoising (BPDN)
     :cite:`chen-1998-atomic` problem.
 
@@ -293,10 +355,25 @@ class BPDN(GenericBPDN):
         option is defined, the regularization term is :math:`\lambda \|
         \mathbf{w} \odot \mathbf{x} \|_1` where :math:`\mathbf{w}`
         denotes the weighting array.
+
+        ``Screening`` : Options for gap safe screening
+        :cite:`ndiaye-2017-gap` of dictionary atoms. Atoms for which
+        the screening test, based on the duality gap of the current
+        iterate, guarantees that the corresponding row of the solution
+        is zero are permanently eliminated from the X step linear
+        system, so that the solution is unchanged. Screening is not
+        supported in batch mode or by classes derived from
+        :class:`BPDN` that modify the X or Y steps.
+
+          ``Enabled`` : Flag determining whether screening is enabled
+
+          ``Period`` : Iteration period on which the screening test is
+          applied
         """
 
         defaults = copy.deepcopy(GenericBPDN.Options.defaults)
-        defaults.update({'L1Weight' : 1.0})
+        defaults.update({'L1Weight' : 1.0,
+                         'Screening' : {'Enabled' : False, 'Period' : 10}})
 
 
         def __init__(self, opt=None):
@@ -311,6 +388,7 @@ class BPDN(GenericBPDN):
     itstat_fields_objfn = ('ObjFun', 'DFid', 'RegL1')
     hdrtxt_objfn = ('Fnc', 'DFid', u('Regℓ1'))
     hdrval_objfun = {'Fnc' : 'ObjFun', 'DFid' : 'DFid', u('Regℓ1') : 'RegL1'}
+    batchattr = GenericBPDN.batchattr + ('lmbda', 'wl1')
 
 
 
@@ -334,6 +412,17 @@ class BPDN(GenericBPDN):
         if opt is None:
             opt = BPDN.Options()
 
+        # The screening test is only valid for the X and Y steps of
+        # this class
+        if opt['Screening', 'Enabled']:
+            if opt['Batch']:
+                raise ValueError('Option Screening is not supported in '
+                                 'batch mode')
+            if type(self).xstep != BPDN.xstep or \
+               type(self).ystep != BPDN.ystep:
+                raise ValueError('Option Screening is not supported by '
+                                 'class ' + type(self).__name__)
+
         # Set dtype attribute based on S.dtype and opt['DataType']
         self.set_dtype(opt, S.dtype)
 
@@ -346,6 +435,10 @@ class BPDN(GenericBPDN):
         self.lmbda = self.dtype.type(lmbda)
         self.wl1 = np.asarray(opt['L1Weight'], dtype=self.dtype)
 
+        # Indices of atoms not eliminated by screening, or None if no
+        # atoms have been eliminated
+        self.scrnidx = None
+
         # Set penalty parameter
         self.set_attr('rho', opt['rho'], dval=(50.0*self.lmbda + 1.0),
                       dtype=self.dtype)
@@ -357,6 +450,11 @@ class BPDN(GenericBPDN):
 
         super(BPDN, self).__init__(D, S, opt)
 
+        # In batch mode lmbda may have a distinct value for each column
+        # of S
+        if self.opt['Batch']:
+            self.lmbda = self.batch_param(self.lmbda)
+
 
 
     def uinit(self, ushape):
@@ -372,6 +470,150 @@ class BPDN(GenericBPDN):
 
 
 
+    def setlmbda(self, lmbda):
+        """Set regularisation parameter :math:`\lambda`.
+
+        The current working variables are retained as a warm start for
+        a subsequent call of :meth:`solve`, with scaled dual variable
+        :math:`\mathbf{u}` rescaled in proportion to the change in
+        :math:`\lambda` so that the dual optimality criterion (see
+        (3.10) in :cite:`boyd-2010-distributed`) remains satisfied.
+        Since :math:`\\rho` is not modified, no refactorisation is
+        required.
+
+        Parameters
+        ----------
+        lmbda : float
+          New regularisation parameter
+        """
+
+        lmbda = self.dtype.type(lmbda)
+        if self.opt['AutoRho', 'RsdlTarget'] is None:
+            self.rho_xi = self.dtype.type(1.0 + (18.3)**(np.log10(lmbda)
+                                                         + 1.0))
+        if self.opt['Batch']:
+            lmbda = self.batch_param(lmbda)
+        if np.all(self.lmbda > 0):
+            self.U *= lmbda / self.lmbda
+        self.lmbda = lmbda
+        # Atoms eliminated by screening are only guaranteed to be
+        # unused for the previous value of lmbda
+        if self.scrnidx is not None:
+            self.setdict(self.D)
+
+
+
+    def setsignal(self, S):
+        """Set signal array (see :meth:`.GenericBPDN.setsignal`)."""
+
+        super(BPDN, self).setsignal(S)
+        # Atoms eliminated by screening are only guaranteed to be
+        # unused for the previous signal
+        if self.scrnidx is not None:
+            self.setdict(self.D)
+
+
+
+    def setdict(self, D):
+        """Set dictionary array."""
+
+        super(BPDN, self).setdict(D)
+        # Atoms eliminated by screening are only guaranteed to be
+        # unused for the previous dictionary
+        self.scrnidx = None
+
+
+
+    def xstep(self):
+        """Minimise Augmented Lagrangian with respect to x. If option
+        ``Screening`` is enabled, the screening test is applied
+        (see :meth:`screen`) at the start of every ``Period``
+        iterations, and the linear system is only solved for the
+        atoms that have not been eliminated.
+        """
+
+        if self.opt['Screening', 'Enabled'] and self.k > 0 and \
+           self.k % self.opt['Screening', 'Period'] == 0:
+            self.screen()
+
+        if self.scrnidx is None:
+            super(BPDN, self).xstep()
+            return
+
+        idx = self.scrnidx
+        self.X = np.zeros(self.Y.shape, dtype=self.dtype)
+        if idx.size == 0:
+            return
+        b = self.DTSs + self.rho*(self.Y[idx] - self.U[idx])
+        if self.linsolve == 'EIG':
+            self.X[idx] = sl.eig_solve_ATAI(self.Ds, self.rho, b,
+                                            self.eigval, self.eigvec)
+        elif self.linsolve == 'LU':
+            self.X[idx] = sl.lu_solve_ATAI(self.Ds, self.rho, b,
+                                           self.lu, self.piv)
+        else:
+            self.X[idx] = sl.cho_solve_ATAI(self.Ds, self.rho, b,
+                                            self.c, self.lwr)
+
+
+
+    def screen(self):
+        """Apply the gap safe screening test :cite:`ndiaye-2017-gap`
+        at the current value of Y, and eliminate the atoms for which
+        every coefficient is guaranteed to be zero in the solution.
+        The residual :math:`\mathbf{r}_k = \mathbf{s}_k - D
+        \mathbf{y}_k` of each column :math:`k` is scaled to give a
+        dual feasible point, and the resulting duality gap
+        :math:`G_k` determines a sphere that contains the dual
+        solution. Atom :math:`\mathbf{d}_m` is eliminated if, for
+        every column, :math:`| \mathbf{d}_m^T \mathbf{r}_k | /
+        \\alpha_k + \sqrt{2 G_k} \| \mathbf{d}_m \|_2 < \lambda
+        w_{m,k}`, where :math:`\\alpha_k` is the scaling of the
+        residual.
+        """
+
+        w = self.lmbda * np.broadcast_to(self.wl1, self.Y.shape)
+        # A dual feasible point cannot be constructed by scaling the
+        # residual if any of the weights is zero
+        if np.any(w <= 0):
+            return
+
+        M = self.Y.shape[0]
+        idx = np.arange(M) if self.scrnidx is None else self.scrnidx
+        R = self.S - self.D[:, idx].dot(self.Y[idx])
+        DTR = self.D.T.dot(R)
+        if not self.opt['NonNegCoef']:
+            DTR = np.abs(DTR)
+        # Scaling of the residual of each column giving a dual
+        # feasible point, and the corresponding duality gap
+        alpha = np.maximum(1.0, np.max(DTR / w, axis=0))
+        pobj = 0.5*np.sum(R**2, axis=0) + np.sum(w*np.abs(self.Y), axis=0)
+        dobj = 0.5*np.sum(self.S**2, axis=0) - \
+            0.5*np.sum((self.S - R/alpha)**2, axis=0)
+        rad = np.sqrt(2.0*np.maximum(pobj - dobj, 0.0))
+        dnrm = np.sqrt(np.sum(self.D**2, axis=0))
+        keep = np.any(DTR/alpha + dnrm[:, np.newaxis]*rad >= w, axis=1)
+        if np.all(keep[idx]):
+            return
+
+        self.scrnidx = idx[keep[idx]]
+        self.X[~keep] = 0.0
+        self.Y[~keep] = 0.0
+        self.U[~keep] = 0.0
+        self.Ds = self.D[:, self.scrnidx]
+        self.DTSs = self.DTS[self.scrnidx]
+        if self.linsolve == 'EIG':
+            if self.scrnidx.size > 0:
+                self.eigval, self.eigvec = sl.eig_factor(self.Ds)
+        else:
+            self.rhochange()
+        # The history of the acceleration method includes the values
+        # of the eliminated coefficients
+        if self.opt['Accelerate', 'Method'] is not None:
+            self.accelerate_start()
+
+
+
     def ystep(self):
         """Minimise Augmented Lagrangian with respect to y."""
 
@@ -387,11 +629,28 @@ class BPDN(GenericBPDN):
         function.
         """
 
+        if self.opt['Batch']:
+            rl1 = np.sum(np.abs(self.wl1 * self.obfn_gvar()), axis=0)
+            return (np.sum(self.lmbda*rl1), np.sum(rl1))
         rl1 = linalg.norm((self.wl1 * self.obfn_gvar()).ravel(), 1)
         return (self.lmbda*rl1, rl1)
 
 
 
+    def rhochange(self):
+        """Re-factorise matrix when rho changes."""
+
+        if self.scrnidx is None:
+            super(BPDN, self).rhochange()
+        elif self.scrnidx.size > 0:
+            if self.linsolve == 'LU':
+                self.lu, self.piv = sl.lu_factor(self.Ds, self.rho)
+                self.lu = np.asarray(self.lu, dtype=self.dtype)
+            elif self.linsolve != 'EIG':
+                self.c, self.lwr = sl.cho_factor(self.Ds, self.rho)
+
+
+
 
 
 class BPDNJoint(BPDN):
@@ -446,6 +705,8 @@ class BPDNJoint(BPDN):
     hdrtxt_objfn = ('Fnc', 'DFid', u('Regℓ1'), u('Regℓ2,1'))
     hdrval_objfun = {'Fnc' : 'ObjFun', 'DFid' : 'DFid',
                      u('Regℓ1') : 'RegL1', u('Regℓ2,1') : 'RegL21'}
+    # The columns are coupled by the l2,1 norm term
+    batchaxis = None
 
 
 
@@ -590,20 +851,34 @@ class ElasticNet(BPDN):
     def setdict(self, D):
         """Set dictionary array."""
 
-        self.D = np.asarray(D)
+        self.D = np.asarray(D, dtype=self.dtype)
         self.DTS = self.D.T.dot(self.S)
         # Factorise dictionary for efficient solves
-        self.lu, self.piv = sl.lu_factor(self.D, self.mu + self.rho)
-        self.lu = np.asarray(self.lu, dtype=self.dtype)
+        if self.linsolve == 'EIG':
+            self.eigval, self.eigvec = sl.eig_factor(self.D)
+        elif self.linsolve == 'LU':
+            self.lu, self.piv = sl.lu_factor(self.D, self.mu + self.rho)
+            self.lu = np.asarray(self.lu, dtype=self.dtype)
+        else:
+            self.c, self.lwr = sl.cho_factor(self.D, self.mu + self.rho)
 
 
 
     def xstep(self):
         """Minimise Augmented Lagrangian with respect to x."""
 
-        self.X = np.asarray(sl.lu_solve_ATAI(self.D, self.mu + self.rho,
-                    self.DTS + self.rho*(self.Y - self.U), self.lu, self.piv),
-                    dtype=self.dtype)
+        if self.linsolve == 'EIG':
+            self.X = np.asarray(sl.eig_solve_ATAI(self.D, self.mu + self.rho,
+                        self.DTS + self.rho*(self.Y - self.U), self.eigval,
+                        self.eigvec), dtype=self.dtype)
+        elif self.linsolve == 'LU':
+            self.X = np.asarray(sl.lu_solve_ATAI(self.D, self.mu + self.rho,
+                        self.DTS + self.rho*(self.Y - self.U), self.lu,
+                        self.piv), dtype=self.dtype)
+        else:
+            self.X = np.asarray(sl.cho_solve_ATAI(self.D, self.mu + self.rho,
+                        self.DTS + self.rho*(self.Y - self.U), self.c,
+                        self.lwr), dtype=self.dtype)
 
 
 
@@ -612,8 +887,11 @@ class ElasticNet(BPDN):
         function.
         """
 
-        rl1 = linalg.norm((self.wl1 * self.obfn_gvar()).ravel(), 1)
         rl2 = 0.5*linalg.norm(self.obfn_gvar())**2
+        if self.opt['Batch']:
+            rl1 = np.sum(np.abs(self.wl1 * self.obfn_gvar()), axis=0)
+            return (np.sum(self.lmbda*rl1) + self.mu*rl2, np.sum(rl1), rl2)
+        rl1 = linalg.norm((self.wl1 * self.obfn_gvar()).ravel(), 1)
         return (self.lmbda*rl1 + self.mu*rl2, rl1, rl2)
 
 
@@ -621,5 +899,196 @@ class ElasticNet(BPDN):
     def rhochange(self):
         """Re-factorise matrix when rho changes."""
 
-        self.lu, self.piv = sl.lu_factor(self.D, self.mu + self.rho)
-        self.lu = np.asarray(self.lu, dtype=self.dtype)
+        if self.linsolve == 'LU':
+            self.lu, self.piv = sl.lu_factor(self.D, self.mu + self.rho)
+            self.lu = np.asarray(self.lu, dtype=self.dtype)
+        elif self.linsolve != 'EIG':
+            self.c, self.lwr = sl.cho_factor(self.D, self.mu + self.rho)
+
+
+
+
+
+def solve_blocks(D, S, lmbda, blksz=1024, opt=None, out=None, sparse=False):
+    """Solve the BPDN problem for a signal matrix with a very large
+    number of columns, in blocks of at most `blksz` columns at a time,
+    so that the memory required is proportional to the block size
+    rather than the total number of columns.
+
+    A single :class:`BPDN` object, with its dictionary factorisation
+    and working arrays, is used for all of the blocks, each block
+    being copied into a preallocated signal array and passed to
+    :meth:`.GenericBPDN.setsignal`. The final block is padded with
+    zero columns if necessary, which does not affect the solution for
+    the other columns, or the residuals on which the stopping criteria
+    are based. The cost of solving the final block is, however, that
+    of a full block, irrespective of the number of columns it
+    contains, so that a block size that divides the number of columns
+    K, or is small compared with it, is preferable. The penalty
+    parameter (and therefore the factorisation) is carried over from
+    one block to the next, which is usually a better initial value
+    than option ``rho``.
+
+    Parameters
+    ----------
+    D : array_like, shape (N, M)
+      Dictionary matrix
+    S : array_like, string, or iterable
+      Signal matrix of shape (N, K), the path of a ``.npy`` file
+      containing such a matrix (which is memory-mapped), or an iterable
+      (e.g. a generator) of signal matrices of shape (N, K_i) with K_i
+      not greater than `blksz`
+    lmbda : float
+      Regularisation parameter
+    blksz : int, optional (default 1024)
+      Number of columns in each block
+    opt : :class:`BPDN.Options` object, optional (default None)
+      Algorithm options
+    out : ndarray, string, or None, optional (default None)
+      Array of shape (M, K) into which the solution is written, or the
+      path of a ``.npy`` file to be created as a memory-mapped array
+      (in Fortran order, so that each block of the solution is
+      contiguous). If `S` is an iterable, the number of columns K is
+      not known in advance, and a path can not be specified. Ignored
+      if `sparse` is True.
+    sparse : bool, optional (default False)
+      Flag indicating whether the solution should be returned as a
+      :class:`scipy.sparse.csc_matrix`, assembled from the sparse
+      representation of each block, rather than as a dense array
+
+    Returns
+    -------
+    X : ndarray or scipy.sparse.csc_matrix
+      Sparse representation of shape (M, K). If `out` is specified
+      and `sparse` is False, this is the array specified by, or
+      created at the path specified by, `out`.
+    """
+
+    if opt is None:
+        opt = BPDN.Options()
+    if opt['Batch']:
+        raise ValueError('Option Batch is not supported by solve_blocks')
+    if isinstance(S, str):
+        S = np.load(S, mmap_mode='r')
+
+    D = np.asarray(D)
+    N, M = D.shape
+    if isinstance(S, np.ndarray):
+        K = S.shape[1]
+        blocks = (S[:, k:k+blksz] for k in range(0, K, blksz))
+    else:
+        K = None
+        blocks = iter(S)
+        if isinstance(out, str):
+            raise ValueError('Parameter out can not be a path when parameter '
+                             'S is an iterable')
+
+    b = None
+    Xb = []
+    k0 = 0
+    for Sb in blocks:
+        Sb = np.asarray(Sb)
+        nb = Sb.shape[1]
+        if nb > blksz:
+            raise ValueError('Block of %d columns exceeds block size %d' %
+                             (nb, blksz))
+        if b is None:
+            # Initialise the solver with a preallocated signal array
+            # into which each block is copied
+            Sbuf = np.zeros((N, blksz), dtype=Sb.dtype)
+            b = BPDN(D, Sbuf, lmbda, opt)
+            Sbuf = b.S
+            if isinstance(out, str):
+                out = np.lib.format.open_memmap(out, mode='w+',
+                                                dtype=b.dtype, shape=(M, K),
+                                                fortran_order=True)
+        Sbuf[:, 0:nb] = Sb
+        Sbuf[:, nb:] = 0.0
+        b.setsignal(Sbuf)
+        b.solve()
+        X = b.getcoef()[:, 0:nb]
+        if sparse:
+            Xb.append(sp.csc_matrix(X))
+        elif out is not None:
+            out[:, k0:k0+nb] = X
+        else:
+            Xb.append(X.copy())
+        k0 += nb
+
+    if sparse:
+        if not Xb:
+            return sp.csc_matrix((M, 0), dtype=D.dtype)
+        return sp.hstack(Xb, format='csc')
+    elif out is not None:
+        if isinstance(out, np.memmap):
+            out.flush()
+        return out
+    else:
+        if not Xb:
+            return np.zeros((M, 0), dtype=D.dtype)
+        return np.hstack(Xb)
+
+
+
+def _solve_parallel_worker(arrs, task):
+    """Solve the BPDN problem for a range of columns of the shared
+    signal array in a worker process of :func:`solve_parallel`."""
+
+    k0, k1, lmbda, opt = task
+    b = BPDN(arrs['D'], arrs['S'][:, k0:k1], lmbda, opt)
+    arrs['X'][:, k0:k1] = b.solve()
+    return b.k
+
+
+
+def solve_parallel(D, S, lmbda=None, opt=None, nproc=None):
+    """Solve the BPDN problem for a signal matrix by distributing its
+    columns, which represent independent problems, across a pool of
+    processes (see :func:`.util.shared_pool_map`). The dictionary,
+    the signal matrix, and the solution are held in shared memory,
+    so that they are not copied for each process, and the number of
+    FFT threads in each process is chosen so that the total number of
+    threads does not exceed the number of CPUs.
+
+    Since the stopping tolerances are computed from the residuals of
+    all of the columns of the signal matrix solved by each process,
+    the solution differs from that computed by a single :class:`BPDN`
+    object, within the accuracy specified by the stopping tolerances.
+
+    Parameters
+    ----------
+    D : array_like, shape (N, M)
+      Dictionary matrix
+    S : array_like, shape (N, K)
+      Signal matrix
+    lmbda : float or None, optional (default None)
+      Regularisation parameter. If None, the default value of
+      :class:`BPDN` for the full signal matrix is used.
+    opt : :class:`BPDN.Options` object, optional (default None)
+      Algorithm options
+    nproc : int or None, optional (default None)
+      Number of processes. If None, the number of CPUs is used.
+
+    Returns
+    -------
+    X : ndarray, shape (M, K)
+      Sparse representation
+    """
+
+    if opt is None:
+        opt = BPDN.Options()
+    dtype = np.dtype(S.dtype if opt['DataType'] is None
+                     else opt['DataType'])
+    D = np.asarray(D, dtype=dtype)
+    S = np.asarray(S, dtype=dtype)
+    if lmbda is None:
+        lmbda = 0.1*abs(D.T.dot(S)).max()
+
+    K = S.shape[1]
+    nproc, nthr = util.balance_workers(K, nproc)
+    kidx = np.linspace(0, K, nproc + 1).astype(int)
+    tasks = [(kidx[n], kidx[n+1], lmbda, opt) for n in range(nproc)]
+    arrays = {'D': D, 'S': S, 'X': ((D.shape[1], K), dtype)}
+    _, outs = util.shared_pool_map(_solve_parallel_worker, arrays, tasks,
+                                   nproc, nthr)
+    return outs['X']
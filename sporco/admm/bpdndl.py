@@ -83,12 +83,15 @@ class BPDNDictLearn(dictlrn.DictLearn):
           ``BPDN`` : Options :class:`sporco.admm.bpdn.BPDN.Options`
 
           ``CMOD`` : Options :class:`sporco.admm.cmod.CnstrMOD.Options`
+
+          ``Checkpoint`` : Options for automatic checkpointing (see \
+          :class:`sporco.admm.dictlrn.DictLearn.Options`)
         """
 
-        defaults = {'Verbose' : False, 'StatusHeader' : True,
-                    'MaxMainIter' : 1000,
+        defaults = copy.deepcopy(dictlrn.DictLearn.Options.defaults)
+        defaults.update({
                     'BPDN' : copy.deepcopy(bpdn.BPDN.Options.defaults),
-                    'CMOD' : copy.deepcopy(cmod.CnstrMOD.Options.defaults)}
+                    'CMOD' : copy.deepcopy(cmod.CnstrMOD.Options.defaults)})
 
 
         def __init__(self, opt=None):
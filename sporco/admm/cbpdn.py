@@ -15,11 +15,13 @@ from builtins import range
 import numpy as np
 from scipy import linalg
 import copy
+import itertools
 from types import MethodType
 import pprint
 
 from sporco.admm import admm
 import sporco.linalg as sl
+from sporco import util
 from sporco.util import u
 
 
@@ -32,7 +34,7 @@ class ConvRepIndexing(object):
     and related classes.
     """
 
-    def __init__(self, D, S, dimK=None, dimN=2):
+    def __init__(self, D, S, dimK=None, dimN=2, fftpad=False):
         """Initialise a ConvRepIndexing object representing dimensions of S
         (input signal), D (dictionary), and X (coefficient array) in a
         convolutional representation. These dimensions are inferred
@@ -127,6 +129,14 @@ class ConvRepIndexing(object):
           independent signals
         dimN : int, optional (default 2)
           Number of spatial/temporal dimensions of signal samples
+        fftpad : bool, optional (default False)
+          Flag indicating whether the spatial/temporal sizes of the
+          internal S and X (and of the DFTs of S, D, and X) should be
+          padded to the nearest sizes for which the FFT is efficient
+          (see :func:`.linalg.next_fast_len`). The sizes of the input
+          signal are recorded in attribute `Nvs`, and an index
+          expression selecting the corresponding region of the padded
+          arrays in attribute `crop`.
         """
 
         # Determine whether dictionary is single- or multi-channel
@@ -181,8 +191,13 @@ class ConvRepIndexing(object):
         self.M = D.shape[-1]
 
         # Shape of spatial indices and number of spatial samples
-        self.Nv = S.shape[0:dimN]
+        self.Nvs = S.shape[0:dimN]
+        if fftpad:
+            self.Nv = tuple([sl.next_fast_len(n) for n in self.Nvs])
+        else:
+            self.Nv = self.Nvs
         self.N = np.prod(np.array(self.Nv))
+        self.crop = tuple([slice(0, n) for n in self.Nvs])
 
         # Axis indices for each component of X and internal S and D
         self.axisN = tuple(range(0, dimN))
@@ -282,13 +297,36 @@ class GenericConvBPDN(admm.ADMMEqual):
         ``NoBndryCross`` : Flag indicating whether all solution
         coefficients corresponding to filters crossing the image
         boundary should be forced to zero.
+
+        ``PersistentWorkspace`` : Flag indicating whether the arrays
+        computed in the X and Y steps should be stored in persistent
+        byte-aligned working arrays, allocated on initialisation,
+        instead of being allocated on every iteration. Note that, when
+        this option is enabled, arrays such as that returned by
+        :meth:`getcoef` are overwritten by subsequent calls to
+        :meth:`solve`.
+
+        ``FFTPad`` : Boundary extension used to pad the signal to the
+        nearest size for which the FFT is efficient (see
+        :func:`.linalg.next_fast_len`), which is useful when the
+        signal size has large prime factors. If ``None``, the signal
+        is not padded, otherwise it is padded at the end of each
+        spatial axis with zeros (``'zero'``) or with its reflection
+        (``'symmetric'``). The coefficient maps are constrained to be
+        zero in the padded region, so that no information is lost
+        when the coefficient maps returned by :meth:`solve` and
+        :meth:`getcoef` are cropped to the signal size. The
+        reconstruction returned by :meth:`reconstruct`, and the data
+        fidelity term of the objective function, are also cropped to
+        the signal size.
         """
 
         defaults = copy.deepcopy(admm.ADMMEqual.Options.defaults)
         defaults.update({'AuxVarObj' : False,  'ReturnX' : False,
                          'HighMemSolve' : False, 'LinSolveCheck' : False,
                          'RelaxParam' : 1.8, 'NonNegCoef' : False,
-                         'NoBndryCross' : False})
+                         'NoBndryCross' : False,
+                         'PersistentWorkspace' : False, 'FFTPad' : None})
         defaults['AutoRho'].update({'Enabled' : True, 'Period' : 1,
                                     'AutoScaling' : True, 'Scaling' : 1000.0,
                                     'RsdlRatio' : 1.2})
@@ -354,16 +392,21 @@ class GenericConvBPDN(admm.ADMMEqual):
         if opt is None:
             opt = GenericConvBPDN.Options()
 
+        if opt['FFTPad'] not in (None, 'zero', 'symmetric'):
+            raise ValueError('Invalid value %s for option FFTPad' %
+                             opt['FFTPad'])
+
         # Infer problem dimensions and set relevant attributes of self
         if not hasattr(self, 'cri'):
-            self.cri = ConvRepIndexing(D, S, dimK=dimK, dimN=dimN)
+            self.cri = ConvRepIndexing(D, S, dimK=dimK, dimN=dimN,
+                                       fftpad=opt['FFTPad'] is not None)
 
         # Call parent class __init__
         super(GenericConvBPDN, self).__init__(self.cri.shpX, S.dtype, opt)
 
         # Reshape D and S to standard layout
         self.D = np.asarray(D.reshape(self.cri.shpD), dtype=self.dtype)
-        self.S = np.asarray(S.reshape(self.cri.shpS), dtype=self.dtype)
+        self.S = self.stdformS(S)
 
         # Compute signal in DFT domain
         self.Sf = sl.rfftn(self.S, None, self.cri.axisN)
@@ -374,8 +417,24 @@ class GenericConvBPDN(admm.ADMMEqual):
         xfshp[dimN-1] = xfshp[dimN-1]//2 + 1
         self.Xf = sl.pyfftw_empty_aligned(xfshp,
                             dtype=sl.complex_dtype(self.dtype))
+        if self.opt['PersistentWorkspace']:
+            self.YUf = sl.pyfftw_empty_aligned(xfshp,
+                            dtype=sl.complex_dtype(self.dtype))
+            self.X = sl.pyfftw_empty_aligned(self.Y.shape, dtype=self.dtype)
 
-        self.setdict()
+        # The DFT of the dictionary is only computed if it has not
+        # been provided by setting attribute Df before initialisation
+        if getattr(self, 'Df', None) is None:
+            self.setdict()
+        else:
+            self.setdict(Df=self.Df)
+
+        # Record the initial penalty parameter, and the corresponding
+        # cached component of the X step solver together with the
+        # dictionary DFT for which it was computed, for restoring by
+        # setsignal
+        self.rho0 = self.rho
+        self.c0 = (self.Df, self.c)
 
         # Increment `runtime` to reflect object initialisation
         # time. The timer object is reset to avoid double-counting of
@@ -397,45 +456,164 @@ class GenericConvBPDN(admm.ADMMEqual):
 
 
 
-    def setdict(self, D=None):
-        """Set dictionary array."""
+    def setdict(self, D=None, Df=None):
+        """Set dictionary array. If `Df` is specified, it is used as the
+        DFT of the dictionary (in the internal data layout) instead of
+        computing it, and is not copied.
+        """
 
         if D is not None:
             self.D = np.asarray(D, dtype=self.dtype)
-        self.Df = sl.rfftn(self.D, self.cri.Nv, self.cri.axisN)
+        if Df is None:
+            self.Df = sl.rfftn(self.D, self.cri.Nv, self.cri.axisN)
+        else:
+            self.Df = Df
         # Compute D^H S
         self.DSf = np.conj(self.Df) * self.Sf
         if self.cri.Cd > 1:
             self.DSf = np.sum(self.DSf, axis=self.cri.axisC, keepdims=True)
-        if self.opt['HighMemSolve'] and self.cri.Cd == 1:
-            self.c = sl.solvedbi_sm_c(self.Df, np.conj(self.Df), self.rho,
-                                      self.cri.axisM)
+        self.c = self.xstep_c(self.rho)
+
+
+
+    def setsignal(self, S):
+        """Set signal array, which must have the same shape as the
+        signal array with which the object was initialised. The DFT of
+        the dictionary is retained, the DFT of the signal and its
+        product with the conjugate DFT of the dictionary are computed
+        into the existing arrays, and the working variables are
+        reinitialised (see :meth:`.ADMM.reset_state`) so that a
+        subsequent call of :meth:`solve` computes the solution for the
+        new signal. The penalty parameter, which may have been adapted
+        to the previous signal if option ``AutoRho`` is enabled, is
+        reset to its initial value, and the cached component of the X
+        step linear system solver for that value is restored, so that
+        the solution does not depend on the signals previously solved
+        for.
+
+        Parameters
+        ----------
+        S : array_like
+          Signal array with the same shape as the signal array with
+          which the object was initialised
+        """
+
+        S = np.asarray(S, dtype=self.dtype)
+        if S.shape[0:self.cri.dimN] != self.cri.Nvs or \
+           S.size != np.prod(self.cri.Nvs) * self.cri.C * self.cri.K:
+            raise ValueError('Shape %s of signal array is not compatible '
+                             'with the signal shape for which the object '
+                             'was initialised' % (S.shape,))
+        self.S = self.stdformS(S)
+        sl.rfftn(self.S, None, self.cri.axisN, out=self.Sf)
+        if self.cri.Cd > 1:
+            np.sum(np.conj(self.Df) * self.Sf, axis=self.cri.axisC,
+                   keepdims=True, out=self.DSf)
         else:
-            self.c = None
+            np.multiply(np.conj(self.Df), self.Sf, out=self.DSf)
+        self.rho = self.rho0
+        if self.c0[0] is self.Df:
+            self.c = self.c0[1]
+        else:
+            # The dictionary has changed since the cached component
+            # was computed
+            self.rhochange()
+            self.c0 = (self.Df, self.c)
+        self.reset_state()
+
+
+
+    def xstep_c(self, rho, Df=None):
+        """Compute the cached component of the X step linear system
+        solver for the specified scaled identity term, i.e. the
+        :func:`.linalg.solvedbi_sm_c` component if option
+        ``HighMemSolve`` is enabled and the dictionary has a single
+        channel, and the :func:`.linalg.solvemdbi_ism_factor`
+        factorisation if the dictionary has multiple channels. The
+        dictionary in the DFT domain, `Df`, defaults to attribute
+        :attr:`Df`.
+        """
+
+        if Df is None:
+            Df = self.Df
+        if self.cri.Cd == 1:
+            if self.opt['HighMemSolve']:
+                return sl.solvedbi_sm_c(Df, np.conj(Df), rho,
+                                        self.cri.axisM)
+            else:
+                return None
+        else:
+            return sl.solvemdbi_ism_factor(Df, rho, self.cri.axisM,
+                                           self.cri.axisC)
+
+
+
+    def stdformS(self, S):
+        """Reshape signal array to the internal data layout, padding it
+        if option ``FFTPad`` is enabled.
+        """
+
+        S = np.asarray(S, dtype=self.dtype)
+        S = S.reshape(self.cri.Nvs + self.cri.shpS[self.cri.dimN:])
+        if self.cri.Nv != self.cri.Nvs:
+            pad = [(0, n - ns) for n, ns in zip(self.cri.Nv, self.cri.Nvs)]
+            mode = 'constant' if self.opt['FFTPad'] == 'zero' else \
+                'symmetric'
+            S = np.pad(S, pad + [(0, 0)]*(S.ndim - self.cri.dimN), mode)
+        return S
+
+
+
+    def crop(self, X):
+        """Crop an array with the spatial size of the internal data
+        layout to the spatial size of the signal, which differ when
+        option ``FFTPad`` is enabled.
+        """
+
+        if self.cri.Nv == self.cri.Nvs:
+            return X
+        return X[self.cri.crop]
+
+
+
+    def solve(self):
+        """Run optimisation. The returned coefficient maps are cropped
+        to the signal size if option ``FFTPad`` is enabled.
+        """
+
+        return self.crop(super(GenericConvBPDN, self).solve())
 
 
 
     def getcoef(self):
         """Get final coefficient array."""
 
-        return self.Y
+        return self.crop(self.Y)
 
 
 
     def xstep(self):
         """Minimise Augmented Lagrangian with respect to x."""
 
-        self.YU[:] = self.Y - self.U
+        np.subtract(self.Y, self.U, out=self.YU)
 
-        b = self.DSf + self.rho*sl.rfftn(self.YU, None, self.cri.axisN)
+        if self.opt['PersistentWorkspace']:
+            b = sl.rfftn(self.YU, None, self.cri.axisN, out=self.YUf)
+            b *= self.rho
+            b += self.DSf
+        else:
+            b = self.DSf + self.rho*sl.rfftn(self.YU, None, self.cri.axisN)
         if self.cri.Cd == 1:
-            self.Xf[:] = sl.solvedbi_sm(self.Df, self.rho, b, self.c,
-                                        self.cri.axisM)
+            sl.solvedbi_sm(self.Df, self.rho, b, self.c, self.cri.axisM,
+                           out=self.Xf)
         else:
-            self.Xf[:] = sl.solvemdbi_ism(self.Df, self.rho, b, self.cri.axisM,
-                                          self.cri.axisC)
+            sl.solvemdbi_ism(self.Df, self.rho, b, self.cri.axisM,
+                             self.cri.axisC, self.c, out=self.Xf)
 
-        self.X = sl.irfftn(self.Xf, self.cri.Nv, self.cri.axisN)
+        if self.opt['PersistentWorkspace']:
+            sl.irfftn(self.Xf, self.cri.Nv, self.cri.axisN, out=self.X)
+        else:
+            self.X = sl.irfftn(self.Xf, self.cri.Nv, self.cri.axisN)
 
         if self.opt['LinSolveCheck']:
             Dop = lambda x: np.sum(self.Df * x, axis=self.cri.axisM,
@@ -454,8 +632,10 @@ class GenericConvBPDN(admm.ADMMEqual):
         method is not overridden, the problem is solved without any
         regularisation other than the option enforcement of
         non-negativity of the solution and filter boundary crossing
-        supression. When it is overridden, it should be explicitly
-        called at the end of the overriding method.
+        supression, and the projection onto coefficient maps that are
+        zero in the padded region if option ``FFTPad`` is enabled.
+        When it is overridden, it should be explicitly called at the
+        end of the overriding method.
         """
 
         if self.opt['NonNegCoef']:
@@ -463,6 +643,10 @@ class GenericConvBPDN(admm.ADMMEqual):
         if self.opt['NoBndryCross']:
             for n in range(0, self.cri.dimN):
                 self.Y[(slice(None),)*n +(slice(1-self.D.shape[n],None),)] = 0.0
+        if self.cri.Nv != self.cri.Nvs:
+            for n in range(0, self.cri.dimN):
+                self.Y[(slice(None),)*n +
+                       (slice(self.cri.Nvs[n], None),)] = 0.0
 
 
 
@@ -495,6 +679,11 @@ class GenericConvBPDN(admm.ADMMEqual):
 
         Ef = np.sum(self.Df * self.obfn_fvarf(), axis=self.cri.axisM,
                     keepdims=True) - self.Sf
+        if self.cri.Nv != self.cri.Nvs:
+            # The data fidelity term is only evaluated within the
+            # support of the signal prior to padding
+            E = sl.irfftn(Ef, self.cri.Nv, self.cri.axisN)[self.cri.crop]
+            return np.sum(E**2)/2.0
         return sl.rfl2norm2(Ef, self.S.shape, axis=self.cri.axisN)/2.0
 
 
@@ -518,26 +707,28 @@ class GenericConvBPDN(admm.ADMMEqual):
     def rhochange(self):
         """Updated cached c array when rho changes."""
 
-        if self.opt['HighMemSolve'] and self.cri.Cd == 1:
-            self.c = sl.solvedbi_sm_c(self.Df, np.conj(self.Df), self.rho,
-                                      self.cri.axisM)
+        self.c = self.xstep_c(self.rho)
 
 
 
     def reconstruct(self, X=None):
-        """Reconstruct representation."""
+        """Reconstruct representation. Coefficient maps `X` may have
+        the spatial size of either the signal or of the internal data
+        layout, and the reconstruction is cropped to the signal size
+        if option ``FFTPad`` is enabled.
+        """
 
         if X is None:
             X = self.Y
-        Xf = sl.rfftn(X, None, self.cri.axisN)
+        Xf = sl.rfftn(X, self.cri.Nv, self.cri.axisN)
         Sf = np.sum(self.Df * Xf, axis=self.cri.axisM)
-        return sl.irfftn(Sf, self.cri.Nv, self.cri.axisN)
+        return self.crop(sl.irfftn(Sf, self.cri.Nv, self.cri.axisN))
 
 
 
 
 
-class ConvBPDN(GenericConvBPDN):
+class ConvBPDN(admm.SolvePathMixin, GenericConvBPDN):
     """ADMM algorithm for the Convolutional BPDN (CBPDN)
     :cite:`wohlberg-2014-efficient` :cite:`wohlberg-2016-efficient`
     :cite:`wohlberg-2016-convolutional` problem.
@@ -634,10 +825,28 @@ class ConvBPDN(GenericConvBPDN):
         option is defined, the regularization term is :math:`\lambda  \sum_m
         \| \mathbf{w}_m \odot \mathbf{x}_m \|_1` where :math:`\mathbf{w}_m`
         denotes slices of the weighting array on the filter index axis.
+
+        ``Screening`` : Options for gap safe screening
+        :cite:`ndiaye-2017-gap` of dictionary filters. Filters for
+        which the screening test, based on the duality gap of the
+        current iterate, guarantees that the corresponding
+        coefficient maps are zero are permanently eliminated from
+        the X step, so that the solution is unchanged. Screening is
+        not supported together with option ``NoBndryCross``, or by
+        classes derived from :class:`ConvBPDN` that modify the X or Y
+        steps.
+
+          ``Enabled`` : Flag determining whether screening is enabled
+
+          ``Period`` : Iteration period on which the screening test is
+          applied. The test is deferred while the duality gap is too
+          large for any filter to be eliminated (see
+          :meth:`ConvBPDN.screen`).
         """
 
         defaults = copy.deepcopy(GenericConvBPDN.Options.defaults)
-        defaults.update({'L1Weight' : 1.0})
+        defaults.update({'L1Weight' : 1.0,
+                         'Screening' : {'Enabled' : False, 'Period' : 10}})
 
 
         def __init__(self, opt=None):
@@ -694,6 +903,17 @@ class ConvBPDN(GenericConvBPDN):
         if opt is None:
             opt = ConvBPDN.Options()
 
+        # The screening test is only valid for the X and Y steps of
+        # this class
+        if opt['Screening', 'Enabled']:
+            if opt['NoBndryCross']:
+                raise ValueError('Option Screening is not supported '
+                                 'together with option NoBndryCross')
+            if type(self).xstep != ConvBPDN.xstep or \
+               type(self).ystep != ConvBPDN.ystep:
+                raise ValueError('Option Screening is not supported by '
+                                 'class ' + type(self).__name__)
+
         # Set dtype attribute based on S.dtype and opt['DataType']
         self.set_dtype(opt, S.dtype)
 
@@ -709,6 +929,12 @@ class ConvBPDN(GenericConvBPDN):
         self.lmbda = self.dtype.type(lmbda)
         self.wl1 = np.asarray(opt['L1Weight'], dtype=self.dtype)
 
+        # Indices of filters not eliminated by screening, or None if
+        # no filters have been eliminated, and the iteration before
+        # which the screening test is not applied
+        self.scrnidx = None
+        self.scrnk = 0
+
         # Set penalty parameter
         self.set_attr('rho', opt['rho'], dval=(50.0*self.lmbda + 1.0),
                       dtype=self.dtype)
@@ -736,10 +962,189 @@ class ConvBPDN(GenericConvBPDN):
 
 
 
+    def setlmbda(self, lmbda):
+        """Set regularisation parameter :math:`\lambda`.
+
+        The current working variables are retained as a warm start for
+        a subsequent call of :meth:`solve`, with scaled dual variable
+        :math:`\mathbf{u}` rescaled in proportion to the change in
+        :math:`\lambda` so that the dual optimality criterion (see
+        (3.10) in :cite:`boyd-2010-distributed`) remains satisfied.
+        Since :math:`\\rho` is not modified, no refactorisation is
+        required.
+
+        Parameters
+        ----------
+        lmbda : float
+          New regularisation parameter
+        """
+
+        lmbda = self.dtype.type(lmbda)
+        if self.opt['AutoRho', 'RsdlTarget'] is None:
+            self.rho_xi = self.dtype.type(1.0 + (18.3)**(np.log10(lmbda)
+                                                         + 1.0))
+        if np.all(self.lmbda > 0):
+            self.U *= lmbda / self.lmbda
+        self.lmbda = lmbda
+        # Filters eliminated by screening are only guaranteed to be
+        # unused for the previous value of lmbda
+        self.scrnk = 0
+        if self.scrnidx is not None:
+            self.scrnidx = None
+            self.rhochange()
+
+
+
+    def setdict(self, D=None, Df=None):
+        """Set dictionary array (see :meth:`.GenericConvBPDN.setdict`)."""
+
+        super(ConvBPDN, self).setdict(D, Df)
+        # Filters eliminated by screening are only guaranteed to be
+        # unused for the previous dictionary
+        self.scrnidx = None
+        self.scrnk = 0
+        # Norms of the dictionary filters used in the screening test
+        self.dnrm = np.sqrt(np.sum(self.D**2, axis=self.cri.axisN +
+                                   (self.cri.axisC, self.cri.axisK)))
+
+
+
+    def setsignal(self, S):
+        """Set signal array (see :meth:`.GenericConvBPDN.setsignal`)."""
+
+        # Filters eliminated by screening are only guaranteed to be
+        # unused for the previous signal. The cached component of the
+        # X step solver for all filters is restored by the parent
+        # class method.
+        self.scrnidx = None
+        self.scrnk = 0
+        super(ConvBPDN, self).setsignal(S)
+
+
+
+    def xstep(self):
+        """Minimise Augmented Lagrangian with respect to x. If option
+        ``Screening`` is enabled, the screening test is applied
+        (see :meth:`screen`) at the start of every ``Period``
+        iterations, and the linear system is only solved for the
+        filters that have not been eliminated.
+        """
+
+        if self.opt['Screening', 'Enabled'] and self.k > 0 and \
+           self.k >= self.scrnk and \
+           self.k % self.opt['Screening', 'Period'] == 0:
+            self.screen()
+
+        if self.scrnidx is None:
+            super(ConvBPDN, self).xstep()
+            return
+
+        idx = self.scrnidx
+        if not self.opt['PersistentWorkspace']:
+            self.X = np.zeros(self.cri.shpX, dtype=self.dtype)
+        if idx.size == 0:
+            self.xrrs = None
+            return
+
+        np.subtract(self.Y, self.U, out=self.YU)
+        b = self.DSfs + self.rho*sl.rfftn(self.YU[..., idx], None,
+                                          self.cri.axisN)
+        if self.cri.Cd == 1:
+            Xfs = sl.solvedbi_sm(self.Dfs, self.rho, b, self.c,
+                                 self.cri.axisM)
+        else:
+            Xfs = sl.solvemdbi_ism(self.Dfs, self.rho, b, self.cri.axisM,
+                                   self.cri.axisC, self.c)
+        self.Xf[..., idx] = Xfs
+        self.X[..., idx] = sl.irfftn(Xfs, self.cri.Nv, self.cri.axisN)
+
+        if self.opt['LinSolveCheck']:
+            Dop = lambda x: np.sum(self.Dfs * x, axis=self.cri.axisM,
+                                   keepdims=True)
+            DHop = lambda x: np.sum(np.conj(self.Dfs) * x,
+                                    axis=self.cri.axisC, keepdims=True)
+            ax = DHop(Dop(Xfs)) + self.rho*Xfs
+            self.xrrs = sl.rrs(ax, b)
+        else:
+            self.xrrs = None
+
+
+
+    def screen(self):
+        """Apply the gap safe screening test :cite:`ndiaye-2017-gap`
+        at the current value of Y, and eliminate the filters for which
+        every coefficient is guaranteed to be zero in the solution.
+        The residual :math:`\mathbf{r} = \mathbf{s} - \sum_m
+        \mathbf{d}_m * \mathbf{y}_m` is scaled by :math:`1 /
+        \\alpha` to give a dual feasible point, and the resulting
+        duality gap :math:`G` determines a sphere that contains the
+        dual solution. Filter :math:`\mathbf{d}_m` is eliminated if
+        :math:`| (\mathbf{d}_m \star \mathbf{r})(\mathbf{n}) | /
+        \\alpha + \sqrt{2 G} \| \mathbf{d}_m \|_2 < \lambda
+        w_m(\mathbf{n})` at every location :math:`\mathbf{n}`, where
+        :math:`\star` denotes correlation. If the duality gap is so
+        large that no filter could be eliminated even if it were
+        uncorrelated with the residual, subsequent tests are deferred
+        until the iteration count has doubled.
+        """
+
+        w = self.lmbda * np.broadcast_to(self.wl1, self.cri.shpX)
+        # A dual feasible point cannot be constructed by scaling the
+        # residual if any of the weights is zero
+        if np.any(w <= 0):
+            return
+
+        M = self.cri.M
+        idx = np.arange(M) if self.scrnidx is None else self.scrnidx
+        Yf = sl.rfftn(self.Y[..., idx], None, self.cri.axisN)
+        Rf = self.Sf - np.sum(self.Df[..., idx] * Yf, axis=self.cri.axisM,
+                              keepdims=True)
+        R = sl.irfftn(Rf, self.cri.Nv, self.cri.axisN)
+        DTRf = np.conj(self.Df) * Rf
+        if self.cri.Cd > 1:
+            DTRf = np.sum(DTRf, axis=self.cri.axisC, keepdims=True)
+        DTR = sl.irfftn(DTRf, self.cri.Nv, self.cri.axisN)
+        if not self.opt['NonNegCoef']:
+            DTR = np.abs(DTR)
+        # Scaling of the residual giving a dual feasible point, and the
+        # corresponding duality gap
+        alpha = max(1.0, np.max(DTR / w))
+        pobj = 0.5*np.sum(R**2) + np.sum(w*np.abs(self.Y))
+        dobj = 0.5*np.sum(self.S**2) - 0.5*np.sum((self.S - R/alpha)**2)
+        rad = np.sqrt(2.0*max(pobj - dobj, 0.0))
+        if np.all(self.dnrm.ravel()*rad >=
+                  np.min(w.reshape((-1, M)), axis=0)):
+            self.scrnk = 2*self.k
+            return
+        keep = DTR/alpha + self.dnrm*rad >= w
+        keep = np.any(keep.reshape((-1, M)), axis=0)
+        if np.all(keep[idx]):
+            return
+
+        self.scrnidx = idx[keep[idx]]
+        self.X[..., ~keep] = 0.0
+        self.Xf[..., ~keep] = 0.0
+        self.Y[..., ~keep] = 0.0
+        self.U[..., ~keep] = 0.0
+        self.Dfs = self.Df[..., self.scrnidx]
+        self.DSfs = self.DSf[..., self.scrnidx]
+        self.rhochange()
+        # The history of the acceleration method includes the values
+        # of the eliminated coefficients
+        if self.opt['Accelerate', 'Method'] is not None:
+            self.accelerate_start()
+
+
+
     def ystep(self):
         """Minimise Augmented Lagrangian with respect to y."""
 
-        self.Y = sl.shrink1(self.AX + self.U, (self.lmbda/self.rho) * self.wl1)
+        if self.opt['PersistentWorkspace']:
+            np.add(self.AX, self.U, out=self.YU)
+            sl.shrink1(self.YU, (self.lmbda/self.rho) * self.wl1, out=self.Y)
+        else:
+            self.Y = sl.shrink1(self.AX + self.U,
+                                (self.lmbda/self.rho) * self.wl1)
         super(ConvBPDN, self).ystep()
 
 
@@ -754,6 +1159,16 @@ class ConvBPDN(GenericConvBPDN):
 
 
 
+    def rhochange(self):
+        """Updated cached c array when rho changes."""
+
+        if self.scrnidx is None:
+            super(ConvBPDN, self).rhochange()
+        elif self.scrnidx.size > 0:
+            self.c = self.xstep_c(self.rho, self.Dfs)
+
+
+
 
 
 class ConvBPDNJoint(ConvBPDN):
@@ -987,11 +1402,7 @@ class ConvElasticNet(ConvBPDN):
         self.DSf = np.conj(self.Df) * self.Sf
         if self.cri.Cd > 1:
             self.DSf = np.sum(self.DSf, axis=self.cri.axisC, keepdims=True)
-        if self.opt['HighMemSolve'] and self.cri.Cd == 1:
-            self.c = sl.solvedbi_sm_c(self.Df, np.conj(self.Df),
-                                      self.mu + self.rho, self.cri.axisM)
-        else:
-            self.c = None
+        self.c = self.xstep_c(self.mu + self.rho)
 
 
 
@@ -1006,7 +1417,8 @@ class ConvElasticNet(ConvBPDN):
                                         b, self.c, self.cri.axisM)
         else:
             self.Xf[:] = sl.solvemdbi_ism(self.Df, self.mu + self.rho, b,
-                                          self.cri.axisM, self.cri.axisC)
+                                          self.cri.axisM, self.cri.axisC,
+                                          self.c)
 
         self.X = sl.irfftn(self.Xf, None, self.cri.axisN)
 
@@ -1021,6 +1433,14 @@ class ConvElasticNet(ConvBPDN):
             self.xrrs = None
 
 
+
+    def rhochange(self):
+        """Updated cached c array when rho changes."""
+
+        self.c = self.xstep_c(self.mu + self.rho)
+
+
+
     def obfn_reg(self):
         """Compute regularisation term and contribution to objective
         function.
@@ -1153,6 +1573,9 @@ class ConvBPDNGradReg(ConvBPDN):
 
         if opt is None:
             opt = ConvBPDNGradReg.Options()
+        if opt['FFTPad'] is not None:
+            raise ValueError('Option FFTPad is not supported by class '
+                             'ConvBPDNGradReg')
 
         self.cri = ConvRepIndexing(D, S, dimK=dimK, dimN=dimN)
 
@@ -1185,11 +1608,7 @@ class ConvBPDNGradReg(ConvBPDN):
         self.DSf = np.conj(self.Df) * self.Sf
         if self.cri.Cd > 1:
             self.DSf = np.sum(self.DSf, axis=self.cri.axisC, keepdims=True)
-        if self.opt['HighMemSolve'] and self.cri.Cd == 1:
-            self.c = sl.solvedbi_sm_c(self.Df, np.conj(self.Df),
-                        self.mu*self.GHGf + self.rho, self.cri.axisM)
-        else:
-            self.c = None
+        self.c = self.xstep_c(self.mu*self.GHGf + self.rho)
 
 
 
@@ -1204,7 +1623,8 @@ class ConvBPDNGradReg(ConvBPDN):
                                         b, self.c, self.cri.axisM)
         else:
             self.Xf[:] = sl.solvemdbi_ism(self.Df, self.mu*self.GHGf +self.rho,
-                                          b, self.cri.axisM, self.cri.axisC)
+                                          b, self.cri.axisM, self.cri.axisC,
+                                          self.c)
 
         self.X = sl.irfftn(self.Xf, None, self.cri.axisN)
 
@@ -1220,6 +1640,13 @@ class ConvBPDNGradReg(ConvBPDN):
 
 
 
+    def rhochange(self):
+        """Updated cached c array when rho changes."""
+
+        self.c = self.xstep_c(self.mu*self.GHGf + self.rho)
+
+
+
     def obfn_reg(self):
         """Compute regularisation term and contribution to objective
         function.
@@ -1358,11 +1785,15 @@ class ConvTwoBlockCnstrnt(admm.ADMMTwoBlockCnstrnt):
         if D is not None:
             self.D = np.asarray(D, dtype=self.dtype)
         self.Df = sl.rfftn(self.D, self.cri.Nv, self.cri.axisN)
-        if self.opt['HighMemSolve'] and self.cri.Cd == 1:
-            self.c = sl.solvedbi_sm_c(self.Df, np.conj(self.Df), 1.0,
-                                      self.cri.axisM)
+        if self.cri.Cd == 1:
+            if self.opt['HighMemSolve']:
+                self.c = sl.solvedbi_sm_c(self.Df, np.conj(self.Df), 1.0,
+                                          self.cri.axisM)
+            else:
+                self.c = None
         else:
-            self.c = None
+            self.c = sl.solvemdbi_ism_factor(self.Df, 1.0, self.cri.axisM,
+                                             self.cri.axisC)
 
 
 
@@ -1382,7 +1813,7 @@ class ConvTwoBlockCnstrnt(admm.ADMMTwoBlockCnstrnt):
             self.Xf[:] = sl.solvedbi_sm(self.Df, 1.0, b, self.c, self.cri.axisM)
         else:
             self.Xf[:] = sl.solvemdbi_ism(self.Df, 1.0, b, self.cri.axisM,
-                                          self.cri.axisC)
+                                          self.cri.axisC, self.c)
 
         self.X = sl.irfftn(self.Xf, self.cri.Nv, self.cri.axisN)
 
@@ -1804,6 +2235,10 @@ class AddMaskSim(object):
 
         # Construct inner cbpdn object
         self.cbpdn = cbpdnclass(Di, S, *args, **kwargs)
+        # The mask has the spatial size of the signal, which is not
+        # that of the inner cbpdn object if its signal is padded
+        if self.cbpdn.cri.Nv != self.cri.Nv:
+            raise ValueError('Option FFTPad is not supported by AddMaskSim')
 
         # Record ystep method of inner cbpdn object
         self.inner_ystep = self.cbpdn.ystep
@@ -1898,3 +2333,265 @@ class AddMaskSim(object):
         """Get iteration stats from inner cbpdn object."""
 
         return self.cbpdn.getitstat()
+
+
+
+
+
+
+def _solve_parallel_worker(arrs, task):
+    """Solve the ConvBPDN problem for a range of signals of the shared
+    signal array in a worker process of :func:`solve_parallel`."""
+
+    k0, k1, lmbda, opt, dimN = task
+    b = ConvBPDN.__new__(ConvBPDN)
+    # Use the shared DFT of the dictionary instead of computing it
+    b.Df = arrs['Df']
+    b.__init__(arrs['D'], arrs['S'][..., k0:k1, 0], lmbda, opt, dimK=1,
+               dimN=dimN)
+    arrs['X'][..., k0:k1, :] = b.solve()
+    return b.k
+
+
+
+def solve_parallel(D, S, lmbda=None, opt=None, dimK=None, dimN=2,
+                   nproc=None):
+    """Solve the ConvBPDN problem for a set of signals by distributing
+    the signals (the independent problems on the signal index axis)
+    across a pool of processes (see :func:`.util.shared_pool_map`).
+    The dictionary, its DFT, the signal array, and the solution are
+    held in shared memory, so that they are not copied for each
+    process, and the number of FFT threads in each process is chosen
+    so that the total number of threads does not exceed the number of
+    CPUs.
+
+    Since the stopping tolerances are computed from the residuals of
+    all of the signals solved by each process, the solution differs
+    from that computed by a single :class:`ConvBPDN` object, within
+    the accuracy specified by the stopping tolerances.
+
+    Parameters
+    ----------
+    D : array_like
+      Dictionary array
+    S : array_like
+      Signal array
+    lmbda : float or None, optional (default None)
+      Regularisation parameter. If None, the default value of
+      :class:`ConvBPDN` for the full signal array is used.
+    opt : :class:`ConvBPDN.Options` object, optional (default None)
+      Algorithm options
+    dimK : 0, 1, or None, optional (default None)
+      Number of dimensions in input signal corresponding to multiple
+      independent signals
+    dimN : int, optional (default 2)
+      Number of spatial/temporal dimensions
+    nproc : int or None, optional (default None)
+      Number of processes. If None, the number of CPUs is used.
+
+    Returns
+    -------
+    X : ndarray
+      Coefficient maps, in the internal data layout (see
+      :class:`ConvRepIndexing`)
+    """
+
+    if opt is None:
+        opt = ConvBPDN.Options()
+    dtype = np.dtype(S.dtype if opt['DataType'] is None
+                     else opt['DataType'])
+    cri = ConvRepIndexing(D, S, dimK=dimK, dimN=dimN,
+                          fftpad=opt['FFTPad'] is not None)
+    D = np.asarray(D, dtype=dtype)
+    S = np.asarray(S.reshape(cri.Nvs + cri.shpS[dimN:]), dtype=dtype)
+    Df = sl.rfftn(D.reshape(cri.shpD), cri.Nv, cri.axisN)
+    if lmbda is None:
+        lmbda = 0.1*abs(np.conj(Df) * sl.rfftn(S, cri.Nv, cri.axisN)).max()
+
+    nproc, nthr = util.balance_workers(cri.K, nproc)
+    kidx = np.linspace(0, cri.K, nproc + 1).astype(int)
+    tasks = [(kidx[n], kidx[n+1], lmbda, opt, dimN) for n in range(nproc)]
+    arrays = {'D': D, 'Df': Df, 'S': S,
+              'X': (cri.Nvs + cri.shpX[dimN:], dtype)}
+    _, outs = util.shared_pool_map(_solve_parallel_worker, arrays, tasks,
+                                   nproc, nthr)
+    return outs['X']
+
+
+
+def _tile_window(L, ov):
+    """Compute the weighting of one axis of a tile in
+    :func:`solve_tiled`, which is unity except for a raised cosine
+    taper over `ov` samples at each end."""
+
+    w = np.ones(L)
+    if ov > 0:
+        t = np.sin(0.5*np.pi*(np.arange(ov) + 0.5) / ov)**2
+        w[0:ov] = t
+        w[L-ov:] = t[::-1]
+    return w
+
+
+
+def _tile_solve(D, Df, St, lmbda, opt, dimN):
+    """Solve the ConvBPDN problem for a single tile (in the internal
+    data layout) in :func:`solve_tiled`, and return the coefficient
+    maps and the reconstruction."""
+
+    b = ConvBPDN.__new__(ConvBPDN)
+    b.Df = Df
+    b.__init__(D, St[..., 0], lmbda, opt, dimK=1, dimN=dimN)
+    X = b.solve()
+    return X, b.reconstruct(X)
+
+
+
+def _solve_tiled_worker(arrs, task):
+    """Solve the ConvBPDN problem for a single tile of the shared
+    signal array in a worker process of :func:`solve_tiled`."""
+
+    idx, lmbda, opt, dimN = task
+    St = arrs['S'][np.ix_(*idx)]
+    return (idx,) + _tile_solve(arrs['D'], arrs['Df'], St, lmbda, opt, dimN)
+
+
+
+def solve_tiled(D, S, lmbda, tilesz=256, overlap=None, opt=None, dimK=None,
+                dimN=2, nproc=None, out=None):
+    """Solve the ConvBPDN problem for a very large signal by
+    independently solving it on a set of overlapping tiles and
+    blending the results, so that the memory required by the solver
+    is determined by the tile size rather than the signal size.
+
+    The tile size on each spatial axis is rounded up to the nearest
+    size for which the FFT is efficient (see
+    :func:`.linalg.next_fast_len`). The tiles are spaced by the tile
+    size less the overlap, and the signal is treated as periodic, as
+    in :class:`ConvBPDN`, so that tiles at the signal boundary wrap
+    around it. The coefficient maps and reconstruction of each tile
+    are weighted by a window that tapers to zero over the overlap
+    region (where they are corrupted by the periodic boundary of the
+    tile), accumulated, and normalised by the sum of the weights
+    (i.e. weighted overlap-add). Since the DFT of the dictionary is
+    the same for all of the tiles, it is only computed once.
+
+    The result is not identical to that of a single :class:`ConvBPDN`
+    solve for the full signal, since the tile problems are not
+    coupled. The discrepancy is concentrated at the tile seams, and
+    decreases as the overlap is increased relative to the filter
+    size: for an overlap of twice the filter size, the relative
+    difference of the reconstruction from that of the full solve is
+    typically of the order of 10\ :sup:`-2`.
+
+    Parameters
+    ----------
+    D : array_like
+      Dictionary array
+    S : array_like
+      Signal array
+    lmbda : float
+      Regularisation parameter
+    tilesz : int or tuple of ints, optional (default 256)
+      Tile size on each spatial axis. Tiles on an axis for which the
+      tile size is not less than the signal size cover the full axis.
+    overlap : int or tuple of ints or None, optional (default None)
+      Overlap of tiles on each spatial axis, which may not exceed half
+      of the tile size. If None, twice the filter size is used.
+    opt : :class:`ConvBPDN.Options` object, optional (default None)
+      Algorithm options
+    dimK : 0, 1, or None, optional (default None)
+      Number of dimensions in input signal corresponding to multiple
+      independent signals
+    dimN : int, optional (default 2)
+      Number of spatial/temporal dimensions
+    nproc : int or None, optional (default None)
+      Number of processes across which the tiles are distributed (see
+      :func:`.util.shared_pool_map`). If None or 1, the tiles are
+      solved sequentially in the calling process.
+    out : ndarray or None, optional (default None)
+      Array (e.g. a memory-mapped array) of the shape of the
+      coefficient maps in the internal data layout (see
+      :class:`ConvRepIndexing`) into which the coefficient maps are
+      written
+
+    Returns
+    -------
+    X : ndarray
+      Coefficient maps, in the internal data layout
+    Sr : ndarray
+      Reconstruction, with the spatial, channel, and signal axes of
+      the internal data layout
+    """
+
+    if opt is None:
+        opt = ConvBPDN.Options()
+    # The tile sizes are chosen to be efficient FFT sizes
+    if opt['FFTPad'] is not None:
+        opt = copy.deepcopy(opt)
+        opt['FFTPad'] = None
+    dtype = np.dtype(S.dtype if opt['DataType'] is None
+                     else opt['DataType'])
+    cri = ConvRepIndexing(D, S, dimK=dimK, dimN=dimN)
+    D = np.asarray(D, dtype=dtype)
+    S = np.asarray(S, dtype=dtype).reshape(cri.shpS)
+    if not isinstance(tilesz, tuple):
+        tilesz = (tilesz,) * dimN
+    if overlap is None:
+        overlap = tuple([2*n for n in D.shape[0:dimN]])
+    elif not isinstance(overlap, tuple):
+        overlap = (overlap,) * dimN
+
+    # Determine tile size, window, and tile positions on each axis
+    Lv, wv, idxv = [], [], []
+    for n in range(dimN):
+        N = cri.Nv[n]
+        L = sl.next_fast_len(tilesz[n])
+        if L >= N:
+            L, ov, strt = N, 0, [0]
+        else:
+            ov = overlap[n]
+            if 2*ov > L:
+                raise ValueError('Overlap %d exceeds half of tile size %d' %
+                                 (ov, L))
+            stp = L - ov
+            strt = range(0, stp * int(np.ceil(N / stp)), stp)
+        Lv.append(L)
+        wv.append(_tile_window(L, ov))
+        idxv.append([np.arange(s, s + L) % N for s in strt])
+
+    # Window of a full tile with singleton non-spatial axes
+    W = wv[0].reshape((-1,) + (1,)*(dimN-1))
+    for n in range(1, dimN):
+        W = W * wv[n].reshape((1,)*n + (-1,) + (1,)*(dimN-n-1))
+
+    Df = sl.rfftn(D.reshape(cri.shpD), tuple(Lv), cri.axisN)
+    if out is None:
+        out = np.zeros(cri.shpX, dtype=dtype)
+    else:
+        out[...] = 0
+    Sr = np.zeros(cri.Nv + (cri.C, cri.K), dtype=dtype)
+    Wsum = np.zeros(cri.Nv, dtype=dtype)
+
+    def accumulate(rslt):
+        idx, Xt, Srt = rslt
+        ix = np.ix_(*idx)
+        Wx = W.reshape(W.shape + (1,)*(Xt.ndim - dimN))
+        out[ix] += Wx * Xt
+        Sr[ix] += W.reshape(W.shape + (1, 1)) * Srt
+        Wsum[ix] += W
+
+    tasks = [(idx, lmbda, opt, dimN) for idx in
+             itertools.product(*idxv)]
+    if nproc is None or nproc == 1:
+        for idx, _, _, _ in tasks:
+            St = S[np.ix_(*idx)]
+            accumulate((idx,) + _tile_solve(D, Df, St, lmbda, opt, dimN))
+    else:
+        nproc, nthr = util.balance_workers(len(tasks), nproc)
+        arrays = {'D': D, 'Df': Df, 'S': S}
+        util.shared_pool_map(_solve_tiled_worker, arrays, tasks, nproc,
+                             nthr, reduce=accumulate)
+
+    out /= Wsum.reshape(cri.Nv + (1,)*(out.ndim - dimN))
+    Sr /= Wsum.reshape(cri.Nv + (1, 1))
+    return out, Sr
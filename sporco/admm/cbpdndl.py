@@ -92,12 +92,15 @@ class ConvBPDNDictLearn(dictlrn.DictLearn):
           ``CBPDN`` : Options :class:`sporco.admm.cbpdn.ConvBPDN.Options`
 
           ``CCMOD`` : Options :class:`sporco.admm.ccmod.ConvCnstrMOD.Options`
+
+          ``Checkpoint`` : Options for automatic checkpointing (see \
+          :class:`sporco.admm.dictlrn.DictLearn.Options`)
         """
 
-        defaults = {'Verbose' : False, 'StatusHeader' : True,
-                'MaxMainIter' : 1000, 'DictSize' : None,
+        defaults = copy.deepcopy(dictlrn.DictLearn.Options.defaults)
+        defaults.update({'DictSize' : None,
                 'CBPDN' : copy.deepcopy(cbpdn.ConvBPDN.Options.defaults),
-                'CCMOD' : copy.deepcopy(ccmod.ConvCnstrMOD.Options.defaults)}
+                'CCMOD' : copy.deepcopy(ccmod.ConvCnstrMOD.Options.defaults)})
 
 
         def __init__(self, opt=None):
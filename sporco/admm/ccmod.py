@@ -366,20 +366,30 @@ class ConvCnstrMOD(admm.ADMMEqual):
         :math:`\{\mathbf{d}_m\}` should have zero-mean components
 
         ``LinSolve`` : Select linear solver for x step. Options are \
-        ``SM`` (Sherman-Morrison) or ``CG`` (Conjugate Gradient)
+        ``SM`` (Sherman-Morrison), ``CG`` (Conjugate Gradient), or \
+        ``CHO`` (Cholesky factorisation of the system matrix at each \
+        frequency, which is preferable to ``SM`` when the number of \
+        training images is substantially larger than the number of \
+        dictionary filters)
 
         ``CG`` : CG solver options
 
           ``MaxIter`` : Maximum iterations
 
           ``StopTol`` : Stopping tolerance
+
+        ``PersistentWorkspace`` : Flag indicating whether the arrays \
+        computed in the X step should be stored in persistent \
+        byte-aligned working arrays, allocated on initialisation, \
+        instead of being allocated on every iteration
         """
 
         defaults = copy.deepcopy(admm.ADMMEqual.Options.defaults)
         defaults.update({'AuxVarObj' : False, 'ReturnX' : False,
                         'RelaxParam' : 1.8, 'ZeroMean' : False,
                         'LinSolve' : 'SM', 'LinSolveCheck' : False,
-                        'CG' : {'MaxIter' : 1000, 'StopTol' : 1e-3}})
+                        'CG' : {'MaxIter' : 1000, 'StopTol' : 1e-3},
+                        'PersistentWorkspace' : False})
         defaults['AutoRho'].update({'Enabled' : True, 'Period' : 1,
                                     'AutoScaling' : True, 'Scaling' : 1000,
                                     'RsdlRatio' : 1.2})
@@ -508,6 +518,12 @@ class ConvCnstrMOD(admm.ADMMEqual):
         xfshp[dimN-1] = xfshp[dimN-1]//2 + 1
         self.Xf = sl.pyfftw_empty_aligned(xfshp,
                             dtype=sl.complex_dtype(self.dtype))
+        # Xf is the initial value for the CG solver in the first X step
+        self.Xf[:] = 0.0
+        if self.opt['PersistentWorkspace']:
+            self.YUf = sl.pyfftw_empty_aligned(xfshp,
+                            dtype=sl.complex_dtype(self.dtype))
+            self.X = sl.pyfftw_empty_aligned(self.Y.shape, dtype=self.dtype)
 
         if A is not None:
             self.setcoef(A)
@@ -551,6 +567,59 @@ class ConvCnstrMOD(admm.ADMMEqual):
         # Compute X^H S
         self.ASf = np.sum(np.conj(self.Af) * self.Sf, self.cri.axisK,
                           keepdims=True)
+        self.c = self.xstep_c()
+
+
+
+    def xstep_c(self):
+        """Compute the cached component of the X step linear system
+        solver, i.e. the :func:`.linalg.solvemdbi_ism_factor`
+        factorisation if option ``LinSolve`` is ``SM``, or the
+        :func:`.linalg.solvemdbi_chol_factor` factorisation if it is
+        ``CHO``.
+        """
+
+        if self.opt['LinSolve'] == 'SM':
+            return sl.solvemdbi_ism_factor(self.Af, self.rho, self.cri.axisM,
+                                           self.cri.axisK)
+        elif self.opt['LinSolve'] == 'CHO':
+            return sl.solvemdbi_chol_factor(self.Af, self.rho, self.cri.axisM,
+                                            self.cri.axisK)
+        else:
+            return None
+
+
+
+    def rhochange(self):
+        """Updated cached c array when rho changes."""
+
+        if hasattr(self, 'Af'):
+            self.c = self.xstep_c()
+
+
+
+    def checkpoint_state(self):
+        """Get a dict representing the state of the solver (see
+        :meth:`.ADMM.checkpoint_state`). If option ``LinSolve`` is
+        ``CG``, the state also includes the DFT of variable X, which is
+        the initial value for the CG solver in the next X step.
+        """
+
+        state = super(ConvCnstrMOD, self).checkpoint_state()
+        if self.opt['LinSolve'] == 'CG':
+            state['Xf'] = self.Xf
+        return state
+
+
+
+    def restore_state(self, state):
+        """Restore the state of the solver from a dict constructed by
+        :meth:`checkpoint_state` (see :meth:`.ADMM.restore_state`).
+        """
+
+        super(ConvCnstrMOD, self).restore_state(state)
+        if 'Xf' in state:
+            self.Xf[:] = state['Xf']
 
 
 
@@ -566,12 +635,20 @@ class ConvCnstrMOD(admm.ADMMEqual):
 
         self.cgit = None
 
-        self.YU[:] = self.Y - self.U
+        np.subtract(self.Y, self.U, out=self.YU)
 
-        b = self.ASf + self.rho*sl.rfftn(self.YU, None, self.cri.axisN)
+        if self.opt['PersistentWorkspace']:
+            b = sl.rfftn(self.YU, None, self.cri.axisN, out=self.YUf)
+            b *= self.rho
+            b += self.ASf
+        else:
+            b = self.ASf + self.rho*sl.rfftn(self.YU, None, self.cri.axisN)
         if self.opt['LinSolve'] == 'SM':
-            self.Xf[:] = sl.solvemdbi_ism(self.Af, self.rho, b, self.cri.axisM,
-                                self.cri.axisK)
+            sl.solvemdbi_ism(self.Af, self.rho, b, self.cri.axisM,
+                             self.cri.axisK, self.c, out=self.Xf)
+        elif self.opt['LinSolve'] == 'CHO':
+            sl.solvemdbi_chol(self.Af, self.rho, b, self.cri.axisM,
+                              self.cri.axisK, self.c, out=self.Xf)
         else:
             self.Xf[:], cgit = sl.solvemdbi_cg(self.Af, self.rho, b,
                                 self.cri.axisM, self.cri.axisK,
@@ -579,7 +656,10 @@ class ConvCnstrMOD(admm.ADMMEqual):
                                 self.opt['CG', 'MaxIter'], self.Xf)
             self.cgit = cgit
 
-        self.X = sl.irfftn(self.Xf, self.cri.Nv, self.cri.axisN)
+        if self.opt['PersistentWorkspace']:
+            sl.irfftn(self.Xf, self.cri.Nv, self.cri.axisN, out=self.X)
+        else:
+            self.X = sl.irfftn(self.Xf, self.cri.Nv, self.cri.axisN)
 
         if self.opt['LinSolveCheck']:
             Aop = lambda x: np.sum(self.Af * x, axis=self.cri.axisM,
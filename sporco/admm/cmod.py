@@ -80,11 +80,19 @@ class CnstrMOD(admm.ADMMEqual):
 
         ``ZeroMean`` : Flag indicating whether the solution dictionary \
         :math:`D` should have zero-mean components
+
+        ``LinSolve`` : Select linear solver for x step. Options are \
+        ``CHO`` (Cholesky factorisation, computed in the precision \
+        specified by ``DataType`` and recomputed when rho changes), \
+        ``LU`` (LU factorisation, which is recomputed when rho changes) \
+        or ``EIG`` (eigenvalue decomposition, which is computed once \
+        and is valid for all values of rho)
         """
 
         defaults = copy.deepcopy(admm.ADMMEqual.Options.defaults)
         defaults.update({'AuxVarObj' : True, 'ReturnX' : False,
-                        'RelaxParam' : 1.8, 'ZeroMean' : False})
+                        'RelaxParam' : 1.8, 'ZeroMean' : False,
+                        'LinSolve' : 'CHO'})
         defaults['AutoRho'].update({'Enabled' : True})
 
 
@@ -131,6 +139,9 @@ class CnstrMOD(admm.ADMMEqual):
 
         if opt is None:
             opt = CnstrMOD.Options()
+        if opt['LinSolve'] not in ('EIG', 'CHO', 'LU'):
+            raise ValueError('Invalid value %s for option LinSolve' %
+                             opt['LinSolve'])
 
         Nc = S.shape[0]
         # If A not specified, get dictionary size from dsz
@@ -179,8 +190,13 @@ class CnstrMOD(admm.ADMMEqual):
         self.A = np.asarray(A, dtype=self.dtype)
         self.SAT = self.S.dot(A.T)
         # Factorise dictionary for efficient solves
-        self.lu, self.piv = sl.lu_factor(A, self.rho)
-        self.lu = np.asarray(self.lu, dtype=self.dtype)
+        if self.opt['LinSolve'] == 'EIG':
+            self.eigval, self.eigvec = sl.eig_factor(A)
+        elif self.opt['LinSolve'] == 'LU':
+            self.lu, self.piv = sl.lu_factor(A, self.rho)
+            self.lu = np.asarray(self.lu, dtype=self.dtype)
+        else:
+            self.c, self.lwr = sl.cho_factor(self.A, self.rho)
 
 
 
@@ -194,9 +210,18 @@ class CnstrMOD(admm.ADMMEqual):
     def xstep(self):
         """Minimise Augmented Lagrangian with respect to x."""
 
-        self.X = np.asarray(sl.lu_solve_AATI(self.A, self.rho, self.SAT +
+        if self.opt['LinSolve'] == 'EIG':
+            self.X = np.asarray(sl.eig_solve_AATI(self.A, self.rho, self.SAT +
+                            self.rho*(self.Y - self.U), self.eigval,
+                            self.eigvec), dtype=self.dtype)
+        elif self.opt['LinSolve'] == 'LU':
+            self.X = np.asarray(sl.lu_solve_AATI(self.A, self.rho, self.SAT +
                             self.rho*(self.Y - self.U), self.lu, self.piv,),
                             dtype=self.dtype)
+        else:
+            self.X = np.asarray(sl.cho_solve_AATI(self.A, self.rho, self.SAT +
+                            self.rho*(self.Y - self.U), self.c, self.lwr),
+                            dtype=self.dtype)
 
 
 
@@ -239,8 +264,11 @@ class CnstrMOD(admm.ADMMEqual):
     def rhochange(self):
         """Re-factorise matrix when rho changes"""
 
-        self.lu, self.piv = sl.lu_factor(self.A, self.rho)
-        self.lu = np.asarray(self.lu, dtype=self.dtype)
+        if self.opt['LinSolve'] == 'LU':
+            self.lu, self.piv = sl.lu_factor(self.A, self.rho)
+            self.lu = np.asarray(self.lu, dtype=self.dtype)
+        elif self.opt['LinSolve'] != 'EIG':
+            self.c, self.lwr = sl.cho_factor(self.A, self.rho)
 
 
 
@@ -17,6 +17,7 @@ import collections
 
 from sporco import cdict
 from sporco import util
+from sporco.admm import admm
 from sporco.util import u
 
 __author__ = """Brendt Wohlberg <brendt@ieee.org>"""
@@ -170,10 +171,35 @@ class DictLearn(object):
            separator are displayed
 
           ``MaxMainIter`` : Maximum main iterations
+
+          ``MaxRunTime`` : Maximum run time in seconds of each call of \
+          :meth:`DictLearn.solve`, or None. The iterations are \
+          terminated before the first iteration that is not expected, \
+          on the basis of the mean time per iteration, to be completed \
+          within this time.
+
+          ``Deadline`` : Time, as returned by :func:`time.time`, by \
+          which :meth:`DictLearn.solve` should return, or None
+
+          ``Checkpoint`` : Options for automatic checkpointing of the \
+          solver state (see :meth:`DictLearn.checkpoint`) during \
+          :meth:`DictLearn.solve`
+
+            ``Path`` : Checkpoint directory path. Automatic \
+            checkpointing is disabled if None.
+
+            ``Period`` : Iteration period on which a checkpoint is \
+            saved, or None
+
+            ``Interval`` : Minimum time in seconds between saving of \
+            checkpoints, or None
         """
 
         defaults = {'Verbose' : False, 'StatusHeader' : True,
-                    'MaxMainIter' : 1000}
+                    'MaxMainIter' : 1000, 'MaxRunTime' : None,
+                    'Deadline' : None,
+                    'Checkpoint' : {'Path' : None, 'Period' : None,
+                                    'Interval' : None}}
 
 
         def __init__(self, opt=None):
@@ -231,7 +257,7 @@ class DictLearn(object):
         self.xstep = xstep
         self.dstep = dstep
 
-        self.itstat = []
+        self.itstat = util.IterStatsStore(self.isc.IterationStats)
         self.j = 0
 
         # Increment `runtime` to reflect object initialisation
@@ -243,7 +269,11 @@ class DictLearn(object):
 
 
     def solve(self):
-        """Run optimisation"""
+        """Run optimisation. The reason for termination of the
+        iterations, either ``MaxMainIter`` or ``TimeLimit`` (see options
+        ``MaxRunTime`` and ``Deadline``), is recorded in attribute
+        :attr:`termination`.
+        """
 
         # Print header and separator strings
         if self.opt['Verbose'] and self.opt['StatusHeader']:
@@ -252,8 +282,24 @@ class DictLearn(object):
         # Reset timer
         self.timer.start()
 
+        # Initialise automatic checkpointing
+        chkpt = self.opt['Checkpoint', 'Path'] is not None
+        tchk = self.timer.elapsed()
+
+        # Initialise run time limit
+        tmax = admm.time_limit(self.opt['MaxRunTime'], self.opt['Deadline'])
+        self.termination = 'MaxMainIter'
+
         for j in range(self.j, self.j + self.opt['MaxMainIter']):
 
+            # Terminate if the next iteration is not expected to be
+            # completed within the run time limit
+            if j > self.j and admm.time_limit_reached(
+                    tmax, self.timer.elapsed(), j - self.j):
+                self.termination = 'TimeLimit'
+                j -= 1
+                break
+
             # X update
             self.xstep.solve()
             self.dstep.setcoef(self.xstep.getcoef())
@@ -277,6 +323,15 @@ class DictLearn(object):
             if self.opt['Verbose']:
                 self.isc.printiterstats(itst)
 
+            # Save checkpoint if due
+            if chkpt and admm.checkpoint_due(self.opt['Checkpoint'], j,
+                                             self.timer.elapsed() - tchk):
+                state = self.checkpoint_state()
+                state['j'] = j + 1
+                state['runtime'] += self.timer.elapsed()
+                util.save_checkpoint(self.opt['Checkpoint', 'Path'], state)
+                tchk = self.timer.elapsed()
+
 
         # Record run time
         self.runtime += self.timer.elapsed()
@@ -293,6 +348,71 @@ class DictLearn(object):
 
 
 
+    def checkpoint_state(self):
+        """Get a dict representing the state of the solver, consisting
+        of the iteration count, run time, iteration statistics, and the
+        states (see :meth:`.admm.ADMM.checkpoint_state`) of the X step
+        and D step objects.
+        """
+
+        return {'class' : type(self).__name__, 'j' : self.j,
+                'runtime' : self.runtime, 'itstat' : self.itstat,
+                'xstep' : self.xstep.checkpoint_state(),
+                'dstep' : self.dstep.checkpoint_state()}
+
+
+
+    def restore_state(self, state):
+        """Restore the state of the solver from a dict constructed by
+        :meth:`checkpoint_state`.
+        """
+
+        if state['class'] != type(self).__name__:
+            raise ValueError('Cannot restore state of a %s object into a %s '
+                             'object' % (state['class'], type(self).__name__))
+        self.j = int(state['j'])
+        self.runtime = float(state['runtime'])
+        self.itstat = state['itstat']
+        self.xstep.restore_state(state['xstep'])
+        self.dstep.restore_state(state['dstep'])
+        # The X step dictionary is part of its problem definition
+        # rather than its state, and is set from the D step solution
+        self.xstep.setdict(self.dstep.getdict())
+
+
+
+    def checkpoint(self, path):
+        """Save a checkpoint of the solver state (see
+        :meth:`checkpoint_state`) in directory `path`, with the states
+        of the X step and D step objects in subdirectories ``xstep``
+        and ``dstep``.
+
+        Parameters
+        ----------
+        path : string
+          Checkpoint directory path
+        """
+
+        util.save_checkpoint(path, self.checkpoint_state())
+
+
+
+    def restore(self, path):
+        """Restore the solver state from a checkpoint saved by
+        :meth:`checkpoint`, or by automatic checkpointing. The solver
+        object should be initialised with the same problem definition
+        and options as the one from which the checkpoint was saved.
+
+        Parameters
+        ----------
+        path : string
+          Checkpoint directory path
+        """
+
+        self.restore_state(util.load_checkpoint(path))
+
+
+
     def evaluate(self):
         """Evaluate results (e.g. functional value) of previous iteration"""
 
@@ -316,13 +436,9 @@ class DictLearn(object):
 
     def getitstat(self):
         """Get iteration stats as named tuple of arrays instead of array of
-        named tuples.
+        named tuples. The arrays are copies of the columns of the
+        :attr:`itstat` store, and are therefore not modified by
+        subsequent iterations.
         """
 
-        if len(self.itstat) == 0:
-            return None
-        else:
-            return self.isc.IterationStats(
-                *[[self.itstat[k][l] for k in range(len(self.itstat))]
-                  for l in range(len(self.itstat[0]))]
-            )
+        return self.itstat.astuple(copy=True)
@@ -6,6 +6,7 @@ import pytest
 import numpy as np
 from scipy import linalg
 import pickle
+import time
 
 from sporco.admm import bpdn
 import sporco.linalg as sl
@@ -191,6 +192,72 @@ class TestSet01(object):
         assert(b.U.dtype == dt)
 
 
+    def test_12(self):
+        N = 8
+        M = 16
+        D = np.random.randn(N, M)
+        s = np.random.randn(N, 1)
+        lmbda = 1e-1
+        mu = 1e-2
+        opt = bpdn.ElasticNet.Options({'Verbose' : False, 'MaxMainIter' : 50,
+                                       'AutoRho' : {'Enabled' : True}})
+        b = bpdn.ElasticNet(D, s, lmbda, mu, opt)
+        Xb = b.solve()
+        opt['LinSolve'] = 'EIG'
+        c = bpdn.ElasticNet(D, s, lmbda, mu, opt)
+        Xc = c.solve()
+        assert(linalg.norm(Xb-Xc) < 1e-10)
+
+
+    def test_13(self):
+        N = 16
+        M = 8
+        D = np.random.randn(N, M)
+        s = np.random.randn(N, 2)
+        lmbda = 1e-1
+        opt = bpdn.BPDN.Options({'Verbose' : False, 'MaxMainIter' : 50,
+                                 'AutoRho' : {'Enabled' : True}})
+        b = bpdn.BPDN(D, s, lmbda, opt)
+        Xb = b.solve()
+        opt['LinSolve'] = 'EIG'
+        c = bpdn.BPDN(D, s, lmbda, opt)
+        Xc = c.solve()
+        assert(linalg.norm(Xb-Xc) < 1e-10)
+
+
+    def test_14(self):
+        N = 8
+        M = 16
+        D = np.random.randn(N, M)
+        s = np.random.randn(N, 1)
+        lmbda = 1e-1
+        opt = bpdn.BPDN.Options({'Verbose' : False, 'MaxMainIter' : 50,
+                                 'LinSolve' : 'LU'})
+        b = bpdn.BPDN(D, s, lmbda, opt)
+        Xb = b.solve()
+        opt['LinSolve'] = 'CHO'
+        c = bpdn.BPDN(D, s, lmbda, opt)
+        Xc = c.solve()
+        assert(linalg.norm(Xb-Xc) < 1e-10)
+        opt['LinSolve'] = 'QR'
+        with pytest.raises(ValueError):
+            bpdn.BPDN(D, s, lmbda, opt)
+
+
+    def test_15(self):
+        N = 8
+        M = 16
+        D = np.random.randn(N, M)
+        s = np.random.randn(N, 1)
+        dt = np.float32
+        opt = bpdn.BPDN.Options({'Verbose' : False, 'MaxMainIter' : 20,
+                                 'LinSolve' : 'CHO', 'DataType' : dt})
+        b = bpdn.BPDN(D, s, lmbda=1.0, opt=opt)
+        b.solve()
+        assert(b.c.dtype == dt)
+        assert(b.X.dtype == dt)
+
+
     def test_16(self):
         N = 8
         M = 16
@@ -204,3 +271,306 @@ class TestSet01(object):
         Xb = b.solve()
         Xc = c.solve()
         assert(linalg.norm(Xb-Xc)==0.0)
+
+
+    def test_17(self):
+        N = 8
+        M = 16
+        K = 4
+        D = np.random.randn(N, M)
+        S = np.random.randn(N, K)
+        lmbda = np.array([1e-2, 5e-2, 1e-1, 2e-1])
+        opt = bpdn.BPDN.Options({'Verbose' : False, 'MaxMainIter' : 200,
+                                 'RelStopTol' : 1e-4, 'Batch' : True})
+        b = bpdn.BPDN(D, S, lmbda, opt)
+        Xb = b.solve()
+        assert(Xb.shape == (M, K))
+        assert(b.itstat[-1].Rho.shape == (K,))
+        for k in range(K):
+            opt = bpdn.BPDN.Options({'Verbose' : False, 'MaxMainIter' : 200,
+                                     'RelStopTol' : 1e-4, 'LinSolve' : 'EIG'})
+            c = bpdn.BPDN(D, S[:, k:k+1], lmbda[k], opt)
+            Xc = c.solve()
+            assert(linalg.norm(Xb[:, k:k+1] - Xc) < 1e-10)
+            if b.batch_cnvg[k]:
+                assert(b.batch_iter[k] == c.k - 1)
+
+
+    def test_18(self):
+        N = 8
+        M = 16
+        D = np.random.randn(N, M)
+        s = np.random.randn(N, 2)
+        opt = bpdn.BPDNJoint.Options({'Batch' : True})
+        with pytest.raises(ValueError):
+            b = bpdn.BPDNJoint(D, s, lmbda=1.0, mu=0.1, opt=opt)
+
+
+    def test_19(self):
+        N = 32
+        M = 64
+        D = np.random.randn(N, M)
+        s = np.random.randn(N, 1)
+        lmbda = 1e-1
+        mu = 1e-1
+        # Momentum is effective for the strongly convex Elastic Net
+        # problem with a poorly chosen penalty parameter
+        opt = bpdn.ElasticNet.Options({'Verbose' : False,
+                                       'MaxMainIter' : 2000,
+                                       'RelStopTol' : 1e-6, 'AutoRho' :
+                                       {'Enabled' : False}, 'rho' : 10.0,
+                                       'RelaxParam' : 1.0})
+        b = bpdn.ElasticNet(D, s, lmbda, mu, opt)
+        Xb = b.solve()
+        opt['Accelerate', 'Method'] = 'Nesterov'
+        c = bpdn.ElasticNet(D, s, lmbda, mu, opt)
+        Xc = c.solve()
+        assert(c.k < b.k)
+        assert(sl.rrs(Xb, Xc) < 1e-4)
+        opt['RelaxParam'] = 1.8
+        with pytest.raises(ValueError):
+            bpdn.ElasticNet(D, s, lmbda, mu, opt)
+        opt['RelaxParam'] = 1.0
+        opt['Accelerate', 'Method'] = 'Invalid'
+        d = bpdn.ElasticNet(D, s, lmbda, mu, opt)
+        with pytest.raises(ValueError):
+            d.solve()
+
+
+    def test_20(self):
+        N = 64
+        M = 128
+        D = np.random.randn(N, M)
+        s = D[:, 0:5].dot(np.random.randn(5, 1))
+        lmbda = 1e-1
+        opt = bpdn.BPDN.Options({'Verbose' : False, 'MaxMainIter' : 2000,
+                                 'RelStopTol' : 1e-4, 'AutoRho' :
+                                 {'Enabled' : False}, 'rho' : 0.1})
+        b = bpdn.BPDN(D, s, lmbda, opt)
+        Xb = b.solve()
+        opt['Accelerate', 'Method'] = 'Anderson'
+        c = bpdn.BPDN(D, s, lmbda, opt)
+        Xc = c.solve()
+        assert(c.k < b.k)
+        assert(sl.rrs(Xb, Xc) < 1e-3)
+        smry = c.accelerate_summary()
+        assert(smry['Steps'] > 0)
+        assert(smry['Memory'] >= 2 * 5 * 2 * Xc.size * Xc.itemsize)
+
+
+    def test_21(self):
+        N = 64
+        M = 128
+        D = np.random.randn(N, M)
+        s = D[:, 0:5].dot(np.random.randn(5, 1))
+        lmbda = 1e-1
+        opt = bpdn.BPDN.Options({'Verbose' : False, 'MaxMainIter' : 2000,
+                                 'RelStopTol' : 1e-4, 'rho' : 0.1,
+                                 'AutoRho' : {'Enabled' : True}})
+        b = bpdn.BPDN(D, s, lmbda, opt)
+        Xb = b.solve()
+        opt['AutoRho', 'Strategy'] = 'Spectral'
+        c = bpdn.BPDN(D, s, lmbda, opt)
+        Xc = c.solve()
+        assert(c.k < b.k)
+        assert(np.sum(np.diff(c.itstat.column('Rho')) != 0) <
+               np.sum(np.diff(b.itstat.column('Rho')) != 0))
+        assert(sl.rrs(Xb, Xc) < 1e-2)
+        opt['AutoRho', 'Strategy'] = 'Invalid'
+        with pytest.raises(ValueError):
+            d = bpdn.BPDN(D, s, lmbda, opt)
+
+
+    def test_22(self):
+        N = 8
+        M = 16
+        D = np.random.randn(N, M)
+        s = np.random.randn(N, 1)
+        lmbda = 1e-1
+        opt = bpdn.BPDN.Options({'Verbose' : False, 'MaxMainIter' : 50,
+                                 'RelStopTol' : 0.0, 'rho' : 0.01,
+                                 'AuxVarObj' : False})
+        b = bpdn.BPDN(D, s, lmbda, opt)
+        b.solve()
+        kbest = np.argmin(b.getitstat().ObjFun)
+        assert(not np.shares_memory(b.getitstat().ObjFun, b.itstat.data))
+        assert(kbest < b.k - 1)
+        opt['ReturnBest'] = True
+        c = bpdn.BPDN(D, s, lmbda, opt)
+        Xc = c.solve()
+        opt['ReturnBest'] = False
+        opt['MaxMainIter'] = kbest + 1
+        d = bpdn.BPDN(D, s, lmbda, opt)
+        Xd = d.solve()
+        assert(linalg.norm(Xc - Xd) == 0.0)
+        assert(c.termination == 'MaxMainIter')
+
+
+    def test_23(self):
+        N = 8
+        M = 16
+        D = np.random.randn(N, M)
+        s = np.random.randn(N, 1)
+        lmbda = 1e-1
+        opt = bpdn.BPDN.Options({'Verbose' : False, 'MaxMainIter' : 50,
+                                 'RelStopTol' : 0.0, 'StatsPeriod' : 10,
+                                 'MaxRunTime' : 0.0})
+        b = bpdn.BPDN(D, s, lmbda, opt)
+        b.solve()
+        assert(b.k == 1)
+        assert(b.termination == 'TimeLimit')
+        assert(len(b.itstat) == 1)
+        opt['MaxRunTime'] = None
+        opt['Deadline'] = 0.0
+        c = bpdn.BPDN(D, s, lmbda, opt)
+        c.solve()
+        assert(c.k == 1)
+
+
+    def test_24(self):
+        N = 32
+        M = 64
+        K = 4
+        D = np.random.randn(N, M)
+        X0 = np.zeros((M, K))
+        for k in range(K):
+            X0[np.random.permutation(M)[0:4], k] = 1.0
+        s = D.dot(X0) + 1e-2*np.random.randn(N, K)
+        lmbda = [1.0, 0.5, 0.2, 0.1]
+        opt = bpdn.BPDN.Options({'Verbose' : False, 'MaxMainIter' : 2000,
+                                 'RelStopTol' : 1e-5, 'rho' : 10.0})
+        b = bpdn.BPDN(D, s, lmbda[0], opt)
+        kc = 0
+        for l in lmbda:
+            Xp = b.solve_path([l], sparse=True)
+            c = bpdn.BPDN(D, s, l, opt)
+            Xc = c.solve()
+            kc += c.k
+            assert(b.itstat[-1].ObjFun < (1 + 1e-4) * c.itstat[-1].ObjFun)
+            assert(np.array_equal(Xp[0].toarray(), b.getcoef()))
+        assert(b.k < kc)
+        assert(not hasattr(bpdn.GenericBPDN, 'solve_path'))
+
+
+    def test_25(self):
+        N = 32
+        M = 128
+        K = 4
+        D = np.random.randn(N, M)
+        D /= np.sqrt(np.sum(D**2, axis=0))
+        X0 = np.zeros((M, K))
+        for k in range(K):
+            X0[np.random.permutation(M)[0:3], k] = np.random.randn(3)
+        s = D.dot(X0) + 1e-2*np.random.randn(N, K)
+        lmbda = 0.3*np.abs(D.T.dot(s)).max()
+        opt = bpdn.BPDN.Options({'Verbose' : False, 'MaxMainIter' : 500,
+                                 'RelStopTol' : 1e-6})
+        b = bpdn.BPDN(D, s, lmbda, opt)
+        Xb = b.solve()
+        opt['Screening', 'Enabled'] = True
+        for ls in ('CHO', 'LU', 'EIG'):
+            opt['LinSolve'] = ls
+            c = bpdn.BPDN(D, s, lmbda, opt)
+            c.solve()
+            assert(c.scrnidx is not None and c.scrnidx.size < M)
+            assert(np.all(c.Y[np.setdiff1d(np.arange(M), c.scrnidx)] == 0))
+            assert(c.itstat[-1].ObjFun < (1 + 1e-5) * b.itstat[-1].ObjFun)
+            assert(sl.rrs(b.Y, c.Y) < 1e-3)
+        with pytest.raises(ValueError):
+            bpdn.BPDNJoint(D, s, lmbda, 1e-1, opt)
+
+
+    def test_26(self, tmpdir):
+        N = 32
+        M = 64
+        K = 10
+        D = np.random.randn(N, M)
+        X0 = np.zeros((M, K))
+        for k in range(K):
+            X0[np.random.permutation(M)[0:4], k] = 1.0
+        S = D.dot(X0) + 1e-2*np.random.randn(N, K)
+        lmbda = 0.5
+        opt = bpdn.BPDN.Options({'Verbose' : False, 'MaxMainIter' : 2000,
+                                 'RelStopTol' : 1e-6, 'rho' : 10.0})
+        b = bpdn.BPDN(D, S, lmbda, opt)
+        Xb = b.solve()
+        spth = str(tmpdir.join('S.npy'))
+        xpth = str(tmpdir.join('X.npy'))
+        np.save(spth, S)
+        Xc = bpdn.solve_blocks(D, spth, lmbda, blksz=4, opt=opt, out=xpth)
+        assert(Xc.shape == (M, K))
+        assert(sl.rrs(b.Y, Xc) < 1e-4)
+        assert(np.array_equal(np.load(xpth), Xc))
+        Xd = bpdn.solve_blocks(D, (S[:, k:k+3] for k in range(0, K, 3)),
+                               lmbda, blksz=3, opt=opt, sparse=True)
+        assert(Xd.shape == (M, K))
+        assert(sl.rrs(b.Y, Xd.toarray()) < 1e-4)
+        with pytest.raises(ValueError):
+            bpdn.solve_blocks(D, iter([S]), lmbda, blksz=4, opt=opt)
+
+
+    def test_27(self):
+        N = 32
+        M = 64
+        K = 6
+        D = np.random.randn(N, M)
+        X0 = np.zeros((M, K))
+        for k in range(K):
+            X0[np.random.permutation(M)[0:4], k] = 1.0
+        S = D.dot(X0) + 1e-2*np.random.randn(N, K)
+        lmbda = 0.5
+        opt = bpdn.BPDN.Options({'Verbose' : False, 'MaxMainIter' : 2000,
+                                 'RelStopTol' : 1e-6, 'rho' : 10.0})
+        b = bpdn.BPDN(D, S, lmbda, opt)
+        b.solve()
+        Xc = bpdn.solve_parallel(D, S, lmbda, opt, nproc=2)
+        assert(Xc.shape == (M, K))
+        assert(sl.rrs(b.Y, Xc) < 1e-4)
+
+
+    def test_28(self):
+        N = 8
+        M = 16
+        D = np.random.randn(N, M)
+        s = np.random.randn(N, 1)
+        lmbda = 1e-1
+
+        class SlowBPDN(bpdn.BPDN):
+            def xstep(self):
+                time.sleep(0.05)
+                super(SlowBPDN, self).xstep()
+
+        # Each iteration takes at least 0.05s, so the iterations
+        # should be terminated after at most four iterations
+        opt = bpdn.BPDN.Options({'Verbose' : False, 'MaxMainIter' : 50,
+                                 'RelStopTol' : 0.0, 'StatsPeriod' : 10,
+                                 'MaxRunTime' : 0.22})
+        b = SlowBPDN(D, s, lmbda, opt)
+        b.solve()
+        assert(1 <= b.k <= 4)
+        assert(b.termination == 'TimeLimit')
+        assert(b.itstat[-1].Iter == b.k - 1)
+
+
+    def test_29(self):
+        N = 8
+        M = 16
+        K = 4
+        D = np.random.randn(N, M)
+        S = np.random.randn(N, K)
+        lmbda = np.array([1e-2, 5e-2, 1e-1, 2e-1])
+        opt = bpdn.BPDN.Options({'Verbose' : False, 'MaxMainIter' : 300,
+                                 'RelStopTol' : 1e-3, 'Batch' : True})
+        b = bpdn.BPDN(D, S, lmbda, opt)
+        b.solve()
+        # At least one problem converged before the final iteration
+        assert(np.any(b.batch_cnvg) and
+               np.min(b.batch_iter[b.batch_cnvg]) < b.k - 1)
+        fc = 0.0
+        for k in range(K):
+            opt = bpdn.BPDN.Options({'Verbose' : False, 'MaxMainIter' : 300,
+                                     'RelStopTol' : 1e-3, 'LinSolve' : 'EIG'})
+            c = bpdn.BPDN(D, S[:, k:k+1], lmbda[k], opt)
+            c.solve()
+            fc += c.itstat[-1].ObjFun
+        assert(np.abs(b.itstat[-1].ObjFun - fc) < 1e-6 * fc)
@@ -40,3 +40,41 @@ class TestSet01(object):
         except Exception as e:
             print(e)
             assert(0)
+
+
+    def test_03(self, tmpdir):
+        N = 8
+        M = 4
+        K = 8
+        D0 = np.random.randn(N, M)
+        S = np.random.randn(N, K)
+        lmbda = 1e-1
+        pth = str(tmpdir.join('chkpt'))
+        opt = bpdndl.BPDNDictLearn.Options({'MaxMainIter' : 5})
+        b = bpdndl.BPDNDictLearn(D0, S, lmbda, opt)
+        b.solve()
+        Db = b.solve()
+        opt['Checkpoint', 'Path'] = pth
+        opt['Checkpoint', 'Period'] = 5
+        c = bpdndl.BPDNDictLearn(D0, S, lmbda, opt)
+        c.solve()
+        d = bpdndl.BPDNDictLearn(D0, S, lmbda, opt)
+        d.restore(pth)
+        assert(d.j == 5)
+        Dd = d.solve()
+        assert(np.linalg.norm(Db-Dd) == 0.0)
+
+
+    def test_04(self):
+        N = 8
+        M = 4
+        K = 8
+        D0 = np.random.randn(N, M)
+        S = np.random.randn(N, K)
+        lmbda = 1e-1
+        opt = bpdndl.BPDNDictLearn.Options({'MaxMainIter' : 10,
+                                            'MaxRunTime' : 0.0})
+        b = bpdndl.BPDNDictLearn(D0, S, lmbda, opt)
+        b.solve()
+        assert(b.j == 1)
+        assert(b.termination == 'TimeLimit')
@@ -1,4 +1,5 @@
 from __future__ import division
+from builtins import range
 from builtins import object
 
 import pytest
@@ -406,3 +407,368 @@ class TestSet01(object):
         Xb = b.solve()
         Xc = c.solve()
         assert(np.linalg.norm(Xb-Xc)==0.0)
+
+
+    def test_27(self):
+        N = 16
+        Nd = 5
+        Cs = 3
+        M = 4
+        D = np.random.randn(Nd, Nd, Cs, M)
+        s = np.random.randn(N, N, Cs)
+        lmbda = 1e-1
+        opt = cbpdn.ConvBPDN.Options({'Verbose' : False, 'MaxMainIter' : 10})
+        b = cbpdn.ConvBPDN(D, s, lmbda, opt)
+        Xb = b.solve()
+        opt['PersistentWorkspace'] = True
+        c = cbpdn.ConvBPDN(D, s, lmbda, opt)
+        Xc = c.solve()
+        assert(np.linalg.norm(Xb-Xc) < 1e-12)
+
+
+    def test_28(self):
+        N = 16
+        Nd = 5
+        Cd = 3
+        M = 4
+        D = np.random.randn(Nd, Nd, Cd, M)
+        s = np.random.randn(N, N, Cd)
+        lmbda = 1e-1
+        opt = cbpdn.ConvBPDN.Options({'Verbose' : False, 'MaxMainIter' : 10,
+                                      'LinSolveCheck' : True,
+                                      'AutoRho' : {'Enabled' : True}})
+        b = cbpdn.ConvBPDN(D, s, lmbda, opt)
+        b.solve()
+        assert(np.unique(b.getitstat().Rho).size > 1)
+        assert(max(b.getitstat().XSlvRelRes) < 1e-10)
+
+
+    def test_29(self):
+        N = 16
+        Nd = 5
+        M = 4
+        D = np.random.randn(Nd, Nd, M)
+        s = np.random.randn(N, N)
+        lmbda = 1e-1
+        opt = cbpdn.ConvBPDN.Options({'Verbose' : False, 'MaxMainIter' : 25,
+                                      'RelStopTol' : 0.0,
+                                      'AutoRho' : {'Enabled' : True,
+                                                   'Period' : 5}})
+        b = cbpdn.ConvBPDN(D, s, lmbda, opt)
+        Xb = b.solve()
+        opt['StatsPeriod'] = 10
+        opt['ResidualPeriod'] = 5
+        c = cbpdn.ConvBPDN(D, s, lmbda, opt)
+        nrsdl = [0]
+        def compute_residuals():
+            nrsdl[0] += 1
+            return cbpdn.ConvBPDN.compute_residuals(c)
+        c.compute_residuals = compute_residuals
+        Xc = c.solve()
+        assert(np.linalg.norm(Xb-Xc) == 0.0)
+        assert(nrsdl[0] == 5)
+        assert(len(c.itstat) == 3)
+        assert(list(c.getitstat().Iter) == [9, 19, 24])
+        assert(c.itstat[-1].ObjFun == b.itstat[-1].ObjFun)
+
+
+    def test_30(self):
+        N = 16
+        Nd = 5
+        M = 4
+        D = np.random.randn(Nd, Nd, M)
+        s = np.random.randn(N, N)
+        lmbda = 1e-1
+        opt = cbpdn.ConvBPDN.Options({'Verbose' : False, 'MaxMainIter' : 10,
+                                      'RelStopTol' : 0.0})
+        b = cbpdn.ConvBPDN(D, s, lmbda, opt)
+        b.solve()
+        assert(b.itstat[-1].PhaseTime is None)
+        opt['Profile'] = True
+        c = cbpdn.ConvBPDN(D, s, lmbda, opt)
+        c.solve()
+        assert(sl.fft_timer is None)
+        tph = c.itstat[-1].PhaseTime
+        assert(tph['xstep'] > 0.0 and tph['fft'] > 0.0)
+        assert(c.phasetimer.counts()['ystep'] == 10)
+        assert('xstep' in c.phase_summary())
+
+
+    def test_31(self, tmpdir):
+        N = 16
+        Nd = 5
+        M = 4
+        D = np.random.randn(Nd, Nd, M)
+        s = np.random.randn(N, N)
+        lmbda = 1e-1
+        pth = str(tmpdir.join('chkpt'))
+        opt = cbpdn.ConvBPDN.Options({'Verbose' : False, 'MaxMainIter' : 10,
+                                      'RelStopTol' : 0.0, 'AutoRho' :
+                                      {'Enabled' : True, 'Period' : 3}})
+        b = cbpdn.ConvBPDN(D, s, lmbda, opt)
+        b.solve()
+        Xb = b.solve()
+        c = cbpdn.ConvBPDN(D, s, lmbda, opt)
+        c.solve()
+        c.checkpoint(pth)
+        d = cbpdn.ConvBPDN(D, s, lmbda, opt)
+        Y = d.Y
+        d.restore(pth)
+        assert(d.Y is Y and not isinstance(d.U, np.memmap))
+        assert(d.k == 10 and len(d.itstat) == 10)
+        assert(d.rho == c.rho)
+        Xd = d.solve()
+        assert(np.linalg.norm(Xb-Xd) == 0.0)
+        assert(d.k == 20)
+
+
+    def test_32(self, tmpdir):
+        N = 16
+        Nd = 5
+        M = 4
+        D = np.random.randn(Nd, Nd, M)
+        s = np.random.randn(N, N)
+        lmbda = 1e-1
+        pth = str(tmpdir.join('chkpt'))
+        opt = cbpdn.ConvBPDN.Options({'Verbose' : False, 'MaxMainIter' : 12,
+                                      'RelStopTol' : 0.0, 'Checkpoint' :
+                                      {'Path' : pth, 'Period' : 5}})
+        b = cbpdn.ConvBPDN(D, s, lmbda, opt)
+        b.solve()
+        c = cbpdn.ConvBPDN(D, s, lmbda, opt)
+        c.restore(pth)
+        assert(c.k == 10)
+        assert(c.runtime > 0.0)
+
+
+    def test_33(self):
+        N = 16
+        Nd = 5
+        M = 4
+        D = np.random.randn(Nd, Nd, M)
+        s = np.random.randn(N, N)
+        lmbda = 1e-1
+        opt = cbpdn.ConvBPDN.Options({'Verbose' : False, 'MaxMainIter' : 20,
+                                      'RelStopTol' : 0.0, 'StatsPeriod' : 5,
+                                      'AutoRho' : {'Enabled' : True}})
+        b = cbpdn.ConvBPDN(D, s, lmbda, opt)
+        Xb = b.solve()
+        c = cbpdn.ConvBPDN(D, s, lmbda, opt)
+        snps = []
+        for snp in c.iterate(yview=True):
+            assert(snp.Y is c.Y)
+            snps.append(snp)
+        assert(len(snps) == 20 and c.k == 20)
+        assert([snp.Iter for snp in snps] == list(range(20)))
+        assert(snps[4].Stats is not None and snps[5].Stats is None)
+        assert(snps[-1].Stats.ObjFun == b.itstat[-1].ObjFun)
+        assert(np.linalg.norm(Xb - c.Y) == 0.0)
+        d = cbpdn.ConvBPDN(D, s, lmbda, opt)
+        itr = d.iterate()
+        for snp in itr:
+            if snp.Iter == 11:
+                break
+        itr.close()
+        assert(d.k == 12)
+        Xd = d.solve()
+        assert(d.k == 32)
+
+
+    def test_34(self):
+        N = 16
+        Nd = 5
+        M = 4
+        D = np.random.randn(Nd, Nd, M)
+        s = np.random.randn(N, N)
+        lmbda = [2e-1, 1e-1, 5e-2]
+        opt = cbpdn.ConvBPDN.Options({'Verbose' : False, 'MaxMainIter' : 20,
+                                      'AutoRho' : {'Enabled' : True}})
+        b = cbpdn.ConvBPDN(D, s, lmbda[0], opt)
+        Xp = b.solve_path(lmbda, sparse=True)
+        assert(len(Xp) == len(lmbda))
+        assert(Xp[0].shape == (N*N, M))
+        assert(np.array_equal(Xp[-1].toarray(), b.Y.reshape((-1, M))))
+        assert(b.lmbda == lmbda[-1])
+        U = b.U.copy()
+        b.setlmbda(lmbda[-1] / 2.0)
+        assert(sl.rrs(U / 2.0, b.U) < 1e-14)
+
+
+    def test_35(self):
+        N = 32
+        Nd = 8
+        M = 16
+        D = np.random.randn(Nd, Nd, M)
+        D /= np.sqrt(np.sum(D**2, axis=(0, 1)))
+        X0 = np.zeros((N, N, M))
+        X0[..., 0:4].flat[np.random.permutation(N*N*4)[0:20]] = \
+            np.random.randn(20)
+        s = np.sum(sl.ifftn(sl.fftn(D, (N, N), (0, 1)) *
+                            sl.fftn(X0, None, (0, 1)), None, (0, 1)).real,
+                   axis=2)
+        lmbda = 0.5
+        opt = cbpdn.ConvBPDN.Options({'Verbose' : False, 'MaxMainIter' : 500,
+                                      'RelStopTol' : 1e-5, 'rho' : 10.0,
+                                      'AutoRho' : {'Enabled' : False}})
+        b = cbpdn.ConvBPDN(D, s, lmbda, opt)
+        b.solve()
+        opt['Screening', 'Enabled'] = True
+        for pw in (False, True):
+            opt['PersistentWorkspace'] = pw
+            c = cbpdn.ConvBPDN(D, s, lmbda, opt)
+            c.solve()
+            assert(c.scrnidx is not None and c.scrnidx.size < M)
+            assert(np.all(c.Y[..., np.setdiff1d(np.arange(M),
+                                                c.scrnidx)] == 0))
+            assert(c.itstat[-1].ObjFun < (1 + 1e-4) * b.itstat[-1].ObjFun)
+        with pytest.raises(ValueError):
+            cbpdn.ConvBPDNJoint(D, s, lmbda, 1e-1, opt)
+
+
+    def test_36(self):
+        N = 16
+        Nd = 5
+        M = 4
+        K = 3
+        D = np.random.randn(Nd, Nd, M)
+        X0 = np.zeros((N, N, K, M))
+        X0.flat[np.random.permutation(X0.size)[0:3*K]] = np.random.randn(3*K)
+        s = np.sum(sl.ifftn(sl.fftn(D[:, :, np.newaxis], (N, N), (0, 1)) *
+                            sl.fftn(X0, None, (0, 1)), None, (0, 1)).real,
+                   axis=3)
+        lmbda = 1e-1
+        opt = cbpdn.ConvBPDN.Options({'Verbose' : False, 'MaxMainIter' : 500,
+                                      'RelStopTol' : 1e-5, 'rho' : 1.0,
+                                      'AutoRho' : {'Enabled' : False}})
+        b = cbpdn.ConvBPDN(D, s, lmbda, opt)
+        b.solve()
+        Xc = cbpdn.solve_parallel(D, s, lmbda, opt, nproc=2)
+        assert(Xc.shape == b.Y.shape)
+        assert(sl.rrs(b.Y, Xc) < 1e-3)
+
+
+    def test_37(self):
+        N = 64
+        Nd = 5
+        M = 8
+        D = np.random.randn(Nd, Nd, M)
+        D /= np.sqrt(np.sum(D**2, axis=(0, 1)))
+        X0 = np.zeros((N, N, M))
+        X0.flat[np.random.permutation(X0.size)[0:80]] = np.random.randn(80)
+        s = np.sum(sl.ifftn(sl.fftn(D, (N, N), (0, 1)) *
+                            sl.fftn(X0, None, (0, 1)), None, (0, 1)).real,
+                   axis=2) + 1e-2*np.random.randn(N, N)
+        lmbda = 5e-2
+        opt = cbpdn.ConvBPDN.Options({'Verbose' : False, 'MaxMainIter' : 500,
+                                      'RelStopTol' : 1e-5, 'rho' : 10.0,
+                                      'AutoRho' : {'Enabled' : False}})
+        b = cbpdn.ConvBPDN(D, s, lmbda, opt)
+        b.solve()
+        Xc, Sc = cbpdn.solve_tiled(D, s, lmbda, tilesz=32, opt=opt)
+        assert(Xc.shape == b.Y.shape)
+        assert(sl.rrs(b.Y, Xc) < 1e-1)
+        assert(sl.rrs(b.reconstruct(), Sc) < 5e-2)
+        Xd, Sd = cbpdn.solve_tiled(D, s, lmbda, tilesz=32, opt=opt, nproc=2)
+        assert(np.allclose(Xc, Xd))
+        with pytest.raises(ValueError):
+            cbpdn.solve_tiled(D, s, lmbda, tilesz=16, overlap=10, opt=opt)
+
+
+    def test_38(self):
+        N0 = 61
+        N1 = 53
+        Nd = 5
+        M = 8
+        D = np.random.randn(Nd, Nd, M)
+        D /= np.sqrt(np.sum(D**2, axis=(0, 1)))
+        X0 = np.zeros((N0, N1, M))
+        X0.flat[np.random.permutation(X0.size)[0:60]] = np.random.randn(60)
+        s = np.sum(sl.ifftn(sl.fftn(D, (N0, N1), (0, 1)) *
+                            sl.fftn(X0, None, (0, 1)), None, (0, 1)).real,
+                   axis=2)
+        lmbda = 5e-2
+        opt = cbpdn.ConvBPDN.Options({'Verbose' : False, 'MaxMainIter' : 500,
+                                      'RelStopTol' : 1e-5, 'rho' : 10.0,
+                                      'AutoRho' : {'Enabled' : False}})
+        b = cbpdn.ConvBPDN(D, s, lmbda, opt)
+        Xb = b.solve()
+        # Compare away from the boundary, where the padded and periodic
+        # boundary conditions differ
+        m = 2*Nd
+        for pm in ('zero', 'symmetric'):
+            opt['FFTPad'] = pm
+            c = cbpdn.ConvBPDN(D, s, lmbda, opt)
+            Xc = c.solve()
+            assert(c.cri.Nv == (63, 54))
+            assert(Xc.shape == Xb.shape)
+            assert(c.getcoef().shape == Xb.shape)
+            assert(c.reconstruct().shape == b.reconstruct().shape)
+            assert(sl.rrs(Xb[m:-m, m:-m], Xc[m:-m, m:-m]) < 1e-3)
+            assert(sl.rrs(b.reconstruct()[m:-m, m:-m],
+                          c.reconstruct(Xc)[m:-m, m:-m]) < 1e-3)
+            # Cropping of the coefficient maps is lossless
+            assert(np.allclose(c.reconstruct(c.getcoef()), c.reconstruct()))
+            assert(np.allclose(c.itstat[-1].ObjFun,
+                               0.5*np.sum((c.reconstruct(
+                                   c.getcoef()).squeeze() - s)**2) +
+                               lmbda*np.sum(np.abs(c.getcoef())),
+                               rtol=1e-3))
+        opt['FFTPad'] = 'Invalid'
+        with pytest.raises(ValueError):
+            cbpdn.ConvBPDN(D, s, lmbda, opt)
+        opt['FFTPad'] = 'zero'
+        with pytest.raises(ValueError):
+            cbpdn.AddMaskSim(cbpdn.ConvBPDN, D, s, np.ones(s.shape),
+                             lmbda, opt=opt)
+        gopt = cbpdn.ConvBPDNGradReg.Options({'FFTPad' : 'zero'})
+        with pytest.raises(ValueError):
+            cbpdn.ConvBPDNGradReg(D, s, lmbda, 1e-1, gopt)
+
+
+    def test_39(self):
+        N = 32
+        Nd = 8
+        M = 16
+        K = 3
+        D = np.random.randn(Nd, Nd, M)
+        D /= np.sqrt(np.sum(D**2, axis=(0, 1)))
+        X0 = np.zeros((K, N, N, M))
+        X0[..., 0:4].flat[np.random.permutation(K*N*N*4)[0:60]] = \
+            np.random.randn(60)
+        s = np.sum(sl.ifftn(sl.fftn(D, (N, N), (0, 1)) *
+                            sl.fftn(X0, None, (1, 2)), None, (1, 2)).real,
+                   axis=3)
+        Dc = np.random.randn(Nd, Nd, 3, M)
+        sc = np.random.randn(K, N, N, 3)
+        lmbda = 0.5
+        for d, sig, scrn in ((D, s, False), (D, s, True), (Dc, sc, False)):
+            # The default AutoRho option is retained, so that the
+            # penalty parameter is adapted to each signal, except when
+            # screening is tested since it is only effective here for a
+            # fixed penalty parameter
+            opt = cbpdn.ConvBPDN.Options(
+                {'Verbose' : False, 'MaxMainIter' : 500,
+                 'RelStopTol' : 1e-5, 'Screening' : {'Enabled' : scrn}})
+            if scrn:
+                opt['rho'] = 10.0
+                opt['AutoRho', 'Enabled'] = False
+            b = cbpdn.ConvBPDN(d, sig[0], lmbda, opt)
+            Df = b.Df
+            rho0 = b.rho
+            for k in range(K):
+                if k > 0:
+                    assert(scrn or b.rho != rho0)
+                    b.setsignal(sig[k])
+                    assert(b.k == 0)
+                    assert(b.rho == rho0)
+                    assert(b.Df is Df)
+                    assert(b.scrnidx is None)
+                Xb = b.solve()
+                if scrn:
+                    assert(b.scrnidx is not None)
+                c = cbpdn.ConvBPDN(d, sig[k], lmbda, opt)
+                Xc = c.solve()
+                assert(np.allclose(Xb, Xc))
+                assert(len(b.getitstat().Iter) == len(c.getitstat().Iter))
+        with pytest.raises(ValueError):
+            b.setsignal(sig[0, 0:N//2])
@@ -117,3 +117,74 @@ class TestSet01(object):
         assert(c.X.dtype == dt)
         assert(c.Y.dtype == dt)
         assert(c.U.dtype == dt)
+
+
+    def test_07(self):
+        N = 16
+        M = 4
+        Nd = 8
+        X = np.random.randn(N, N, 1, 2, M)
+        S = np.random.randn(N, N, 2)
+        opt = ccmod.ConvCnstrMOD.Options({'Verbose' : False,
+                                          'MaxMainIter' : 20})
+        b = ccmod.ConvCnstrMOD(X, S, (Nd, Nd, M), opt=opt)
+        b.solve()
+        opt['PersistentWorkspace'] = True
+        c = ccmod.ConvCnstrMOD(X, S, (Nd, Nd, M), opt=opt)
+        c.solve()
+        assert(np.linalg.norm(b.getdict() - c.getdict()) < 1e-12)
+
+
+    def test_08(self):
+        N = 16
+        M = 4
+        Nd = 8
+        X = np.random.randn(N, N, 1, 4, M)
+        S = np.random.randn(N, N, 4)
+        opt = ccmod.ConvCnstrMOD.Options({'Verbose' : False,
+                        'MaxMainIter' : 20, 'LinSolveCheck' : True,
+                        'AutoRho' : {'Enabled' : True}})
+        c = ccmod.ConvCnstrMOD(X, S, (Nd, Nd, M), opt=opt)
+        c.solve()
+        assert(np.unique(c.getitstat().Rho).size > 1)
+        assert(max(c.getitstat().XSlvRelRes) < 1e-10)
+
+
+    def test_09(self):
+        N = 16
+        M = 4
+        Nd = 8
+        X = np.random.randn(N, N, 1, 8, M)
+        S = np.random.randn(N, N, 8)
+        opt = ccmod.ConvCnstrMOD.Options({'Verbose' : False,
+                        'MaxMainIter' : 20, 'LinSolveCheck' : True,
+                        'AutoRho' : {'Enabled' : True}})
+        b = ccmod.ConvCnstrMOD(X, S, (Nd, Nd, M), opt=opt)
+        b.solve()
+        opt['LinSolve'] = 'CHO'
+        c = ccmod.ConvCnstrMOD(X, S, (Nd, Nd, M), opt=opt)
+        c.solve()
+        assert(max(c.getitstat().XSlvRelRes) < 1e-10)
+        assert(np.linalg.norm(b.getdict() - c.getdict()) < 1e-10)
+
+
+    def test_10(self, tmpdir):
+        N = 16
+        M = 4
+        Nd = 8
+        X = np.random.randn(N, N, 1, 8, M)
+        S = np.random.randn(N, N, 8)
+        pth = str(tmpdir.join('chkpt'))
+        opt = ccmod.ConvCnstrMOD.Options({'Verbose' : False,
+                        'MaxMainIter' : 10, 'RelStopTol' : 0.0,
+                        'LinSolve' : 'CG', 'CG' : {'StopTol' : 1e-3}})
+        b = ccmod.ConvCnstrMOD(X, S, (Nd, Nd, M), opt=opt)
+        b.solve()
+        Db = b.solve()
+        c = ccmod.ConvCnstrMOD(X, S, (Nd, Nd, M), opt=opt)
+        c.solve()
+        c.checkpoint(pth)
+        d = ccmod.ConvCnstrMOD(X, S, (Nd, Nd, M), opt=opt)
+        d.restore(pth)
+        Dd = d.solve()
+        assert(np.linalg.norm(Db - Dd) == 0.0)
@@ -93,3 +93,38 @@ class TestSet01(object):
         assert(b.Y.dtype == dt)
         assert(b.U.dtype == dt)
 
+
+
+    def test_06(self):
+        N = 16
+        M = 4
+        K = 8
+        X = np.random.randn(M, K)
+        S = np.random.randn(N, K)
+        opt = cmod.CnstrMOD.Options({'Verbose' : False, 'MaxMainIter' : 50,
+                                     'AutoRho' : {'Enabled' : True}})
+        b = cmod.CnstrMOD(X, S, opt=opt)
+        Db = b.solve()
+        opt['LinSolve'] = 'EIG'
+        c = cmod.CnstrMOD(X, S, opt=opt)
+        Dc = c.solve()
+        assert(np.linalg.norm(Db-Dc) < 1e-10)
+
+
+    def test_07(self):
+        N = 16
+        M = 4
+        K = 8
+        X = np.random.randn(M, K)
+        S = np.random.randn(N, K)
+        opt = cmod.CnstrMOD.Options({'Verbose' : False, 'MaxMainIter' : 50,
+                                     'LinSolve' : 'LU'})
+        b = cmod.CnstrMOD(X, S, opt=opt)
+        Db = b.solve()
+        opt['LinSolve'] = 'CHO'
+        c = cmod.CnstrMOD(X, S, opt=opt)
+        Dc = c.solve()
+        assert(np.linalg.norm(Db-Dc) < 1e-10)
+        opt['LinSolve'] = 'QR'
+        with pytest.raises(ValueError):
+            cmod.CnstrMOD(X, S, opt=opt)
@@ -125,6 +125,18 @@ class TestSet01(object):
             assert(0)
 
 
+    def test_10(self):
+        lmbda = 3
+        A = np.random.randn(5, 5)
+        opt = tvl1.TVL1Deconv.Options({'MaxMainIter' : 20})
+        b = tvl1.TVL1Deconv(A, self.D, lmbda, opt)
+        Xb = b.solve()
+        opt['PersistentWorkspace'] = True
+        c = tvl1.TVL1Deconv(A, self.D, lmbda, opt)
+        Xc = c.solve()
+        assert(np.linalg.norm(Xb-Xc) < 1e-12)
+
+
 
 
 class TestSet02(object):
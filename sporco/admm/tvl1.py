@@ -427,11 +427,17 @@ class TVL1Deconv(admm.ADMM):
         X step solver
 
         ``TVWeight`` : TV term weight matrix
+
+        ``PersistentWorkspace`` : Flag indicating whether the arrays
+        computed in the X and Y steps should be stored in persistent
+        byte-aligned working arrays, allocated on initialisation,
+        instead of being allocated on every iteration
         """
 
         defaults = copy.deepcopy(admm.ADMM.Options.defaults)
         defaults.update({'gEvalY' : True, 'RelaxParam' : 1.8,
-                         'LinSolveCheck' : False, 'TVWeight' : 1.0})
+                         'LinSolveCheck' : False, 'TVWeight' : 1.0,
+                         'PersistentWorkspace' : False})
         defaults['AutoRho'].update({'Enabled' : False, 'Period' : 1,
                                     'AutoScaling' : True, 'Scaling' : 1000.0,
                                     'RsdlRatio' : 1.2})
@@ -509,6 +515,20 @@ class TVL1Deconv(admm.ADMM):
         self.GAf = np.concatenate((self.Gf, self.Af[...,np.newaxis]),
                                   axis=self.Gf.ndim-1)
 
+        if self.opt['PersistentWorkspace']:
+            # Initialise byte-aligned working arrays and cache the
+            # components of the X step that do not vary between
+            # iterations
+            cdtype = sl.complex_dtype(self.dtype)
+            yfshp = list(yshape)
+            yfshp[axes[-1]] = yfshp[axes[-1]]//2 + 1
+            self.YU = sl.pyfftw_empty_aligned(yshape, dtype=self.dtype)
+            self.YUf = sl.pyfftw_empty_aligned(yfshp, dtype=cdtype)
+            self.Xf = sl.pyfftw_empty_aligned(yfshp[0:-1], dtype=cdtype)
+            self.X = sl.pyfftw_empty_aligned(S.shape, dtype=self.dtype)
+            self.GHAf = np.conj(self.GAf)
+            self.AHAGHGf = self.AHAf + self.GHGf
+
         # Increment `runtime` to reflect object initialisation
         # time. The timer object is reset to avoid double-counting of
         # elapsed time if a similar increment is applied in a derived
@@ -537,10 +557,21 @@ class TVL1Deconv(admm.ADMM):
     def xstep(self):
         """Minimise Augmented Lagrangian with respect to x."""
 
-        b = self.AHSf + np.sum(np.conj(self.GAf) *
-            sl.rfftn(self.Y-self.U, axes=self.axes), axis=self.Y.ndim-1)
-        self.Xf = b / (self.AHAf + self.GHGf)
-        self.X = sl.irfftn(self.Xf, None, axes=self.axes)
+        if self.opt['PersistentWorkspace']:
+            np.subtract(self.Y, self.U, out=self.YU)
+            sl.rfftn(self.YU, axes=self.axes, out=self.YUf)
+            self.YUf *= self.GHAf
+            b = np.sum(self.YUf, axis=self.Y.ndim-1, out=self.Xf)
+            b += self.AHSf
+            if self.opt['LinSolveCheck']:
+                b = b.copy()
+            self.Xf /= self.AHAGHGf
+            sl.irfftn(self.Xf, None, axes=self.axes, out=self.X)
+        else:
+            b = self.AHSf + np.sum(np.conj(self.GAf) *
+                sl.rfftn(self.Y-self.U, axes=self.axes), axis=self.Y.ndim-1)
+            self.Xf = b / (self.AHAf + self.GHGf)
+            self.X = sl.irfftn(self.Xf, None, axes=self.axes)
 
         if self.opt['LinSolveCheck']:
             ax = (self.AHAf + self.GHGf)*self.Xf
@@ -553,10 +584,18 @@ class TVL1Deconv(admm.ADMM):
     def ystep(self):
         """Minimise Augmented Lagrangian with respect to y."""
 
-        self.Y[...,0:-1] = sl.shrink2(self.AX[...,0:-1] + self.U[...,0:-1],
-                                      (self.lmbda/self.rho) * self.Wtvna)
-        self.Y[...,-1] = sl.shrink1(self.AX[...,-1] + self.U[...,-1] - self.S,
-                                (1.0 / self.rho))
+        if self.opt['PersistentWorkspace']:
+            np.add(self.AX, self.U, out=self.YU)
+            self.YU[...,-1] -= self.S
+            sl.shrink2(self.YU[...,0:-1], (self.lmbda/self.rho) * self.Wtvna,
+                       out=self.Y[...,0:-1])
+            sl.shrink1(self.YU[...,-1], (1.0 / self.rho), out=self.Y[...,-1])
+        else:
+            self.Y[...,0:-1] = sl.shrink2(self.AX[...,0:-1] +
+                                          self.U[...,0:-1],
+                                          (self.lmbda/self.rho) * self.Wtvna)
+            self.Y[...,-1] = sl.shrink1(self.AX[...,-1] + self.U[...,-1] -
+                                        self.S, (1.0 / self.rho))
 
 
 
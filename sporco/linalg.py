@@ -13,10 +13,11 @@ from builtins import range
 import numpy as np
 from scipy import linalg
 from scipy import fftpack
-from scipy.sparse.linalg import LinearOperator
-from scipy.sparse.linalg import cg
 import multiprocessing
-import pyfftw
+import os
+import pickle
+import atexit
+import importlib
 try:
     import numexpr as ne
 except ImportError:
@@ -27,12 +28,191 @@ else:
 __author__ = """Brendt Wohlberg <brendt@ieee.org>"""
 
 
-pyfftw.interfaces.cache.enable()
-pyfftw.interfaces.cache.set_keepalive_time(300)
 
 pyfftw_threads = multiprocessing.cpu_count()
 """Global variable setting the number of threads used in :mod:`pyfftw`
-computations"""
+computations (also used as the number of workers for the :mod:`scipy.fft`
+FFT backend)"""
+
+pyfftw_plans = None
+"""Global variable holding an optional :class:`FFTWPlanManager` object.
+If it is not None, :func:`fftn`, :func:`ifftn`, :func:`rfftn`, and
+:func:`irfftn` execute explicitly planned :class:`pyfftw.FFTW` objects
+managed by this object instead of calling the functions of the selected
+FFT backend"""
+
+fft_timer = None
+"""Global variable holding an optional :class:`.util.PhaseTimer` object.
+If it is not None, the time spent in :func:`fftn`, :func:`ifftn`,
+:func:`rfftn`, and :func:`irfftn` is accumulated in this object under
+the label ``fft``"""
+
+
+
+def _load_pyfftw():
+    """Load the :mod:`pyfftw` FFT backend."""
+
+    import pyfftw
+    import pyfftw.interfaces.numpy_fft
+    pyfftw.interfaces.cache.enable()
+    pyfftw.interfaces.cache.set_keepalive_time(300)
+    nfft = pyfftw.interfaces.numpy_fft
+
+    def wrap(fn):
+        return lambda a, s, axes: fn(a, s=s, axes=axes, overwrite_input=False,
+                                     planner_effort='FFTW_MEASURE',
+                                     threads=pyfftw_threads)
+
+    return {'fftn': wrap(nfft.fftn), 'ifftn': wrap(nfft.ifftn),
+            'rfftn': wrap(nfft.rfftn), 'irfftn': wrap(nfft.irfftn),
+            'empty_aligned': pyfftw.empty_aligned}
+
+
+
+def _load_scipy():
+    """Load the :mod:`scipy.fft` FFT backend."""
+
+    sfft = importlib.import_module('scipy.fft')
+
+    def wrap(fn):
+        return lambda a, s, axes: fn(a, s=s, axes=axes,
+                                     workers=pyfftw_threads)
+
+    def wrapdct(fn):
+        return lambda x, axes: fn(x, type=2, axes=axes, norm='ortho',
+                                  workers=pyfftw_threads)
+
+    return {'fftn': wrap(sfft.fftn), 'ifftn': wrap(sfft.ifftn),
+            'rfftn': wrap(sfft.rfftn), 'irfftn': wrap(sfft.irfftn),
+            'dctii': wrapdct(sfft.dctn), 'idctii': wrapdct(sfft.idctn)}
+
+
+
+def _load_numpy():
+    """Load the :mod:`numpy.fft` FFT backend."""
+
+    def wrap(fn):
+        return lambda a, s, axes: fn(a, s=s, axes=axes)
+
+    return {'fftn': wrap(np.fft.fftn), 'ifftn': wrap(np.fft.ifftn),
+            'rfftn': wrap(np.fft.rfftn), 'irfftn': wrap(np.fft.irfftn)}
+
+
+
+fft_backends = {'pyfftw': _load_pyfftw, 'scipy': _load_scipy,
+                'numpy': _load_numpy}
+"""Registry of available FFT backends. Each entry maps a backend name to a
+function that imports the corresponding library and returns a dict mapping
+the names 'fftn', 'ifftn', 'rfftn', and 'irfftn' to functions with
+signature ``(a, s, axes)``. The dict may also include entries 'dctii'
+and 'idctii' (signature ``(x, axes)``) and 'empty_aligned' (with the
+same signature as :func:`pyfftw.empty_aligned`). Additional backends
+can be added via :func:`register_fft_backend`."""
+
+_fft_backend = {'name': None, 'funcs': None}
+
+
+
+def _default_fft_backend():
+    """Determine the default FFT backend. The backend specified by the
+    ``SPORCO_FFT_BACKEND`` environment variable is used if it is set,
+    otherwise the first available of :mod:`pyfftw`, :mod:`scipy.fft`,
+    and :mod:`numpy.fft` is selected. Availability is determined
+    without importing the corresponding module.
+    """
+
+    name = os.environ.get('SPORCO_FFT_BACKEND')
+    if name:
+        return name
+    try:
+        from importlib.util import find_spec
+    except ImportError:
+        # Python 2 does not support find_spec
+        try:
+            import pyfftw
+        except ImportError:
+            return 'numpy'
+        else:
+            return 'pyfftw'
+    if find_spec('pyfftw') is not None:
+        return 'pyfftw'
+    try:
+        if find_spec('scipy.fft') is not None:
+            return 'scipy'
+    except ImportError:
+        pass
+    return 'numpy'
+
+
+
+def register_fft_backend(name, loader):
+    """
+    Register an FFT backend.
+
+    Parameters
+    ----------
+    name : string
+      Backend name
+    loader : function
+      Function without arguments that imports the backend library and
+      returns a dict of backend functions (see :data:`fft_backends`)
+    """
+
+    fft_backends[name] = loader
+    if _fft_backend['name'] == name:
+        _fft_backend['funcs'] = None
+
+
+
+def set_fft_backend(name=None):
+    """
+    Select the FFT backend used by :func:`fftn`, :func:`ifftn`,
+    :func:`rfftn`, :func:`irfftn`, :func:`dctii`, and :func:`idctii`.
+    The backend library is imported immediately, so that an exception is
+    raised if it is not available.
+
+    Parameters
+    ----------
+    name : string or None, optional (default None)
+      Backend name, one of 'pyfftw', 'scipy', and 'numpy', or the name of
+      a backend registered via :func:`register_fft_backend`. If None, the
+      default backend is selected.
+    """
+
+    if name is None:
+        name = _default_fft_backend()
+    if name not in fft_backends:
+        raise ValueError("FFT backend '%s' not recognised" % name)
+    funcs = fft_backends[name]()
+    _fft_backend['name'] = name
+    _fft_backend['funcs'] = funcs
+
+
+
+def get_fft_backend():
+    """
+    Get the name of the selected FFT backend.
+
+    Returns
+    -------
+    name : string
+      Backend name
+    """
+
+    if _fft_backend['name'] is None:
+        return _default_fft_backend()
+    return _fft_backend['name']
+
+
+
+def _fft_funcs():
+    """Get the dict of functions of the selected FFT backend, loading the
+    backend if necessary."""
+
+    if _fft_backend['funcs'] is None:
+        set_fft_backend(_fft_backend['name'])
+    return _fft_backend['funcs']
+
 
 
 def complex_dtype(dtype):
@@ -58,7 +238,9 @@ def complex_dtype(dtype):
 def pyfftw_empty_aligned(shape, dtype, order='C', n=None):
     """
     Construct an empty byte-aligned array for efficient use by :mod:`pyfftw`.
-    This function is a wrapper for :func:`pyfftw.empty_aligned`
+    This function is a wrapper for :func:`pyfftw.empty_aligned` when the
+    :mod:`pyfftw` FFT backend is selected, and otherwise constructs an
+    array with the same alignment from a :mod:`numpy` buffer.
 
     Parameters
     ----------
@@ -75,15 +257,291 @@ def pyfftw_empty_aligned(shape, dtype, order='C', n=None):
       Empty array with required byte-alignment
     """
 
-    return pyfftw.empty_aligned(shape, dtype, order, n)
+    funcs = _fft_funcs()
+    if 'empty_aligned' in funcs:
+        return funcs['empty_aligned'](shape, dtype, order, n)
+    if n is None:
+        n = 64
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    buf = np.empty(nbytes + n, dtype=np.uint8)
+    ofst = (-buf.ctypes.data) % n
+    return buf[ofst:ofst+nbytes].view(dtype).reshape(shape, order=order)
+
+
+
+class FFTWPlanManager(object):
+    """
+    Manager for explicitly planned :class:`pyfftw.FFTW` objects, with
+    support for saving and loading FFTW wisdom to and from a file.
+
+    Plans are constructed on first use and cached, keyed by transform
+    type, input shape and dtype, transform shape and axes, and number of
+    threads. Each plan has its own byte-aligned input and output arrays,
+    so that subsequent transforms of arrays with the same layout require
+    only a copy into the input array and execution of the plan. If a
+    wisdom file is specified, the FFTW wisdom accumulated by planning is
+    imported from it on initialisation, and can be written back to it by
+    :meth:`save_wisdom`, so that a new process does not have to repeat
+    the planning computations performed by an earlier one.
+
+    A plan manager is used by the FFT functions in this module when it
+    is assigned to the module variable :data:`pyfftw_plans`, e.g.
 
+    ::
 
+      sporco.linalg.pyfftw_plans = FFTWPlanManager('fftw_wisdom.pkl',
+                                                   autosave=True)
 
-def fftn(a, s=None, axes=None):
+    Note that the cached plans share input and output arrays, so that a
+    single manager object should not be used concurrently from multiple
+    threads.
+    """
+
+    kinds = ('fftn', 'ifftn', 'rfftn', 'irfftn')
+    """Supported transform types"""
+
+
+    def __init__(self, wisdom=None, effort='FFTW_MEASURE', threads=None,
+                 autosave=False):
+        """
+        Initialise a FFTWPlanManager object.
+
+        Parameters
+        ----------
+        wisdom : string or None, optional (default None)
+          Path of wisdom file. If the file exists, its content is
+          imported on initialisation.
+        effort : string, optional (default 'FFTW_MEASURE')
+          FFTW planner effort flag
+        threads : int or None, optional (default None)
+          Number of threads used by the planned transforms. If None,
+          the value of :data:`pyfftw_threads` at the time of planning
+          is used.
+        autosave : bool, optional (default False)
+          Flag indicating whether the accumulated wisdom should be
+          written to the wisdom file on interpreter exit
+        """
+
+        self.wisdom = wisdom
+        self.effort = effort
+        self.threads = threads
+        self.plans = {}
+        if wisdom is not None and os.path.isfile(wisdom):
+            self.load_wisdom(wisdom)
+        if autosave and wisdom is not None:
+            atexit.register(self.save_wisdom)
+
+
+
+    def load_wisdom(self, path=None):
+        """
+        Import FFTW wisdom from a file written by :meth:`save_wisdom`.
+
+        Parameters
+        ----------
+        path : string or None, optional (default None)
+          Path of wisdom file. If None, the path specified on
+          initialisation is used.
+
+        Returns
+        -------
+        flg : tuple of bool
+          Flags indicating whether the double, single, and long double
+          precision wisdom was successfully imported
+        """
+
+        import pyfftw
+        if path is None:
+            path = self.wisdom
+        with open(path, 'rb') as f:
+            wsdm = pickle.load(f)
+        return pyfftw.import_wisdom(wsdm)
+
+
+
+    def save_wisdom(self, path=None):
+        """
+        Export the current FFTW wisdom to a file.
+
+        Parameters
+        ----------
+        path : string or None, optional (default None)
+          Path of wisdom file. If None, the path specified on
+          initialisation is used.
+        """
+
+        import pyfftw
+        if path is None:
+            path = self.wisdom
+        # Write to a temporary file and rename so that processes sharing
+        # a wisdom file never see a partially written file
+        tmp = '%s.%d.tmp' % (path, os.getpid())
+        with open(tmp, 'wb') as f:
+            pickle.dump(pyfftw.export_wisdom(), f, protocol=2)
+        os.rename(tmp, path)
+
+
+
+    def clear(self):
+        """Discard all cached plans."""
+
+        self.plans = {}
+
+
+
+    def plan(self, kind, shape, dtype, s=None, axes=None):
+        """
+        Get the plan for a specified transform, constructing it if it is
+        not already cached.
+
+        Parameters
+        ----------
+        kind : string
+          Transform type, one of 'fftn', 'ifftn', 'rfftn', or 'irfftn'
+        shape : tuple of ints
+          Shape of array to be transformed
+        dtype : dtype
+          Dtype of array to be transformed
+        s : sequence of ints, optional (default None)
+          Shape of the output along each transform axis, with the same
+          interpretation as in the corresponding :mod:`numpy.fft` function
+        axes : sequence of ints, optional (default None)
+          Axes over which to compute the transform
+
+        Returns
+        -------
+        fftw : :class:`pyfftw.FFTW` object
+          Planned transform object
+        """
+
+        if kind not in self.kinds:
+            raise ValueError("Transform type '%s' not recognised" % kind)
+        shape = tuple(shape)
+        ndim = len(shape)
+        if axes is None:
+            if s is None:
+                axes = tuple(range(ndim))
+            else:
+                axes = tuple(range(ndim - len(s), ndim))
+        else:
+            axes = tuple([ax % ndim for ax in axes])
+        if s is None:
+            s = [shape[ax] for ax in axes]
+            if kind == 'irfftn':
+                s[-1] = 2*(s[-1] - 1)
+        s = tuple(s)
+        threads = pyfftw_threads if self.threads is None else self.threads
+        key = (kind, shape, np.dtype(dtype).str, s, axes, threads)
+
+        if key not in self.plans:
+            import pyfftw
+            # Determine the real and complex dtypes of the transform,
+            # promoting dtypes not supported by FFTW to double precision
+            rdtype = np.zeros(1, dtype).real.dtype
+            if rdtype not in (np.float32, np.float64, np.longdouble):
+                rdtype = np.dtype(np.float64)
+            cdtype = complex_dtype(rdtype)
+            # Determine input and output array shapes
+            ishp = list(shape)
+            for n, ax in enumerate(axes):
+                ishp[ax] = s[n]
+            oshp = list(ishp)
+            if kind == 'rfftn':
+                oshp[axes[-1]] = s[-1]//2 + 1
+            elif kind == 'irfftn':
+                ishp[axes[-1]] = s[-1]//2 + 1
+            idtype = rdtype if kind == 'rfftn' else cdtype
+            odtype = rdtype if kind == 'irfftn' else cdtype
+            direction = 'FFTW_BACKWARD' if kind in ('ifftn', 'irfftn') \
+                        else 'FFTW_FORWARD'
+            ain = pyfftw.empty_aligned(ishp, dtype=idtype)
+            aout = pyfftw.empty_aligned(oshp, dtype=odtype)
+            self.plans[key] = pyfftw.FFTW(ain, aout, axes=axes,
+                                          direction=direction,
+                                          flags=(self.effort,
+                                                 'FFTW_DESTROY_INPUT'),
+                                          threads=threads)
+
+        return self.plans[key]
+
+
+
+    def transform(self, kind, a, s=None, axes=None, out=None):
+        """
+        Compute a transform using the corresponding cached plan.
+
+        Parameters
+        ----------
+        kind : string
+          Transform type, one of 'fftn', 'ifftn', 'rfftn', or 'irfftn'
+        a : array_like
+          Input array
+        s : sequence of ints, optional (default None)
+          Shape of the output along each transform axis (input is cropped
+          or zero-padded to match).
+        axes : sequence of ints, optional (default None)
+          Axes over which to compute the transform
+        out : ndarray, optional (default None)
+          Array in which the result is stored. If None, a new array is
+          allocated.
+
+        Returns
+        -------
+        af : ndarray
+          Transform of input array
+        """
+
+        a = np.asarray(a)
+        fftw = self.plan(kind, a.shape, a.dtype, s, axes)
+        ain = fftw.input_array
+        if ain.shape == a.shape:
+            ain[...] = a
+        else:
+            # Crop or zero-pad input to the shape of the plan input array
+            slc = tuple([slice(0, min(n, m)) for n, m in
+                         zip(a.shape, ain.shape)])
+            ain[...] = 0
+            ain[slc] = a[slc]
+        fftw()
+        if out is None:
+            return fftw.output_array.copy()
+        out[...] = fftw.output_array
+        return out
+
+
+
+
+def _fft_dispatch(kind, a, s, axes, out):
+    """Compute an FFT via the plan manager :data:`pyfftw_plans` if it is
+    set, or otherwise via the selected FFT backend. Since the backend
+    functions do not support output arrays, a result computed by a
+    backend is copied into `out` if it is not None; a plan manager
+    writes the result into `out` without any intermediate allocation.
+    """
+
+    if fft_timer is not None:
+        fft_timer.start('fft')
+    if pyfftw_plans is not None:
+        af = pyfftw_plans.transform(kind, a, s=s, axes=axes, out=out)
+    else:
+        af = _fft_funcs()[kind](a, s, axes)
+        if out is not None:
+            out[...] = af
+            af = out
+    if fft_timer is not None:
+        fft_timer.stop('fft')
+    return af
+
+
+
+def fftn(a, s=None, axes=None, out=None):
     """
     Compute the multi-dimensional discrete Fourier transform. This function
-    is a wrapper for :func:`pyfftw.interfaces.numpy_fft.fftn`,
-    with an interface similar to that of :func:`numpy.fft.fftn`.
+    is a wrapper for the corresponding function of the selected FFT backend
+    (see :func:`set_fft_backend`), by default
+    :func:`pyfftw.interfaces.numpy_fft.fftn`, with an interface similar to
+    that of :func:`numpy.fft.fftn`.
 
     Parameters
     ----------
@@ -94,6 +552,9 @@ def fftn(a, s=None, axes=None):
       to match).
     axes : sequence of ints, optional (default None)
       Axes over which to compute the DFT.
+    out : ndarray, optional (default None)
+      Array in which the result is stored. If None, a new array is
+      allocated.
 
     Returns
     -------
@@ -101,17 +562,17 @@ def fftn(a, s=None, axes=None):
       DFT of input array
     """
 
-    return pyfftw.interfaces.numpy_fft.fftn(a, s=s, axes=axes,
-                    overwrite_input=False, planner_effort='FFTW_MEASURE',
-                    threads=pyfftw_threads)
+    return _fft_dispatch('fftn', a, s, axes, out)
 
 
 
-def ifftn(a, s=None, axes=None):
+def ifftn(a, s=None, axes=None, out=None):
     """
     Compute the multi-dimensional inverse discrete Fourier transform.
-    This function is a wrapper for :func:`pyfftw.interfaces.numpy_fft.ifftn`,
-    with an interface similar to that of :func:`numpy.fft.ifftn`.
+    This function is a wrapper for the corresponding function of the
+    selected FFT backend (see :func:`set_fft_backend`), by default
+    :func:`pyfftw.interfaces.numpy_fft.ifftn`, with an interface similar to
+    that of :func:`numpy.fft.ifftn`.
 
     Parameters
     ----------
@@ -122,6 +583,9 @@ def ifftn(a, s=None, axes=None):
       to match).
     axes : sequence of ints, optional (default None)
       Axes over which to compute the inverse DFT.
+    out : ndarray, optional (default None)
+      Array in which the result is stored. If None, a new array is
+      allocated.
 
     Returns
     -------
@@ -129,17 +593,17 @@ def ifftn(a, s=None, axes=None):
       Inverse DFT of input array
     """
 
-    return pyfftw.interfaces.numpy_fft.ifftn(a, s=s, axes=axes,
-                    overwrite_input=False, planner_effort='FFTW_MEASURE',
-                    threads=pyfftw_threads)
+    return _fft_dispatch('ifftn', a, s, axes, out)
 
 
 
-def rfftn(a, s=None, axes=None):
+def rfftn(a, s=None, axes=None, out=None):
     """
     Compute the multi-dimensional discrete Fourier transform for real input.
-    This function is a wrapper for :func:`pyfftw.interfaces.numpy_fft.rfftn`,
-    with an interface similar to that of :func:`numpy.fft.rfftn`.
+    This function is a wrapper for the corresponding function of the
+    selected FFT backend (see :func:`set_fft_backend`), by default
+    :func:`pyfftw.interfaces.numpy_fft.rfftn`, with an interface similar to
+    that of :func:`numpy.fft.rfftn`.
 
     Parameters
     ----------
@@ -150,6 +614,9 @@ def rfftn(a, s=None, axes=None):
       to match).
     axes : sequence of ints, optional (default None)
       Axes over which to compute the DFT.
+    out : ndarray, optional (default None)
+      Array in which the result is stored. If None, a new array is
+      allocated.
 
     Returns
     -------
@@ -157,18 +624,17 @@ def rfftn(a, s=None, axes=None):
       DFT of input array
     """
 
-    return pyfftw.interfaces.numpy_fft.rfftn(a, s=s, axes=axes,
-                    overwrite_input=False, planner_effort='FFTW_MEASURE',
-                    threads=pyfftw_threads)
+    return _fft_dispatch('rfftn', a, s, axes, out)
 
 
 
-def irfftn(a, s=None, axes=None):
+def irfftn(a, s=None, axes=None, out=None):
     """
     Compute the inverse of the multi-dimensional discrete Fourier transform
-    for real input. This function is a wrapper for
-    :func:`pyfftw.interfaces.numpy_fft.irfftn`, with an interface similar to
-    that of :func:`numpy.fft.irfftn`.
+    for real input. This function is a wrapper for the corresponding
+    function of the selected FFT backend (see :func:`set_fft_backend`), by
+    default :func:`pyfftw.interfaces.numpy_fft.irfftn`, with an interface
+    similar to that of :func:`numpy.fft.irfftn`.
 
     Parameters
     ----------
@@ -179,6 +645,9 @@ def irfftn(a, s=None, axes=None):
       to match).
     axes : sequence of ints, optional (default None)
       Axes over which to compute the inverse DFT.
+    out : ndarray, optional (default None)
+      Array in which the result is stored. If None, a new array is
+      allocated.
 
     Returns
     -------
@@ -186,18 +655,17 @@ def irfftn(a, s=None, axes=None):
       Inverse DFT of input array
     """
 
-    return pyfftw.interfaces.numpy_fft.irfftn(a, s=s, axes=axes,
-                    overwrite_input=False, planner_effort='FFTW_MEASURE',
-                    threads=pyfftw_threads)
+    return _fft_dispatch('irfftn', a, s, axes, out)
 
 
 
 def dctii(x, axes=None):
     """
     Compute a multi-dimensional DCT-II over specified array axes. This
-    function is implemented by calling the one-dimensional DCT-II
-    :func:`scipy.fftpack.dct` with normalization mode 'ortho' for each
-    of the specified axes.
+    function is implemented by calling :func:`scipy.fft.dctn` when the
+    :mod:`scipy.fft` FFT backend is selected, and otherwise by calling the
+    one-dimensional DCT-II :func:`scipy.fftpack.dct` with normalization
+    mode 'ortho' for each of the specified axes.
 
     Parameters
     ----------
@@ -214,6 +682,9 @@ def dctii(x, axes=None):
 
     if axes is None:
         axes = list(range(x.ndim))
+    funcs = _fft_funcs()
+    if 'dctii' in funcs:
+        return funcs['dctii'](x, axes)
     for ax in axes:
         x = fftpack.dct(x, type=2, axis=ax, norm='ortho')
     return x
@@ -223,9 +694,10 @@ def dctii(x, axes=None):
 def idctii(x, axes=None):
     """
     Compute a multi-dimensional inverse DCT-II over specified array axes.
-    This function is implemented by calling the one-dimensional inverse
-    DCT-II :func:`scipy.fftpack.idct` with normalization mode 'ortho'
-    for each of the specified axes.
+    This function is implemented by calling :func:`scipy.fft.idctn` when
+    the :mod:`scipy.fft` FFT backend is selected, and otherwise by calling
+    the one-dimensional inverse DCT-II :func:`scipy.fftpack.idct` with
+    normalization mode 'ortho' for each of the specified axes.
 
     Parameters
     ----------
@@ -242,13 +714,45 @@ def idctii(x, axes=None):
 
     if axes is None:
         axes = list(range(x.ndim))
+    funcs = _fft_funcs()
+    if 'idctii' in funcs:
+        return funcs['idctii'](x, axes)
     for ax in axes[::-1]:
         x = fftpack.idct(x, type=2, axis=ax, norm='ortho')
     return x
 
 
 
-def solvedbi_sm(ah, rho, b, c=None, axis=4):
+def next_fast_len(n):
+    """
+    Compute the smallest integer not less than `n` that has no prime
+    factors other than 2, 3, 5, and 7, which is a size for which the
+    FFT is efficient.
+
+    Parameters
+    ----------
+    n : int
+      Minimum size
+
+    Returns
+    -------
+    m : int
+      Smallest 7-smooth integer not less than `n`
+    """
+
+    m = max(int(n), 1)
+    while True:
+        r = m
+        for p in (2, 3, 5, 7):
+            while r % p == 0:
+                r //= p
+        if r == 1:
+            return m
+        m += 1
+
+
+
+def solvedbi_sm(ah, rho, b, c=None, axis=4, out=None):
     """
     Solve a diagonal block linear system with a scaled identity term
     using the Sherman-Morrison equation.
@@ -276,6 +780,9 @@ def solvedbi_sm(ah, rho, b, c=None, axis=4):
       :func:`solvedbi_sm_c` and cached for re-use.
     axis : int, optional (default 4)
       Axis along which to solve the linear system
+    out : ndarray, optional (default None)
+      Array, which may not share memory with `b`, in which the solution
+      is stored. If None, a new array is allocated.
 
     Returns
     -------
@@ -288,9 +795,15 @@ def solvedbi_sm(ah, rho, b, c=None, axis=4):
         c = solvedbi_sm_c(ah, a, rho, axis)
     if have_numexpr:
         cb = np.sum(c * b, axis=axis, keepdims=True)
-        return ne.evaluate('(b - (a * cb)) / rho')
-    else:
+        return ne.evaluate('(b - (a * cb)) / rho', out=out,
+                           casting='same_kind')
+    elif out is None:
         return (b - (a * np.sum(c * b, axis=axis, keepdims=True))) / rho
+    else:
+        np.multiply(a, np.sum(c * b, axis=axis, keepdims=True), out=out)
+        np.subtract(b, out, out=out)
+        out /= rho
+        return out
 
 
 
@@ -319,13 +832,18 @@ def solvedbi_sm_c(ah, a, rho, axis=4):
 
 
 
-def solvemdbi_ism(ah, rho, b, axisM, axisK):
+def solvemdbi_ism(ah, rho, b, axisM, axisK, fct=None, out=None):
     """
     Solve a multiple diagonal block linear system with a scaled
     identity term by iterated application of the Sherman-Morrison
     equation. The computation is performed in a way that avoids
     explictly constructing the inverse operator, leading to an
-    :math:`O(K^2)` time cost.
+    :math:`O(K^2)` time cost for the factorisation computed by
+    :func:`solvemdbi_ism_factor`, which does not depend on
+    :math:`\mathbf{b}`, and an :math:`O(K)` cost for its application
+    to :math:`\mathbf{b}`. When solving a sequence of systems with the
+    same :math:`\mathbf{a}_k` and :math:`\\rho`, the factorisation can
+    be computed once and passed via parameter `fct`.
 
     The solution is obtained by independently solving a set of linear
     systems of the form (see :cite:`wohlberg-2016-efficient`)
@@ -352,6 +870,13 @@ def solvemdbi_ism(ah, rho, b, axisM, axisK):
       Axis in input corresponding to index m in linear system
     axisK : int
       Axis in input corresponding to index k in linear system
+    fct : tuple of ndarray, optional (default None)
+      Factorisation computed by :func:`solvemdbi_ism_factor` with the same
+      `ah`, `rho`, `axisM`, and `axisK` parameters. If None, it is
+      computed within this function.
+    out : ndarray, optional (default None)
+      Array in which the solution is stored. If None, a new array is
+      allocated.
 
     Returns
     -------
@@ -359,25 +884,63 @@ def solvemdbi_ism(ah, rho, b, axisM, axisK):
       Linear system solution :math:`\mathbf{x}`
     """
 
+    if fct is None:
+        fct = solvemdbi_ism_factor(ah, rho, axisM, axisK)
+    gamma, delta = fct
+    K = ah.shape[axisK]
+    slcnc = (slice(None),)*axisK
+    beta = np.divide(b, rho, out=out)
+
+    del b
+    for k in range(0, K):
+        slck = slcnc + (slice(k, k+1),)
+        c = np.sum(ah[slck] * beta, axisM, keepdims=True)
+        d = c * gamma[slck]
+        beta -= d / delta[slck]
+
+    return beta
+
+
+
+def solvemdbi_ism_factor(ah, rho, axisM, axisK):
+    """
+    Compute the factorisation used by :func:`solvemdbi_ism` to solve a
+    multiple diagonal block linear system with a scaled identity term.
+    This factorisation depends only on the :math:`\mathbf{a}_k` and
+    :math:`\\rho`, and may therefore be cached for re-use when solving
+    a sequence of systems that differ only in :math:`\mathbf{b}`.
+
+    Parameters
+    ----------
+    ah : array_like
+      Linear system component :math:`\mathbf{a}^H`
+    rho : float
+      Linear system parameter :math:`\\rho`
+    axisM : int
+      Axis in input corresponding to index m in linear system
+    axisK : int
+      Axis in input corresponding to index k in linear system
+
+    Returns
+    -------
+    fct : tuple of ndarray
+      Tuple of arrays :math:`(\\gamma, \\delta)` of iterated
+      Sherman-Morrison components
+    """
+
     K = ah.shape[axisK]
     a = np.conj(ah)
     gamma = np.zeros(a.shape, a.dtype)
     delta = np.zeros(a.shape[0:axisM] + (1,), a.dtype)
     slcnc = (slice(None),)*axisK
     alpha = a[slcnc + (slice(0, 1),)] / rho
-    beta = b / rho
 
-    del b
     for k in range(0, K):
 
         slck = slcnc + (slice(k, k+1),)
         gamma[slck] = alpha
         delta[slck] = 1.0 + np.sum(ah[slck] * gamma[slck], axisM, keepdims=True)
 
-        c = np.sum(ah[slck] * beta, axisM, keepdims=True)
-        d = c * gamma[slck]
-        beta = beta - (d / delta[slck])
-
         if k < K-1:
             alpha = a[slcnc + (slice(k+1, k+2),)] / rho
             for l in range(0, k+1):
@@ -386,7 +949,113 @@ def solvemdbi_ism(ah, rho, b, axisM, axisK):
                 d = c * gamma[slcl]
                 alpha = alpha - (d / delta[slcl])
 
-    return beta
+    return gamma, delta
+
+
+
+def solvemdbi_chol(ah, rho, b, axisM, axisK, fct=None, out=None):
+    """
+    Solve a multiple diagonal block linear system with a scaled
+    identity term by explicit construction of the :math:`M \\times M`
+    system matrix for each of the independent systems, and batched
+    Cholesky factorisation of these matrices. The factorisation,
+    computed by :func:`solvemdbi_chol_factor`, has an
+    :math:`O(K M^2 + M^3)` time cost, and its application to
+    :math:`\mathbf{b}` has an :math:`O(M^2)` cost that is independent
+    of :math:`K`, so that this solver is preferable to
+    :func:`solvemdbi_ism` when :math:`K` is substantially larger than
+    :math:`M` and the factorisation can be computed once and passed via
+    parameter `fct` when solving a sequence of systems with the same
+    :math:`\mathbf{a}_k` and :math:`\\rho`.
+
+    The solution is obtained by independently solving a set of linear
+    systems of the form
+
+    .. math::
+      (\\rho I + \mathbf{a}_0 \mathbf{a}_0^H + \mathbf{a}_1 \mathbf{a}_1^H +
+       \; \ldots \; + \mathbf{a}_{K-1} \mathbf{a}_{K-1}^H) \; \mathbf{x} =
+       \mathbf{b}
+
+    where each :math:`\mathbf{a}_k` is an :math:`M`-vector.
+    The sums, inner products, and matrix products in this equation are taken
+    along the M and K axes of the corresponding multi-dimensional arrays;
+    the solutions are independent over the other axes.
+
+    Parameters
+    ----------
+    ah : array_like
+      Linear system component :math:`\mathbf{a}^H`
+    rho : float
+      Linear system parameter :math:`\\rho`
+    b : array_like
+      Linear system component :math:`\mathbf{b}`
+    axisM : int
+      Axis in input corresponding to index m in linear system
+    axisK : int
+      Axis in input corresponding to index k in linear system
+    fct : ndarray, optional (default None)
+      Factorisation computed by :func:`solvemdbi_chol_factor` with the
+      same `ah`, `rho`, `axisM`, and `axisK` parameters. If None, it is
+      computed within this function.
+    out : ndarray, optional (default None)
+      Array, which may not share memory with `b`, in which the solution
+      is stored. If None, a new array is allocated.
+
+    Returns
+    -------
+    x : ndarray
+      Linear system solution :math:`\mathbf{x}`
+    """
+
+    if fct is None:
+        fct = solvemdbi_chol_factor(ah, rho, axisM, axisK)
+    # Each solution is computed as a row vector x^T = b^T G^{-T}, with the
+    # singleton K axis of b serving as the row index
+    bm = np.moveaxis(b, (axisK, axisM), (-2, -1))
+    if out is None:
+        return np.moveaxis(np.matmul(bm, fct), (-2, -1), (axisK, axisM))
+    else:
+        np.matmul(bm, fct, out=np.moveaxis(out, (axisK, axisM), (-2, -1)))
+        return out
+
+
+
+def solvemdbi_chol_factor(ah, rho, axisM, axisK):
+    """
+    Compute the factorisation used by :func:`solvemdbi_chol` to solve a
+    multiple diagonal block linear system with a scaled identity term.
+    The :math:`M \\times M` system matrix :math:`\\rho I + \sum_k
+    \mathbf{a}_k \mathbf{a}_k^H` is constructed for each of the
+    independent systems, and its inverse is computed from the batched
+    Cholesky factorisation of these matrices.
+
+    Parameters
+    ----------
+    ah : array_like
+      Linear system component :math:`\mathbf{a}^H`
+    rho : float
+      Linear system parameter :math:`\\rho`
+    axisM : int
+      Axis in input corresponding to index m in linear system
+    axisK : int
+      Axis in input corresponding to index k in linear system
+
+    Returns
+    -------
+    fct : ndarray
+      Array of transposed inverse system matrices, with the M and K axes
+      of `ah` replaced by the final two axes of this array
+    """
+
+    # Construct Gram matrices A^H A, where the rows of A are the a_k^H
+    A = np.moveaxis(ah, (axisK, axisM), (-2, -1))
+    G = np.matmul(np.conj(np.swapaxes(A, -2, -1)), A)
+    idx = np.arange(G.shape[-1])
+    G[..., idx, idx] += rho
+    # Compute transpose of the inverse of G = L L^H, which is given by
+    # L^{-T} L^{-1}^*
+    Linv = np.linalg.inv(np.linalg.cholesky(G))
+    return np.matmul(np.swapaxes(Linv, -2, -1), np.conj(Linv))
 
 
 
@@ -457,8 +1126,10 @@ def solvemdbi_rsm(ah, rho, b, axisK, dimN=2):
 def solvemdbi_cg(ah, rho, b, axisM, axisK, tol=1e-5, mit=1000, isn=None):
     """
     Solve a multiple diagonal block linear system with a scaled
-    identity term using Conjugate Gradient (CG) via
-    :func:`scipy.sparse.linalg.cg`.
+    identity term using Conjugate Gradient (CG). The independent linear
+    systems are solved simultaneously by a vectorised CG iteration,
+    with a diagonal (Jacobi) preconditioner, in which each system is
+    frozen once it has converged.
 
     The solution is obtained by independently solving a set of linear
     systems of the form (see :cite:`wohlberg-2016-efficient`)
@@ -486,7 +1157,11 @@ def solvemdbi_cg(ah, rho, b, axisM, axisK, tol=1e-5, mit=1000, isn=None):
     axisK : int
       Axis in input corresponding to index k in linear system
     tol : float
-      CG tolerance
+      CG tolerance. Each of the independent systems is considered to have
+      converged when the norm of its residual is less than `tol` times
+      the norm of the corresponding component of :math:`\mathbf{b}`.
+      The solution of a system for which this component is zero is
+      set to zero without any iterations.
     mit : int
       CG maximum iterations
     isn : array_like
@@ -501,15 +1176,43 @@ def solvemdbi_cg(ah, rho, b, axisM, axisK, tol=1e-5, mit=1000, isn=None):
     """
 
     a = np.conj(ah)
-    if isn is not None:
-        isn = isn.ravel()
-    Aop = lambda x: np.sum(ah * x, axis=axisM, keepdims=True)
-    AHop = lambda x: np.sum(a * x, axis=axisK, keepdims=True)
-    AHAop = lambda x: AHop(Aop(x))
-    vAHAoprI = lambda x: AHAop(x.reshape(b.shape)).ravel() + rho*x.ravel()
-    lop = LinearOperator((b.size, b.size), matvec=vAHAoprI, dtype=b.dtype)
-    vx, cgit = cg(lop, b.ravel(), isn, tol, mit)
-    return vx.reshape(b.shape), cgit
+    AHAop = lambda x: np.sum(a * np.sum(ah * x, axis=axisM, keepdims=True),
+                             axis=axisK, keepdims=True) + rho*x
+    inrm = lambda x, y: np.real(np.sum(np.conj(x) * y, axis=axisM,
+                                       keepdims=True))
+    # Inverse of the diagonal of the system matrix
+    dinv = 1.0 / (rho + np.sum(np.abs(ah)**2, axis=axisK, keepdims=True))
+
+    bnrm = np.sqrt(inrm(b, b))
+    if isn is None:
+        x = np.zeros(b.shape, dtype=b.dtype)
+        r = b.copy()
+    else:
+        # The relative stopping criterion can not be met by a system
+        # with zero b, for which the solution is zero
+        x = np.where(bnrm == 0, 0.0, np.asarray(isn, dtype=b.dtype))
+        r = b - AHAop(x)
+    thr = tol * bnrm
+    act = np.sqrt(inrm(r, r)) > thr
+    z = dinv * r
+    p = z.copy()
+    rz = inrm(r, z)
+    cgit = 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        while cgit < mit and np.any(act):
+            Ap = AHAop(p)
+            alpha = np.where(act, rz / inrm(p, Ap), 0.0)
+            x += alpha * p
+            r -= alpha * Ap
+            act &= np.sqrt(inrm(r, r)) > thr
+            z = dinv * r
+            rzn = inrm(r, z)
+            beta = np.where(act, rzn / rz, 0.0)
+            p = z + beta * p
+            rz = rzn
+            cgit += 1
+
+    return x, cgit
 
 
 
@@ -618,6 +1321,227 @@ def lu_solve_AATI(A, rho, b, lu, piv):
 
 
 
+def cho_factor(A, rho, lower=False):
+    """
+    Compute Cholesky factorisation of either :math:`A^T A + \\rho I` or
+    :math:`A A^T + \\rho I`, depending on which matrix is smaller. Since
+    these matrices are symmetric positive definite, this requires
+    approximately half the computation and storage of :func:`lu_factor`.
+    The factorisation is computed in the precision of :math:`A`, so that
+    a ``float32`` array is factorised in single precision.
+
+    Parameters
+    ----------
+    A : array_like
+      Array :math:`A`
+    rho : float
+      Scalar :math:`\\rho`
+    lower : bool, optional (default False)
+      Flag indicating whether to compute a lower or upper triangular
+      factor
+
+    Returns
+    -------
+    c : ndarray
+      Matrix containing lower or upper triangular Cholesky factor,
+      as returned by :func:`scipy.linalg.cho_factor`
+    lwr : bool
+      Flag indicating whether the factor is lower triangular, as
+      returned by :func:`scipy.linalg.cho_factor`
+    """
+
+    N, M = A.shape
+    # If N < M it is cheaper to factorise A*A^T + rho*I and then use the
+    # matrix inversion lemma to compute the inverse of A^T*A + rho*I
+    if N >= M:
+        c, lwr = linalg.cho_factor(A.T.dot(A) + rho*np.identity(M,
+                        dtype=A.dtype), lower=lower, check_finite=False)
+    else:
+        c, lwr = linalg.cho_factor(A.dot(A.T) + rho*np.identity(N,
+                        dtype=A.dtype), lower=lower, check_finite=False)
+    return c, lwr
+
+
+
+def cho_solve_ATAI(A, rho, b, c, lwr):
+    """
+    Solve the linear system :math:`(A^T A + \\rho I)\\mathbf{x} = \\mathbf{b}`
+    or :math:`(A^T A + \\rho I)X = B` using :func:`scipy.linalg.cho_solve`.
+
+    Parameters
+    ----------
+    A : array_like
+      Matrix :math:`A`
+    rho : float
+      Scalar :math:`\\rho`
+    b : array_like
+      Vector :math:`\\mathbf{b}` or matrix :math:`B`
+    c : array_like
+      Matrix containing lower or upper triangular Cholesky factor,
+      as returned by :func:`scipy.linalg.cho_factor`
+    lwr : bool
+      Flag indicating whether the factor is lower triangular
+
+    Returns
+    -------
+    x : ndarray
+      Solution to the linear system.
+    """
+
+    N, M = A.shape
+    if N >= M:
+        x = linalg.cho_solve((c, lwr), b, check_finite=False)
+    else:
+        x = (b - A.T.dot(linalg.cho_solve((c, lwr), A.dot(b),
+                                          check_finite=False))) / rho
+    return x
+
+
+
+def cho_solve_AATI(A, rho, b, c, lwr):
+    """
+    Solve the linear system :math:`(A A^T + \\rho I)\\mathbf{x} = \\mathbf{b}`
+    or :math:`(A A^T + \\rho I)X = B` using :func:`scipy.linalg.cho_solve`.
+
+    Parameters
+    ----------
+    A : array_like
+      Matrix :math:`A`
+    rho : float
+      Scalar :math:`\\rho`
+    b : array_like
+      Vector :math:`\\mathbf{b}` or matrix :math:`B`
+    c : array_like
+      Matrix containing lower or upper triangular Cholesky factor,
+      as returned by :func:`scipy.linalg.cho_factor`
+    lwr : bool
+      Flag indicating whether the factor is lower triangular
+
+    Returns
+    -------
+    x : ndarray
+      Solution to the linear system.
+    """
+
+    N, M = A.shape
+    if N >= M:
+        x = (b - linalg.cho_solve((c, lwr), b.dot(A).T,
+                                  check_finite=False).T.dot(A.T)) / rho
+    else:
+        x = linalg.cho_solve((c, lwr), b.T, check_finite=False).T
+    return x
+
+
+
+def eig_factor(A):
+    """
+    Compute eigenvalue decomposition of either :math:`A^T A` or
+    :math:`A A^T`, depending on which matrix is smaller. Since the
+    eigenvectors of :math:`A^T A + \\rho I` and :math:`A A^T + \\rho I`
+    do not depend on :math:`\\rho`, and their eigenvalues are simply
+    shifted by :math:`\\rho`, this decomposition can be used by
+    :func:`eig_solve_ATAI` and :func:`eig_solve_AATI` to solve the
+    corresponding linear systems for any value of :math:`\\rho`.
+
+    Parameters
+    ----------
+    A : array_like
+      Array :math:`A`
+
+    Returns
+    -------
+    w : ndarray
+      Eigenvalues of the smaller of :math:`A^T A` and :math:`A A^T`
+    V : ndarray
+      Matrix with the corresponding eigenvectors as its columns
+    """
+
+    N, M = A.shape
+    if N >= M:
+        w, V = linalg.eigh(A.T.dot(A))
+    else:
+        w, V = linalg.eigh(A.dot(A.T))
+    return w, V
+
+
+
+def eig_solve_ATAI(A, rho, b, w, V):
+    """
+    Solve the linear system :math:`(A^T A + \\rho I)\\mathbf{x} = \\mathbf{b}`
+    or :math:`(A^T A + \\rho I)X = B` using the eigenvalue decomposition
+    computed by :func:`eig_factor`. In the matrix case, `rho` may be an
+    array of shape (1, K) specifying a different :math:`\\rho` for each
+    of the K columns of :math:`B`.
+
+    Parameters
+    ----------
+    A : array_like
+      Matrix :math:`A`
+    rho : float or array_like
+      Scalar :math:`\\rho` or array of shape (1, K)
+    b : array_like
+      Vector :math:`\\mathbf{b}` or matrix :math:`B`
+    w : array_like
+      Eigenvalues as returned by :func:`eig_factor`
+    V : array_like
+      Eigenvectors as returned by :func:`eig_factor`
+
+    Returns
+    -------
+    x : ndarray
+      Solution to the linear system.
+    """
+
+    N, M = A.shape
+    wr = w + rho if b.ndim == 1 else w[:, np.newaxis] + rho
+    if N >= M:
+        x = V.dot(V.T.dot(b) / wr)
+    else:
+        # Apply the matrix inversion lemma, (A^T A + rho I)^{-1} =
+        # (I - A^T (A A^T + rho I)^{-1} A) / rho
+        x = (b - A.T.dot(V.dot(V.T.dot(A.dot(b)) / wr))) / rho
+    return x
+
+
+
+def eig_solve_AATI(A, rho, b, w, V):
+    """
+    Solve the linear system :math:`(A A^T + \\rho I)\\mathbf{x} = \\mathbf{b}`
+    or :math:`(A A^T + \\rho I)X = B` using the eigenvalue decomposition
+    computed by :func:`eig_factor`. As in :func:`lu_solve_AATI`, in the
+    matrix case the system is solved in the form
+    :math:`X (A A^T + \\rho I) = B`.
+
+    Parameters
+    ----------
+    A : array_like
+      Matrix :math:`A`
+    rho : float
+      Scalar :math:`\\rho`
+    b : array_like
+      Vector :math:`\\mathbf{b}` or matrix :math:`B`
+    w : array_like
+      Eigenvalues as returned by :func:`eig_factor`
+    V : array_like
+      Eigenvectors as returned by :func:`eig_factor`
+
+    Returns
+    -------
+    x : ndarray
+      Solution to the linear system.
+    """
+
+    N, M = A.shape
+    if N >= M:
+        # Apply the matrix inversion lemma, (A A^T + rho I)^{-1} =
+        # (I - A (A^T A + rho I)^{-1} A^T) / rho
+        x = (b - (b.dot(A).dot(V) / (w + rho)).dot(V.T).dot(A.T)) / rho
+    else:
+        x = (b.dot(V) / (w + rho)).dot(V.T)
+    return x
+
+
+
 def zpad(x, pd, ax):
     """
     Zero-pad array x with pd=(leading,trailing) zeros on axis ax.
@@ -725,7 +1649,7 @@ def GradientFilters(ndim, axes, axshp, dtype=None):
 
 
 
-def shrink1(x, alpha):
+def shrink1(x, alpha, out=None):
     """
     Scalar shrinkage/soft thresholding function
 
@@ -740,6 +1664,9 @@ def shrink1(x, alpha):
       Input array :math:`\mathbf{x}`
     alpha : float or array_like
       Shrinkage parameter :math:`\\alpha`
+    out : ndarray, optional (default None)
+      Array, which may not share memory with `x`, in which the result is
+      stored. If None, a new array is allocated.
 
     Returns
     -------
@@ -749,14 +1676,23 @@ def shrink1(x, alpha):
 
     if have_numexpr:
         return ne.evaluate(
-            'where(abs(x)-alpha > 0, where(x >= 0, 1, -1) * (abs(x)-alpha), 0)'
-        )
-    else:
+            'where(abs(x)-alpha > 0, where(x >= 0, 1, -1) * (abs(x)-alpha), 0)',
+            out=out, casting='same_kind')
+    elif out is None:
         return np.sign(x) * (np.clip(np.abs(x) - alpha, 0, float('Inf')))
+    else:
+        np.abs(x, out=out)
+        out -= alpha
+        np.clip(out, 0, float('Inf'), out=out)
+        if np.iscomplexobj(x):
+            out *= np.sign(x)
+        else:
+            np.copysign(out, x, out=out)
+        return out
 
 
 
-def zdivide(x, y):
+def zdivide(x, y, out=None):
     """
     Return x/y, with 0 instead of NaN where y is 0.
 
@@ -766,6 +1702,9 @@ def zdivide(x, y):
       Numerator
     y : array_like
       Denominator
+    out : ndarray, optional (default None)
+      Array in which the result is stored. If None, a new array is
+      allocated.
 
     Returns
     -------
@@ -774,13 +1713,13 @@ def zdivide(x, y):
     """
 
     with np.errstate(divide='ignore', invalid='ignore'):
-        div = x / y
+        div = np.divide(x, y, out=out)
     div[np.logical_or(np.isnan(div), np.isinf(div))] = 0
     return div
 
 
 
-def shrink2(x, alpha, axis=-1):
+def shrink2(x, alpha, axis=-1, out=None):
     """
     Vector shrinkage/soft thresholding function
 
@@ -801,6 +1740,9 @@ def shrink2(x, alpha, axis=-1):
       Shrinkage parameter :math:`\\alpha`
     axis : int, optional (default -1)
       Axis of x over which the :math:`\ell_2` norm
+    out : ndarray, optional (default None)
+      Array in which the result is stored. If None, a new array is
+      allocated.
 
     Returns
     -------
@@ -811,7 +1753,7 @@ def shrink2(x, alpha, axis=-1):
     a = np.sqrt(np.sum(x**2, axis=axis, keepdims=True))
     b = np.maximum(0, a - alpha)
     b = zdivide(b, a)
-    return b*x
+    return np.multiply(b, x, out=out)
 
 
 
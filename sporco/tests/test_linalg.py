@@ -212,3 +212,254 @@ class TestSet01(object):
         Dslv, cgit = linalg.solvemdbi_cg(X, rho, XHop(S)+rho*Z, 4, 3, tol=1e-6)
 
         assert(linalg.rrs(XHop(Xop(Dslv)) + rho*Dslv, XHop(S) + rho*Z) <= 1e-6)
+
+
+
+    def test_12(self):
+        x = np.random.randn(16, 12, 3)
+        pm = linalg.FFTWPlanManager(threads=1, effort='FFTW_ESTIMATE')
+        assert(np.allclose(pm.transform('fftn', x, axes=(0, 1)),
+                           np.fft.fftn(x, axes=(0, 1))))
+        assert(np.allclose(pm.transform('rfftn', x, s=(20, 16), axes=(0, 1)),
+                           np.fft.rfftn(x, s=(20, 16), axes=(0, 1))))
+        xf = np.fft.rfftn(x, axes=(0, 1))
+        assert(np.allclose(pm.transform('irfftn', xf, s=(16, 12),
+                                        axes=(0, 1)), x))
+        assert(np.allclose(pm.transform('ifftn', xf, axes=(0, 1)),
+                           np.fft.ifftn(xf, axes=(0, 1))))
+        assert(len(pm.plans) == 4)
+        pm.transform('rfftn', 2*x, s=(20, 16), axes=(0, 1))
+        assert(len(pm.plans) == 4)
+
+
+
+    def test_13(self):
+        x = np.random.randn(16, 12, 3)
+        pm = linalg.FFTWPlanManager(threads=1, effort='FFTW_ESTIMATE')
+        try:
+            linalg.pyfftw_plans = pm
+            xf = linalg.rfftn(x, axes=(0, 1))
+            xr = linalg.irfftn(xf, s=x.shape[0:2], axes=(0, 1))
+        finally:
+            linalg.pyfftw_plans = None
+        assert(len(pm.plans) == 2)
+        assert(np.allclose(xf, np.fft.rfftn(x, axes=(0, 1))))
+        assert(np.allclose(xr, x))
+
+
+
+    def test_14(self, tmpdir):
+        pth = str(tmpdir.join('wisdom.pkl'))
+        pm = linalg.FFTWPlanManager(pth, threads=1, effort='FFTW_ESTIMATE')
+        pm.transform('rfftn', np.random.randn(8, 8))
+        pm.save_wisdom()
+        pm = linalg.FFTWPlanManager(pth, threads=1, effort='FFTW_ESTIMATE')
+        assert(any(pm.load_wisdom()))
+
+
+
+    def test_15(self):
+        x = np.random.randn(16, 12, 3)
+        xf = np.fft.rfftn(x, axes=(0, 1))
+        try:
+            for bknd in ('numpy', 'scipy'):
+                linalg.set_fft_backend(bknd)
+                assert(linalg.get_fft_backend() == bknd)
+                assert(np.allclose(linalg.rfftn(x, axes=(0, 1)), xf))
+                assert(np.allclose(linalg.irfftn(xf, s=(16, 12),
+                                                 axes=(0, 1)), x))
+                assert(np.allclose(linalg.idctii(linalg.dctii(x)), x))
+                a = linalg.pyfftw_empty_aligned((5, 3), dtype=np.complex128)
+                assert(a.shape == (5, 3) and a.ctypes.data % 64 == 0)
+        finally:
+            linalg.set_fft_backend()
+
+
+
+    def test_16(self):
+        with pytest.raises(ValueError):
+            linalg.set_fft_backend('nosuchbackend')
+
+
+
+    def test_17(self):
+        x = np.random.randn(16, 12, 3)
+        xf = np.fft.rfftn(x, axes=(0, 1))
+        out = linalg.pyfftw_empty_aligned(xf.shape, dtype=np.complex128)
+        y = linalg.rfftn(x, axes=(0, 1), out=out)
+        assert(y is out)
+        assert(np.allclose(out, xf))
+        out = np.zeros(x.shape)
+        pm = linalg.FFTWPlanManager(threads=1, effort='FFTW_ESTIMATE')
+        try:
+            linalg.pyfftw_plans = pm
+            y = linalg.irfftn(xf, s=(16, 12), axes=(0, 1), out=out)
+        finally:
+            linalg.pyfftw_plans = None
+        assert(y is out)
+        assert(np.allclose(out, x))
+
+
+
+    def test_18(self):
+        x = np.random.randn(16, 8)
+        alpha = 0.5
+        out = np.zeros(x.shape)
+        assert(linalg.shrink1(x, alpha, out=out) is out)
+        assert(np.allclose(out, linalg.shrink1(x, alpha)))
+        assert(linalg.shrink2(x, alpha, out=out) is out)
+        assert(np.allclose(out, linalg.shrink2(x, alpha)))
+        y = x.copy()
+        y[0] = 0
+        assert(linalg.zdivide(x, y, out=out) is out)
+        assert(np.allclose(out, linalg.zdivide(x, y)))
+
+
+
+    def test_19(self):
+        rho = 1e-1
+        N = 32
+        M = 16
+        K = 4
+        C = 3
+        D = np.random.randn(N, N, C, 1, M).astype('complex') + \
+            np.random.randn(N, N, C, 1, M).astype('complex') * 1.0j
+        b = np.random.randn(N, N, 1, K, M).astype('complex') + \
+            np.random.randn(N, N, 1, K, M).astype('complex') * 1.0j
+        out = np.zeros(b.shape, dtype=b.dtype)
+        x = linalg.solvemdbi_ism(D, rho, b, 4, 2)
+        assert(linalg.solvemdbi_ism(D, rho, b, 4, 2, out=out) is out)
+        assert(np.allclose(out, x))
+        D = D[:, :, 0:1]
+        x = linalg.solvedbi_sm(D, rho, b, axis=4)
+        assert(linalg.solvedbi_sm(D, rho, b, axis=4, out=out) is out)
+        assert(np.allclose(out, x))
+
+
+
+    def test_20(self):
+        rho = 1e-1
+        N = 32
+        M = 16
+        K = 4
+        C = 3
+        D = np.random.randn(N, N, C, 1, M).astype('complex') + \
+            np.random.randn(N, N, C, 1, M).astype('complex') * 1.0j
+        b = np.random.randn(N, N, 1, K, M).astype('complex') + \
+            np.random.randn(N, N, 1, K, M).astype('complex') * 1.0j
+        fct = linalg.solvemdbi_ism_factor(D, rho, 4, 2)
+        x0 = linalg.solvemdbi_ism(D, rho, b, 4, 2)
+        x1 = linalg.solvemdbi_ism(D, rho, b, 4, 2, fct)
+        assert(np.allclose(x0, x1))
+        Dop = lambda x: np.sum(D * x, axis=4, keepdims=True)
+        DHop = lambda x: np.sum(np.conj(D) * x, axis=2, keepdims=True)
+        assert(linalg.rrs(DHop(Dop(x1)) + rho*x1, b) < 1e-11)
+
+
+
+    def test_21(self):
+        rho = 1e-1
+        N = 32
+        M = 8
+        K = 16
+        C = 2
+        X = np.random.randn(N, N, 1, K, M).astype('complex') + \
+            np.random.randn(N, N, 1, K, M).astype('complex') * 1.0j
+        b = np.random.randn(N, N, C, 1, M).astype('complex') + \
+            np.random.randn(N, N, C, 1, M).astype('complex') * 1.0j
+        fct = linalg.solvemdbi_chol_factor(X, rho, 4, 3)
+        x = linalg.solvemdbi_chol(X, rho, b, 4, 3, fct)
+        Xop = lambda x: np.sum(X * x, axis=4, keepdims=True)
+        XHop = lambda x: np.sum(np.conj(X) * x, axis=3, keepdims=True)
+        assert(linalg.rrs(XHop(Xop(x)) + rho*x, b) < 1e-11)
+        assert(np.allclose(x, linalg.solvemdbi_ism(X, rho, b, 4, 3)))
+
+
+
+    def test_22(self):
+        rho = 1e-1
+        N = 32
+        M = 16
+        K = 8
+        X = np.random.randn(N, N, 1, K, M).astype('complex') + \
+            np.random.randn(N, N, 1, K, M).astype('complex') * 1.0j
+        b = np.random.randn(N, N, 1, 1, M).astype('complex') + \
+            np.random.randn(N, N, 1, 1, M).astype('complex') * 1.0j
+        b[0, 0] = 0
+        Xop = lambda x: np.sum(X * x, axis=4, keepdims=True)
+        XHop = lambda x: np.sum(np.conj(X) * x, axis=3, keepdims=True)
+        x0, cgit0 = linalg.solvemdbi_cg(X, rho, b, 4, 3, tol=1e-8)
+        r = XHop(Xop(x0)) + rho*x0 - b
+        assert(np.all(np.linalg.norm(r, axis=4) <=
+                      1e-8 * np.linalg.norm(b, axis=4)))
+        x1, cgit1 = linalg.solvemdbi_cg(X, rho, b, 4, 3, tol=1e-8,
+                                        isn=x0*(1.0 + 1e-4))
+        assert(cgit1 < cgit0)
+        assert(np.allclose(x0, x1))
+        isn = x0*(1.0 + 1e-4)
+        isn[0, 0] = 1.0
+        x2, cgit2 = linalg.solvemdbi_cg(X, rho, b, 4, 3, tol=1e-8, isn=isn)
+        assert(cgit2 == cgit1)
+        assert(np.all(x2[0, 0] == 0))
+
+
+    def test_23(self):
+        rho = 1e-1
+        K = 32
+        for N, M in ((64, 128), (128, 64)):
+            D = np.random.randn(N, M)
+            B = np.random.randn(M, K)
+            w, V = linalg.eig_factor(D)
+            X = linalg.eig_solve_ATAI(D, rho, B, w, V)
+            assert(linalg.rrs(D.T.dot(D).dot(X) + rho*X, B) < 1e-10)
+            X = linalg.eig_solve_ATAI(D, 2*rho, B, w, V)
+            assert(linalg.rrs(D.T.dot(D).dot(X) + 2*rho*X, B) < 1e-10)
+
+
+
+    def test_24(self):
+        rho = 1e-1
+        N = 32
+        for M, K in ((64, 128), (128, 64)):
+            A = np.random.randn(M, K)
+            B = np.random.randn(N, M)
+            w, V = linalg.eig_factor(A)
+            X = linalg.eig_solve_AATI(A, rho, B, w, V)
+            assert(linalg.rrs(X.dot(A).dot(A.T) + rho*X, B) < 1e-10)
+            X = linalg.eig_solve_AATI(A, 2*rho, B, w, V)
+            assert(linalg.rrs(X.dot(A).dot(A.T) + 2*rho*X, B) < 1e-10)
+
+
+
+    def test_25(self):
+        rho = 1e-1
+        K = 32
+        for N, M in ((64, 128), (128, 64)):
+            D = np.random.randn(N, M)
+            B = np.random.randn(M, K)
+            c, lwr = linalg.cho_factor(D, rho)
+            X = linalg.cho_solve_ATAI(D, rho, B, c, lwr)
+            assert(linalg.rrs(D.T.dot(D).dot(X) + rho*X, B) < 1e-11)
+            c, lwr = linalg.cho_factor(D.astype(np.float32), rho)
+            assert(c.dtype == np.float32)
+
+
+
+    def test_26(self):
+        rho = 1e-1
+        N = 32
+        for M, K in ((64, 128), (128, 64)):
+            A = np.random.randn(M, K)
+            B = np.random.randn(N, M)
+            c, lwr = linalg.cho_factor(A, rho)
+            X = linalg.cho_solve_AATI(A, rho, B, c, lwr)
+            assert(linalg.rrs(X.dot(A).dot(A.T) + rho*X, B) < 1e-11)
+
+
+
+    def test_27(self):
+        assert(linalg.next_fast_len(1) == 1)
+        assert(linalg.next_fast_len(11) == 12)
+        assert(linalg.next_fast_len(769) == 784)
+        assert(linalg.next_fast_len(1021) == 1024)
+        assert(linalg.next_fast_len(1029) == 1029)
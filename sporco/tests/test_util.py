@@ -4,6 +4,9 @@ from builtins import object
 import pytest
 
 import numpy as np
+import collections
+import pickle
+import os
 
 from sporco import util
 
@@ -13,6 +16,11 @@ def fn(prm):
     return (x - 0.1)**2
 
 
+def fnenv(arrs, task):
+    arrs['x'][task] = float(os.environ.get('OMP_NUM_THREADS', 0))
+    return os.environ.get('OPENBLAS_NUM_THREADS')
+
+
 class TestSet01(object):
 
     def test_01(self):
@@ -68,3 +76,40 @@ class TestSet01(object):
         assert(len(nm) > 0)
         im = ei.image('barbara')
         assert(im.shape == (576,720,3))
+
+
+    def test_11(self, tmpdir):
+        IterationStats = collections.namedtuple('IterationStats',
+                                                ('Iter', 'ObjFun', 'Extra'))
+        its = util.IterStatsStore(IterationStats, size=2)
+        for k in range(5):
+            its.append(IterationStats(k, 0.5*k, None))
+        assert(len(its) == 5)
+        assert(its[-1] == IterationStats(4, 2.0, None))
+        assert(its[1:3] == [IterationStats(1, 0.5, None),
+                            IterationStats(2, 1.0, None)])
+        assert(its.column('Iter').dtype == np.int64)
+        assert(np.shares_memory(its.column('ObjFun'), its.data))
+        its.append(IterationStats(5, None, 1.0))
+        assert(np.isnan(its[-1].ObjFun))
+        assert(np.all(np.isnan(its.column('Extra')[0:5])))
+        tpl = its.astuple()
+        assert(np.allclose(tpl.ObjFun[0:5], 0.5*np.arange(5)))
+        tpc = its.astuple(copy=True)
+        assert(np.array_equal(tpc.Iter, tpl.Iter))
+        assert(not np.shares_memory(tpc.ObjFun, its.data))
+        pth = str(tmpdir.join('itstat.npy'))
+        its.save(pth)
+        arr = np.load(pth)
+        assert(np.array_equal(arr['Iter'], np.arange(6)))
+        itp = pickle.loads(pickle.dumps(its))
+        assert(itp[2][0:2] == its[2][0:2])
+
+
+    def test_12(self):
+        omp = os.environ.get('OMP_NUM_THREADS')
+        rslt, outs = util.shared_pool_map(fnenv, {'x': ((4,), np.float64)},
+                                          list(range(4)), nproc=2, nthr=3)
+        assert(rslt == ['3'] * 4)
+        assert(np.array_equal(outs['x'], np.full((4,), 3.0)))
+        assert(os.environ.get('OMP_NUM_THREADS') == omp)
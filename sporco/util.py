@@ -22,9 +22,11 @@ import os
 import glob
 import multiprocessing as mp
 import itertools
+import collections
+import pickle
+import shutil
 
 import sporco.linalg as sla
-import sporco.plot as spl
 
 __author__ = """Brendt Wohlberg <brendt@ieee.org>"""
 
@@ -33,15 +35,18 @@ import warnings
 
 def plot(*args, **kwargs):
     warnings.warn("sporco.util.plot is deprecated: please use sporco.plot.plot")
+    import sporco.plot as spl
     return spl.plot(*args, **kwargs)
 
 def surf(*args, **kwargs):
     warnings.warn("sporco.util.surf is deprecated: please use sporco.plot.surf")
+    import sporco.plot as spl
     return spl.surf(*args, **kwargs)
 
 def imview(*args, **kwargs):
     warnings.warn("sporco.util.imview is deprecated: please use "
                   "sporco.plot.imview")
+    import sporco.plot as spl
     return spl.imview(*args, **kwargs)
 
 
@@ -371,6 +376,211 @@ def grid_search(fn, grd, fmin=True, nproc=None):
 
 
 
+def balance_workers(ntask, nproc=None):
+    """Determine the number of worker processes, and the number of FFT
+    and BLAS threads in each of them, so that the total number of
+    threads does not exceed the number of CPUs.
+
+    Parameters
+    ----------
+    ntask : int
+      Number of independent tasks available for distribution across
+      processes
+    nproc : int or None, optional (default None)
+      Number of processes. If None, the number of CPUs of the system
+      is used.
+
+    Returns
+    -------
+    nproc : int
+      Number of processes, which is not greater than `ntask`
+    nthr : int
+      Number of FFT and BLAS threads per process
+    """
+
+    ncpu = mp.cpu_count()
+    if nproc is None:
+        nproc = ncpu
+    nproc = max(1, min(nproc, ntask))
+    nthr = max(1, ncpu // nproc)
+    return nproc, nthr
+
+
+
+def shared_array(shape, dtype, name=None):
+    """Create, or attach to, an array in a block of shared memory.
+
+    Parameters
+    ----------
+    shape : tuple of ints
+      Array shape
+    dtype : data-type
+      Array data type
+    name : string or None, optional (default None)
+      Name of an existing shared memory block to attach to. If None, a
+      new block is created.
+
+    Returns
+    -------
+    shm : :class:`multiprocessing.shared_memory.SharedMemory` object
+      Shared memory block, which should be closed (and unlinked, by the
+      process that created it) when it is no longer required
+    arr : ndarray
+      Array referring to the shared memory block
+    """
+
+    try:
+        from multiprocessing import shared_memory
+    except ImportError:
+        raise RuntimeError('Module multiprocessing.shared_memory is not '
+                           'available (it requires Python 3.8 or later)')
+    dtype = np.dtype(dtype)
+    if name is None:
+        size = max(1, int(np.prod(shape)) * dtype.itemsize)
+        shm = shared_memory.SharedMemory(create=True, size=size)
+    else:
+        shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+
+# Environment variables determining the number of threads used by the
+# BLAS and OpenMP libraries, which are read when these libraries are
+# loaded, and therefore have to be set before the worker processes of
+# shared_pool_map are started
+_thread_env = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+               'BLIS_NUM_THREADS', 'VECLIB_MAXIMUM_THREADS',
+               'NUMEXPR_NUM_THREADS')
+
+
+
+def _shared_pool_init(nthr):
+    """Initialise a worker process of :func:`shared_pool_map`."""
+
+    sla.pyfftw_threads = nthr
+
+
+
+def _shared_pool_call(args):
+    """Attach to the shared arrays and call the function in a worker
+    process of :func:`shared_pool_map`."""
+
+    fn, desc, task = args
+    shms = []
+    arrs = {}
+    try:
+        for key, (name, shape, dtype) in desc.items():
+            shm, arrs[key] = shared_array(shape, dtype, name)
+            shms.append(shm)
+        return fn(arrs, task)
+    finally:
+        # The arrays must be released before the blocks are closed
+        arrs.clear()
+        for shm in shms:
+            shm.close()
+
+
+
+def shared_pool_map(fn, arrays, tasks, nproc=1, nthr=1, reduce=None):
+    """Evaluate a function for each of a list of tasks in a pool of
+    processes with access to a set of arrays in shared memory, so
+    that the arrays are not copied for each process.
+
+    The pool is created with the ``spawn`` start method, so that the
+    workers do not inherit the threads of the parent process. (The
+    ``fork`` start method used by :func:`grid_search` hangs when
+    :mod:`pyfftw` multi-threading has been used in the parent
+    process.) As a consequence, the main module of a script calling
+    this function should be protected by an ``if __name__ ==
+    '__main__':`` condition. The number of BLAS and OpenMP threads in
+    each worker is limited to `nthr` by setting the corresponding
+    environment variables (e.g. ``OMP_NUM_THREADS``) while the pool is
+    running, since they are only read when the worker is started.
+
+    Parameters
+    ----------
+    fn : function
+      Function, defined at the top level of a module so that it can be
+      pickled, with signature ``fn(arrs, task)``, where ``arrs`` is a
+      dict of the shared arrays with the same keys as `arrays`, and
+      ``task`` is an entry of `tasks`. The arrays are only valid for
+      the duration of the call, and results should be written into
+      them, or returned, as copies.
+    arrays : dict
+      Dict of arrays to be placed in shared memory. Each value is either
+      an ndarray, which is copied into shared memory, or a tuple
+      ``(shape, dtype)`` specifying an output array, which is
+      initialised to zero.
+    tasks : list
+      List of tasks (which must be picklable)
+    nproc : int, optional (default 1)
+      Number of processes
+    nthr : int, optional (default 1)
+      Number of FFT threads (see :data:`.linalg.pyfftw_threads`), and
+      of BLAS and OpenMP threads, in each process
+    reduce : function or None, optional (default None)
+      If not None, a function that is called, in the parent process,
+      with each of the values returned by `fn` as they become
+      available (in task order), in which case the values are not
+      retained
+
+    Returns
+    -------
+    rslt : list or None
+      List of values returned by `fn` for each task, or None if
+      `reduce` is not None
+    outs : dict
+      Dict of copies of the output arrays, i.e. the entries of `arrays`
+      specified by a tuple ``(shape, dtype)``
+    """
+
+    shms = {}
+    shrd = {}
+    desc = {}
+    try:
+        for key, val in arrays.items():
+            if isinstance(val, tuple):
+                shms[key], shrd[key] = shared_array(val[0], val[1])
+                shrd[key][...] = 0
+            else:
+                shms[key], shrd[key] = shared_array(val.shape, val.dtype)
+                shrd[key][...] = val
+            desc[key] = (shms[key].name, shrd[key].shape, shrd[key].dtype.str)
+        # Set the thread limits inherited by the worker processes,
+        # recording the existing values so that they can be restored
+        envprv = {name: os.environ.get(name) for name in _thread_env}
+        os.environ.update({name: str(nthr) for name in _thread_env})
+        try:
+            pool = mp.get_context('spawn').Pool(processes=nproc,
+                        initializer=_shared_pool_init, initargs=(nthr,))
+            try:
+                args = [(fn, desc, task) for task in tasks]
+                if reduce is None:
+                    rslt = pool.map(_shared_pool_call, args)
+                else:
+                    rslt = None
+                    for val in pool.imap(_shared_pool_call, args):
+                        reduce(val)
+            finally:
+                pool.close()
+                pool.join()
+        finally:
+            for name, val in envprv.items():
+                if val is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = val
+        outs = {key: shrd[key].copy() for key in arrays
+                if isinstance(arrays[key], tuple)}
+    finally:
+        shrd.clear()
+        for shm in shms.values():
+            shm.close()
+            shm.unlink()
+    return rslt, outs
+
+
+
 def convdicts():
     """Access a set of example learned convolutional dictionaries.
 
@@ -562,3 +772,513 @@ class Timer(object):
         if reset:
             self.start()
         return dlt
+
+
+
+class IterStatsStore(object):
+    """Columnar store for iteration statistics.
+
+    Records appended to the store (typically ``IterationStats``
+    namedtuples) are held in a preallocated NumPy structured array,
+    with one field per namedtuple field, that grows geometrically as
+    required. Appending a record is amortised O(1), and each column of
+    statistics can be accessed as an array view without copying. The
+    store also supports the list operations (``len``, indexing,
+    iteration, and ``append``) previously used for the list of
+    namedtuples, so that, for example, ``itstat[-1].ObjFun`` continues
+    to work as before.
+
+    The dtype of each column is determined by the first value that is
+    not ``None`` appended to it, and is promoted if a later value is not
+    representable in that dtype. Values of ``None`` are stored as NaN
+    in columns of floating point dtype, and a column that has only ever
+    contained ``None`` has object dtype.
+    """
+
+    def __init__(self, ntpl, size=64):
+        """Initialise an empty store.
+
+        Parameters
+        ----------
+        ntpl : namedtuple class
+          Type of the records to be stored
+        size : int, optional (default 64)
+          Initial number of records for which storage is allocated
+        """
+
+        self.ntpl = ntpl
+        self.size = max(int(size), 1)
+        self.n = 0
+        self.data = np.zeros(self.size, dtype=[(fld, object) for fld in
+                                               ntpl._fields])
+        # Flags indicating whether each column contains only None
+        self.nulcol = [True,] * len(ntpl._fields)
+        # Value types of most recently appended record, and indices of
+        # its None values that are stored as NaN
+        self.typs = None
+        self.nanidx = []
+
+
+
+    def __getstate__(self):
+        """Support pickling of store. The namedtuple type is not
+        pickled since it is usually not importable by name.
+        """
+
+        state = self.__dict__.copy()
+        state['ntpl'] = self.ntpl._fields
+        return state
+
+
+
+    def __setstate__(self, state):
+        """Restore store state from pickle."""
+
+        self.__dict__.update(state)
+        self.ntpl = collections.namedtuple('IterationStats', state['ntpl'])
+
+
+
+    def __len__(self):
+        """Number of records in store."""
+
+        return self.n
+
+
+
+    def __getitem__(self, index):
+        """Get record at specified index as a namedtuple. A slice
+        index returns a list of namedtuples.
+        """
+
+        if isinstance(index, slice):
+            return [self[k] for k in range(*index.indices(self.n))]
+        if index < 0:
+            index += self.n
+        if index < 0 or index >= self.n:
+            raise IndexError('store index out of range')
+        return self.ntpl._make(self.data[index].item())
+
+
+
+    def __iter__(self):
+        """Iterate over records as namedtuples."""
+
+        for k in range(self.n):
+            yield self[k]
+
+
+
+    def __eq__(self, other):
+        """Compare with another store or a list of records."""
+
+        return list(self) == list(other)
+
+
+
+    def __ne__(self, other):
+        """Compare with another store or a list of records."""
+
+        return not self == other
+
+
+
+    def _coldtype(self, dtype, val):
+        """Get dtype for a column of dtype `dtype` that is required to
+        also represent value `val`, which is not None.
+        """
+
+        if isinstance(val, (bool, np.bool_)):
+            vdt = np.dtype(bool)
+        elif isinstance(val, (int, float, complex, np.number)):
+            vdt = np.asarray(val).dtype
+        else:
+            vdt = np.dtype(object)
+        if dtype is None:
+            return vdt
+        if dtype == vdt or dtype == object:
+            return dtype
+        if vdt == object or dtype == bool or vdt == bool:
+            return np.dtype(object)
+        return np.result_type(dtype, vdt)
+
+
+
+    def _setdtype(self, dtypes):
+        """Convert columns to the specified dtypes."""
+
+        data = np.zeros(self.size, dtype=list(zip(self.ntpl._fields, dtypes)))
+        if self.n == 0:
+            self.data = data
+            return
+        for k, fld in enumerate(self.ntpl._fields):
+            col = self.data[fld][0:self.n]
+            if self.nulcol[k] and dtypes[k] != object:
+                # Column contains only None
+                data[fld][0:self.n] = np.nan
+            elif dtypes[k] == object and self.data.dtype[k].kind == 'f':
+                data[fld][0:self.n] = [None if v != v else v for v in col]
+            else:
+                data[fld][0:self.n] = col
+        self.data = data
+
+
+
+    def append(self, itst):
+        """Append a record to the store.
+
+        Parameters
+        ----------
+        itst : namedtuple
+          Record to be appended
+        """
+
+        if self.n == self.size:
+            self.size *= 2
+            data = np.zeros(self.size, dtype=self.data.dtype)
+            data[0:self.n] = self.data
+            self.data = data
+
+        # Column dtypes only need to be checked when the value types
+        # differ from those of the previous record
+        typs = tuple(map(type, itst))
+        if typs != self.typs:
+            self._checkdtype(itst)
+            self.typs = typs
+            self.nanidx = [k for k, val in enumerate(itst) if val is None
+                           and self.data.dtype[k].kind in 'fc']
+        if self.nanidx:
+            itst = list(itst)
+            for k in self.nanidx:
+                itst[k] = np.nan
+        self.data[self.n] = tuple(itst)
+        self.n += 1
+
+
+
+    def _checkdtype(self, itst):
+        """Change column dtypes as required to represent the values
+        in record `itst`.
+        """
+
+        dtypes = [self.data.dtype[k] for k in range(len(self.nulcol))]
+        chng = False
+        for k, val in enumerate(itst):
+            cdt = None if self.nulcol[k] else dtypes[k]
+            if val is None:
+                # Integer and boolean columns can not represent None
+                ndt = cdt if cdt is None else self._coldtype(cdt, np.nan)
+            else:
+                ndt = self._coldtype(cdt, val)
+                if cdt is None and self.n > 0:
+                    # Previous entries in this column are None
+                    ndt = self._coldtype(ndt, np.nan)
+            # Note that comparison of a dtype with None is not reliable
+            # since np.dtype(None) is the default float dtype
+            if ndt is not None and (cdt is None or ndt != cdt):
+                dtypes[k] = ndt
+                chng = True
+        if chng:
+            self._setdtype(dtypes)
+        for k, val in enumerate(itst):
+            if val is not None:
+                self.nulcol[k] = False
+
+
+
+    def column(self, fld):
+        """Get a view of the column of statistics for the specified
+        field.
+
+        Parameters
+        ----------
+        fld : string
+          Field name
+
+        Returns
+        -------
+        col : ndarray
+          Array view of the column for field `fld`
+        """
+
+        return self.data[fld][0:self.n]
+
+
+
+    def array(self):
+        """Get a view of the populated part of the structured array.
+
+        Returns
+        -------
+        arr : ndarray
+          Structured array with one field per namedtuple field
+        """
+
+        return self.data[0:self.n]
+
+
+
+    def astuple(self, copy=False):
+        """Get iteration stats as a namedtuple of column arrays.
+
+        Parameters
+        ----------
+        copy : bool, optional (default False)
+          Flag indicating whether the column arrays should be copies
+          rather than views of the store
+
+        Returns
+        -------
+        tpl : namedtuple or None
+          Namedtuple with each field consisting of an array view (or a
+          copy, if `copy` is True) of the corresponding column, or None
+          if the store is empty
+        """
+
+        if self.n == 0:
+            return None
+        else:
+            return self.ntpl(*[np.array(self.column(fld), copy=copy)
+                               for fld in self.ntpl._fields])
+
+
+
+    def save(self, path):
+        """Save the populated part of the structured array to a ``.npy``
+        file.
+
+        Parameters
+        ----------
+        path : string
+          Filename of ``.npy`` file
+        """
+
+        arr = self.array()
+        np.save(path, arr, allow_pickle=arr.dtype.hasobject)
+
+
+
+class _NullPhase(object):
+    """Context manager that does nothing, used by a disabled
+    :class:`PhaseTimer`."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+
+class _TimedPhase(object):
+    """Context manager for timing a phase of a :class:`PhaseTimer`."""
+
+    def __init__(self, phstm, label):
+        self.phstm = phstm
+        self.label = label
+
+    def __enter__(self):
+        self.phstm.start(self.label)
+        return self
+
+    def __exit__(self, *args):
+        self.phstm.stop(self.label)
+        return False
+
+
+
+class PhaseTimer(object):
+    """Timer accumulating elapsed time and call counts for a set of
+    labelled phases of a computation. A phase is timed either by
+    explicit calls to :meth:`start` and :meth:`stop`, or by using the
+    object returned by calling the timer with the phase label as a
+    context manager, e.g.
+
+    ::
+
+      phstm = PhaseTimer()
+      with phstm('xstep'):
+          xstep()
+
+    When the timer is disabled, calling it returns a context manager
+    that does nothing, so that the timing overhead is negligible.
+    """
+
+    _nullphase = _NullPhase()
+
+    def __init__(self, enabled=True):
+        """Initialise timer.
+
+        Parameters
+        ----------
+        enabled : bool, optional (default True)
+          Flag indicating whether the timer is enabled
+        """
+
+        self.enabled = enabled
+        self.reset()
+
+
+
+    def __call__(self, label):
+        """Get a context manager for timing phase `label`."""
+
+        if self.enabled:
+            return _TimedPhase(self, label)
+        else:
+            return PhaseTimer._nullphase
+
+
+
+    def reset(self):
+        """Discard accumulated times and call counts."""
+
+        self.t = {}
+        self.n = {}
+        self.t0 = {}
+
+
+
+    def start(self, label):
+        """Start timing phase `label`."""
+
+        self.t0[label] = timer()
+
+
+
+    def stop(self, label):
+        """Stop timing phase `label`, and add the time since the
+        corresponding call to :meth:`start` to the accumulated time
+        for that phase.
+        """
+
+        dlt = timer() - self.t0.pop(label)
+        self.t[label] = self.t.get(label, 0.0) + dlt
+        self.n[label] = self.n.get(label, 0) + 1
+
+
+
+    def times(self):
+        """Get dict mapping phase labels to accumulated times."""
+
+        return dict(self.t)
+
+
+
+    def counts(self):
+        """Get dict mapping phase labels to call counts."""
+
+        return dict(self.n)
+
+
+
+    def summary(self):
+        """Get a string containing a table of accumulated time, call
+        count, and time per call for each phase, in order of decreasing
+        accumulated time.
+        """
+
+        lbls = sorted(self.t, key=lambda l: self.t[l], reverse=True)
+        wl = max([len(l) for l in lbls] + [5])
+        lines = ['%-*s  %8s  %10s  %10s' % (wl, 'Phase', 'Calls', 'Time',
+                                             'Time/call')]
+        for l in lbls:
+            lines.append('%-*s  %8d  %10.3e  %10.3e' %
+                         (wl, l, self.n[l], self.t[l], self.t[l]/self.n[l]))
+        return '\n'.join(lines)
+
+
+
+
+def save_checkpoint(path, state):
+    """Save a checkpoint of solver state to a directory.
+
+    Each :class:`numpy.ndarray` value in `state` is written to a
+    separate ``.npy`` file so that it can be memory-mapped when the
+    checkpoint is loaded, each dict value is saved, recursively, in a
+    subdirectory, and all other values are pickled together in file
+    ``state.pkl``. The checkpoint is first written to a temporary
+    directory, which then replaces any existing checkpoint at `path`,
+    so that an interrupted save does not corrupt the previous
+    checkpoint.
+
+    Parameters
+    ----------
+    path : string
+      Checkpoint directory path
+    state : dict
+      Dict of values to be saved, with string keys
+    """
+
+    path = os.path.normpath(path)
+    tmp = path + '.tmp'
+    old = path + '.old'
+    if os.path.exists(tmp):
+        shutil.rmtree(tmp)
+    _save_checkpoint_dir(tmp, state)
+    if os.path.exists(path):
+        if os.path.exists(old):
+            shutil.rmtree(old)
+        os.rename(path, old)
+    os.rename(tmp, path)
+    if os.path.exists(old):
+        shutil.rmtree(old)
+
+
+
+def _save_checkpoint_dir(path, state):
+    """Write the content of a checkpoint directory (see
+    :func:`save_checkpoint`)."""
+
+    os.makedirs(path)
+    other = {}
+    for key, val in state.items():
+        if isinstance(val, np.ndarray):
+            np.save(os.path.join(path, key + '.npy'), val,
+                    allow_pickle=val.dtype.hasobject)
+        elif isinstance(val, dict):
+            _save_checkpoint_dir(os.path.join(path, key), val)
+        else:
+            other[key] = val
+    with open(os.path.join(path, 'state.pkl'), 'wb') as f:
+        pickle.dump(other, f, protocol=2)
+
+
+
+def load_checkpoint(path, mmap_mode='c'):
+    """Load a checkpoint saved by :func:`save_checkpoint`.
+
+    Parameters
+    ----------
+    path : string
+      Checkpoint directory path
+    mmap_mode : None or string, optional (default 'c')
+      Memory-map mode, as for :func:`numpy.load`, of arrays in the
+      checkpoint. The default copy-on-write mode allows the arrays to
+      be modified without modifying the checkpoint files.
+
+    Returns
+    -------
+    state : dict
+      Dict of values in the checkpoint
+    """
+
+    path = os.path.normpath(path)
+    # Fall back to the previous checkpoint if a save was interrupted
+    # after it was moved aside
+    if not os.path.exists(path) and os.path.exists(path + '.old'):
+        path = path + '.old'
+    with open(os.path.join(path, 'state.pkl'), 'rb') as f:
+        state = pickle.load(f)
+    for fnm in os.listdir(path):
+        fpth = os.path.join(path, fnm)
+        if os.path.isdir(fpth):
+            state[fnm] = load_checkpoint(fpth, mmap_mode)
+        elif fnm.endswith('.npy'):
+            try:
+                arr = np.load(fpth, mmap_mode=mmap_mode)
+            except ValueError:
+                # Arrays of object dtype can not be memory-mapped
+                arr = np.load(fpth, allow_pickle=True)
+            state[fnm[0:-4]] = arr
+    return state